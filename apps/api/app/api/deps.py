@@ -3,50 +3,53 @@ from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.security import decode_token
+from app.models.user import User
 import jwt
-import os
 
 # Security scheme
 security = HTTPBearer()
 
-# JWT secret key
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
-ALGORITHM = "HS256"
-
-async def get_current_user(
-    request: Request,
-    db: AsyncSession = Depends(get_db)
-) -> Optional[dict]:
-    """Get current user from JWT token."""
+def _token_user_id(request: Request) -> Optional[int]:
+    """Extract the user ID from the request's bearer token, or None if absent/invalid."""
     authorization = request.headers.get("Authorization")
     if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+        return None
+
     token = authorization.replace("Bearer ", "")
-    
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-    except jwt.PyJWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # Get user from database
-    # db_user = await user.get(db, id=user_id)
-    raise HTTPException(status_code=501, detail="User lookup not implemented")
+        payload = decode_token(token)
+        return int(payload["sub"])
+    except (jwt.PyJWTError, KeyError, TypeError, ValueError):
+        return None
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def get_token_user_id(request: Request) -> int:
+    """Validate the bearer token's signature and expiry without touching the database."""
+    user_id = _token_user_id(request)
+    if user_id is None:
+        raise _credentials_exception()
+    return user_id
+
+# Token dependencies are declared before get_db: FastAPI resolves dependencies in
+# order, so a bad token is rejected before a database session is ever opened.
+async def get_current_user(
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Get current user from JWT token."""
+    db.info["user_id"] = user_id  # Keys the sticky-primary window after this user's writes
+    db_user = await User.get_by_id(db, user_id)
+    if db_user is None:
+        raise _credentials_exception()
+    return db_user
 
 async def get_current_active_user(
     current_user: dict = Depends(get_current_user),
@@ -60,21 +63,16 @@ async def get_current_active_user(
     return current_user
 
 # Optional current user (for endpoints that work with or without authentication)
+async def get_optional_token_user_id(request: Request) -> Optional[int]:
+    """User ID from a valid bearer token, or None (no database access)."""
+    return _token_user_id(request)
+
 async def get_optional_current_user(
-    request: Request,
+    user_id: Optional[int] = Depends(get_optional_token_user_id),
     db: AsyncSession = Depends(get_db)
-) -> Optional[dict]:
+) -> Optional[User]:
     """Get current user if authenticated, otherwise None."""
-    authorization = request.headers.get("Authorization")
-    if not authorization or not authorization.startswith("Bearer "):
+    if user_id is None:
         return None
-    
-    token = authorization.replace("Bearer ", "")
-    
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            return None
-    except jwt.PyJWTError:
-        return None  # User lookup not implemented 
\ No newline at end of file
+    db.info["user_id"] = user_id
+    return await User.get_by_id(db, user_id)
@@ -1,6 +1,10 @@
 from fastapi import APIRouter
-from app.api.v1 import auth
+from app.api.v1 import auth, media, metrics, posts, users
 
 api_router = APIRouter()
 
-api_router.include_router(auth.router, prefix="/auth", tags=["auth"]) 
\ No newline at end of file
+api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(posts.router, prefix="/posts", tags=["posts"])
+api_router.include_router(media.router, prefix="/media", tags=["media"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"], include_in_schema=False)
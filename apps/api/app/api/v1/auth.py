@@ -4,13 +4,16 @@ Authentication endpoints.
 
 import logging
 from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserLogin, Token, TokenData
-from app.core.security import create_access_token, get_password_hash, verify_password, decode_token
+from app.core.security import create_access_token, decode_token, get_password_hash_in_thread, verify_password_in_thread
+from app.core.etag import check_not_modified, make_weak_etag, set_etag
+from app.core.rate_limit import AUTH_REQUESTS, LOGIN_FAILURES, get_rate_limiter, raise_rate_limited, rate_limit
+from app.crud.mentions import username_index
 import jwt
 
 # Set up logging
@@ -24,54 +27,62 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 router = APIRouter()
 security = HTTPBearer()
 
-@router.post("/signup", status_code=status.HTTP_201_CREATED)
+@router.post("/signup", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit(AUTH_REQUESTS, per="ip"))])
 async def signup(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """Create new user."""
-    # Check if user exists
-    db_user = await User.get_by_email(db, user.email)
-    if db_user:
+    hashed_password = await get_password_hash_in_thread(user.password)
+    created = await User.insert_if_new(
+        db, email=user.email, username=user.username, hashed_password=hashed_password
+    )
+    if created.user_id is None:
+        if created.email_taken:
+            detail = "Email already exists"
+        elif created.username_taken:
+            detail = "Username already exists"
+        else:
+            detail = "Email or username already exists"
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail="Email already exists"
+            detail=detail
         )
-    
-    # Create new user
-    hashed_password = get_password_hash(user.password)
-    db_user = User(
-        email=user.email,
-        username=user.username,
-        hashed_password=hashed_password
-    )
-    
-    db.add(db_user)
+    db.info["user_id"] = created.user_id  # Token lookups stick to the primary until replicas catch up
     await db.commit()
-    await db.refresh(db_user)
+    username_index.user_added(created.user_id, user.username)
     
     # Create access token
     expiration = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     token_data = TokenData(
-        sub=str(db_user.id),  # Convert to string for JWT
+        sub=str(created.user_id),  # Convert to string for JWT
         exp=int(expiration.timestamp())
     )
     access_token = create_access_token(token_data.model_dump())
     
     return {
-        "id": db_user.id,
-        "email": db_user.email,
-        "username": db_user.username,
+        "id": created.user_id,
+        "email": user.email,
+        "username": user.username,
         "access_token": access_token,
         "token_type": "bearer"
     }
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit(AUTH_REQUESTS, per="ip"))])
 async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login user."""
+    # Locked accounts are refused before paying for a bcrypt check
+    limiter = get_rate_limiter()
+    lockout_key = f"{LOGIN_FAILURES.name}:{user.email.lower()}"
+    lockout = await limiter.consume(lockout_key, LOGIN_FAILURES, cost=0)
+    if lockout.remaining < 1:
+        raise_rate_limited(lockout, detail="Too many failed login attempts")
+
     db_user = await User.get_by_email(db, user.email)
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    if not db_user or not await verify_password_in_thread(user.password, db_user.hashed_password):
+        await limiter.consume(lockout_key, LOGIN_FAILURES)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
+    await limiter.reset(lockout_key)
     
     # Create access token
     expiration = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -86,40 +97,13 @@ async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
         "token_type": "bearer"
     }
 
-@router.get("/session")
-async def get_session(
-    auth: HTTPAuthorizationCredentials = Depends(security), 
-    db: AsyncSession = Depends(get_db)
-):
-    """Get current user session."""
+async def get_session_user_id(auth: HTTPAuthorizationCredentials = Depends(security)) -> int:
+    """Decode and validate the session token; runs before any database session is opened."""
     try:
         logger.info(f"Received token: {auth.credentials[:20]}...")  # Log first 20 chars
-        
-        # Step 1: Decode token
         payload = decode_token(auth.credentials)
-        logger.info(f"Token payload: {payload}")
-        
-        # Step 2: Create token data
         token_data = TokenData(**payload)
-        logger.info(f"Token data: {token_data}")
-        
-        # Step 3: Get user from database (convert string ID back to int)
-        user_id = int(token_data.sub)
-        db_user = await User.get_by_id(db, user_id)
-        logger.info(f"Found user: {db_user.email if db_user else 'None'}")
-        
-        if not db_user:
-            logger.error("User not found in database")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
-        
-        return {
-            "id": db_user.id,
-            "email": db_user.email,
-            "username": db_user.username
-        }
+        return int(token_data.sub)  # Subject is the user ID as a string
     except jwt.PyJWTError as e:
         logger.error(f"JWT Error: {e}")
         raise HTTPException(
@@ -139,6 +123,35 @@ async def get_session(
             detail="Authentication failed"
         )
 
+@router.get("/session")
+async def get_session(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_session_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get current user session."""
+    db_user = await User.get_by_id(db, user_id)
+    if not db_user:
+        logger.error("User not found in database")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+
+    # Short-circuit if the client's cached session is still current
+    etag = make_weak_etag("session", db_user.id, db_user.email, db_user.username)
+    not_modified = check_not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    set_etag(response, etag)
+
+    return {
+        "id": db_user.id,
+        "email": db_user.email,
+        "username": db_user.username
+    }
+
 @router.post("/logout")
 async def logout():
     """Logout user."""
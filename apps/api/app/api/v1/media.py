@@ -0,0 +1,46 @@
+"""
+Media endpoints (serving stored image variants).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from app.core.etag import etag_matches
+from app.core.images import CONTENT_TYPES
+from app.core.media_cache import MEDIA_KEY_PATTERN, resolve_media_path
+from app.core.storage import StorageBackend, get_storage
+
+router = APIRouter()
+
+# Keys are content hashes, so a URL's bytes never change
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+@router.get("/{key:path}")
+async def get_media(
+    key: str,
+    request: Request,
+    storage: StorageBackend = Depends(get_storage)
+):
+    """Serve a media file with Range support and long-lived immutable caching."""
+    match = MEDIA_KEY_PATTERN.match(key)
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Media not found"
+        )
+
+    # The content hash is a natural strong validator
+    etag = f'"{key.rsplit("/", 1)[1].split(".", 1)[0]}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    path = await resolve_media_path(key, storage)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Media not found"
+        )
+
+    # FileResponse streams from disk (zero-copy via http.response.pathsend where the server
+    # supports it) and answers Range/If-Range requests with 206 itself
+    return FileResponse(path, media_type=CONTENT_TYPES[match.group(1)], headers=headers)
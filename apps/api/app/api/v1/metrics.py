@@ -0,0 +1,38 @@
+"""
+Internal operational metrics.
+
+Disabled unless METRICS_TOKEN is set; callers (e.g. the metrics scraper)
+then authenticate with `Authorization: Bearer <METRICS_TOKEN>`.
+"""
+
+import hmac
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.crud.jobs import job
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+async def require_metrics_token(request: Request) -> None:
+    """Reject callers without the metrics token; the routes don't exist while it is unset."""
+    if not METRICS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    presented = request.headers.get("Authorization", "").encode("utf-8")
+    if not hmac.compare_digest(presented, f"Bearer {METRICS_TOKEN}".encode("utf-8")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+# The token check runs before get_db, so rejected callers never open a session
+router = APIRouter(dependencies=[Depends(require_metrics_token)])
+
+@router.get("/jobs")
+async def job_metrics(db: AsyncSession = Depends(get_db)):
+    """Backlog, lag and last-minute throughput per job queue, across all workers."""
+    return await job.queue_stats(db)
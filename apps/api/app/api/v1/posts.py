@@ -0,0 +1,327 @@
+"""
+Post endpoints.
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_current_user, get_optional_token_user_id, get_token_user_id
+from app.core.database import get_db
+from app.core.images import (
+    CONTENT_TYPES, IMAGE_MAX_UPLOAD_BYTES, InvalidImage, UploadTooLarge, process_upload, spool_upload
+)
+from app.core.rate_limit import INTERACTIONS, rate_limit
+from app.core.responses import model_list_response
+from app.core.storage import StorageBackend, get_storage
+from app.crud.bookmarks import bookmark as crud_bookmark
+from app.crud.interaction import like as crud_like
+from app.crud.post import post as crud_post
+from app.crud.post_features import post_features
+from app.crud.reactions import decode_reactor_cursor, encode_reactor_cursor, reaction as crud_reaction
+from app.crud.scheduled_posts import scheduled_posts
+from app.crud.trending import trending
+from app.crud.viewer_state import viewer_state
+from app.models.post import PostType
+from app.models.reaction import EMOJI_CODES
+from app.models.user import User
+from app.schemas.interaction import ReactionSet, ReactionSummaryOut, ReactorOut, ReactorPage
+from app.schemas.post import AuthorSummary, FeedPostOut
+
+logger = logging.getLogger(__name__)
+
+# Build feed pages in a single Postgres query (JSON assembled by the database)
+FEED_SINGLE_SHOT = os.getenv("FEED_SINGLE_SHOT", "true").lower() == "true"
+
+router = APIRouter()
+
+def _json_text_response(content: str) -> Response:
+    """Response for a JSON document rendered by the database."""
+    return Response(content=content, media_type="application/json")
+
+@router.get("", response_model=List[FeedPostOut])
+async def list_posts(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    viewer_id: Optional[int] = Depends(get_optional_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get recent public posts."""
+    if FEED_SINGLE_SHOT:
+        return _json_text_response(
+            await crud_post.get_multi_with_author_json(db, viewer_id=viewer_id, skip=skip, limit=limit)
+        )
+    posts = await crud_post.get_multi_with_author(db, skip=skip, limit=limit)
+    return model_list_response(FeedPostOut, posts)
+
+@router.get("/feed", response_model=List[FeedPostOut])
+async def get_feed(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    mode: str = Query("chronological", pattern="^(chronological|ranked)$"),
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the current user's feed (own posts and posts from followed users).
+
+    `mode=ranked` orders recent public posts by PRD score, the user's network first.
+    """
+    if mode == "ranked":
+        post_ids = await post_features.ranked_feed_ids(db, viewer_id=user_id, skip=skip, limit=limit)
+        return _json_text_response(await crud_post.get_posts_json(db, post_ids=post_ids, viewer_id=user_id))
+    if FEED_SINGLE_SHOT:
+        return _json_text_response(
+            await crud_post.get_user_feed_json(db, user_id=user_id, skip=skip, limit=limit)
+        )
+    posts = await crud_post.get_user_feed(db, user_id=user_id, skip=skip, limit=limit)
+    return model_list_response(FeedPostOut, posts)
+
+@router.get("/trending", response_model=List[FeedPostOut])
+async def get_trending(
+    post_type: Optional[PostType] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    viewer_id: Optional[int] = Depends(get_optional_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get trending public posts (Discovery Feed), optionally of one type."""
+    post_ids = await trending.get_trending_ids(db, post_type=post_type, skip=skip, limit=limit)
+    return _json_text_response(await crud_post.get_posts_json(db, post_ids=post_ids, viewer_id=viewer_id))
+
+@router.get("/viewer-state", response_model=Dict[str, int])
+async def get_viewer_state(
+    ids: str = Query(..., description="Comma-separated post IDs (at most 100)"),
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Liked/bookmarked/reaction state of the current user for a page of posts, as a bitset per post.
+
+    Bit 0: liked; bit 1: bookmarked; bits 2-5: reaction emoji index + 1 (0: none).
+    """
+    post_ids = [post_id for post_id in ids.split(",") if post_id]
+    if len(post_ids) > 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At most 100 post IDs"
+        )
+    return await viewer_state.load(db, viewer_id=user_id, post_ids=post_ids)
+
+@router.post("/{post_id}/image")
+async def upload_post_image(
+    post_id: str,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage)
+):
+    """Upload a post image and store resized WebP/JPEG variants."""
+    db_post = await crud_post.get(db, post_id)
+    if not db_post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    if db_post.author_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to modify this post"
+        )
+
+    try:
+        path, source_sha256, _ = await spool_upload(file)
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Image exceeds {IMAGE_MAX_UPLOAD_BYTES} bytes"
+        )
+    finally:
+        await file.close()
+
+    try:
+        # Same source bytes as the current image: variants are already stored
+        if (db_post.image_variants or {}).get("source_sha256") == source_sha256:
+            return {"id": db_post.id, "image_url": db_post.image_url, "image_variants": db_post.image_variants}
+        variants = await process_upload(path)
+    except InvalidImage as e:
+        logger.info(f"Rejected upload for post {post_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is not a supported image"
+        )
+    finally:
+        os.unlink(path)
+
+    image_variants = {"source_sha256": source_sha256}
+    for variant in variants:
+        key = await storage.store(variant.data, variant.extension, CONTENT_TYPES[variant.extension])
+        image_variants.setdefault(variant.name, {})[variant.extension] = {
+            "url": storage.url(key),
+            "width": variant.width,
+            "height": variant.height,
+            "bytes": len(variant.data),
+        }
+
+    db_post = await crud_post.update(db, db_obj=db_post, obj_in={
+        "image_url": image_variants["large"]["jpg"]["url"],
+        "image_variants": image_variants,
+    })
+    return {"id": db_post.id, "image_url": db_post.image_url, "image_variants": db_post.image_variants}
+
+@router.post("/{post_id}/publish")
+async def publish_post(
+    post_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Publish one of the current user's drafts now, whether or not it is scheduled."""
+    db_post = await crud_post.get(db, post_id)
+    if not db_post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    if db_post.author_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to modify this post"
+        )
+    if not await scheduled_posts.publish_now(db, post_id=post_id, author_id=current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Post is already published"
+        )
+    return {"id": post_id, "message": "Post published"}
+
+@router.post("/{post_id}/like", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit(INTERACTIONS))])
+async def like_post(
+    post_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Like a post."""
+    if not await crud_post.get(db, post_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    db_like = await crud_like.create_like(db, user_id=current_user.id, post_id=post_id)
+    if db_like is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Post already liked"
+        )
+    return {"id": db_like.id, "post_id": db_like.post_id, "user_id": db_like.user_id}
+
+@router.delete("/{post_id}/like", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(rate_limit(INTERACTIONS))])
+async def unlike_post(
+    post_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Remove a like from a post."""
+    if not await crud_like.remove_like(db, user_id=current_user.id, post_id=post_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Like not found"
+        )
+
+@router.put("/{post_id}/reactions", response_model=ReactionSummaryOut, dependencies=[Depends(rate_limit(INTERACTIONS))])
+async def react_to_post(
+    post_id: str,
+    reaction_in: ReactionSet,
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Add or change the current user's emoji reaction to a post."""
+    if not await crud_post.get(db, post_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    await crud_reaction.set_reaction(db, user_id=user_id, post_id=post_id, code=EMOJI_CODES[reaction_in.emoji])
+    return await crud_reaction.get_summary(db, post_id=post_id, viewer_id=user_id)
+
+@router.delete("/{post_id}/reactions", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(rate_limit(INTERACTIONS))])
+async def remove_post_reaction(
+    post_id: str,
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Remove the current user's reaction from a post."""
+    if not await crud_reaction.remove_reaction(db, user_id=user_id, post_id=post_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reaction not found"
+        )
+
+@router.get("/{post_id}/reactions/summary", response_model=ReactionSummaryOut)
+async def get_reaction_summary(
+    post_id: str,
+    viewer_id: Optional[int] = Depends(get_optional_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Reaction counts per emoji for a post, and the viewer's own reaction."""
+    summary = await crud_reaction.get_summary(db, post_id=post_id, viewer_id=viewer_id)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    return summary
+
+@router.get("/{post_id}/reactions", response_model=ReactorPage)
+async def list_reactions(
+    post_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """Who reacted to a post and with what, most recent first (pass `next_cursor` for more)."""
+    try:
+        after = decode_reactor_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    reactors = await crud_reaction.get_reactors(db, post_id=post_id, after=after, limit=limit)
+    return ReactorPage(
+        items=[
+            ReactorOut(user=AuthorSummary(id=r.user_id, username=r.username), emoji=r.emoji, reacted_at=r.reacted_at)
+            for r in reactors
+        ],
+        next_cursor=encode_reactor_cursor(reactors[-1]) if len(reactors) == limit else None,
+    )
+
+@router.post("/{post_id}/bookmark", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit(INTERACTIONS))])
+async def bookmark_post(
+    post_id: str,
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bookmark a post (bookmarks are private)."""
+    if not await crud_post.get(db, post_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    if not await crud_bookmark.add(db, user_id=user_id, post_id=post_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Post already bookmarked"
+        )
+    return {"post_id": post_id, "user_id": user_id}
+
+@router.delete("/{post_id}/bookmark", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(rate_limit(INTERACTIONS))])
+async def remove_bookmark(
+    post_id: str,
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Remove a bookmark."""
+    if not await crud_bookmark.remove(db, user_id=user_id, post_id=post_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Bookmark not found"
+        )
@@ -0,0 +1,183 @@
+"""
+User endpoints.
+"""
+
+import csv
+import io
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_current_user, get_token_user_id
+from app.core.database import get_db, get_session_factory
+from app.core.etag import check_not_modified, make_weak_etag, set_etag
+from app.core.responses import dumps, model_list_response
+from app.crud.account_purge import request_account_purge
+from app.crud.bookmarks import bookmark as crud_bookmark
+from app.crud.mentions import username_index
+from app.crud.export import Checkpoint, decode_checkpoint, encode_checkpoint, stream_user_history
+from app.crud.post import post as crud_post
+from app.crud.read_models import post_rows
+from app.crud.suggestions import follow_suggestions
+from app.crud.user_stats import user_stats
+from app.models.user import User
+from app.schemas.post import FeedPostOut, PostOut
+from app.schemas.user import UserStatsOut, UserSuggestionOut, UserSummaryOut
+
+router = APIRouter()
+
+@router.get("/autocomplete", response_model=List[UserSummaryOut])
+async def autocomplete_usernames(
+    q: str = Query(..., min_length=1, max_length=50, pattern="^@*[^@]"),
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncSession = Depends(get_db)
+):
+    """Usernames starting with `q` (for @mentions), shortest first."""
+    matches = await username_index.complete(db, prefix=q.lstrip("@"), limit=limit)
+    return [UserSummaryOut(id=user_id, username=username) for username, user_id in matches]
+
+@router.get("/me/bookmarks", response_model=List[FeedPostOut])
+async def get_bookmarks(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the current user's bookmarked posts, most recently saved first."""
+    post_ids = await crud_bookmark.get_post_ids(db, user_id=user_id, skip=skip, limit=limit)
+    return Response(
+        content=await crud_post.get_posts_json(db, post_ids=post_ids, viewer_id=user_id),
+        media_type="application/json"
+    )
+
+@router.get("/me/suggestions", response_model=List[UserSuggestionOut])
+async def get_follow_suggestions(
+    limit: int = Query(10, ge=1, le=50),
+    user_id: int = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Suggest users to follow (friends of friends, then popular users)."""
+    suggestions = await follow_suggestions.suggest(db, user_id=user_id, limit=limit)
+    usernames = await follow_suggestions.get_usernames(db, user_ids=[suggested for suggested, _ in suggestions])
+    return [
+        UserSuggestionOut(id=suggested, username=usernames[suggested], mutual_follows=mutual)
+        for suggested, mutual in suggestions
+        if suggested in usernames
+    ]
+
+@router.get("/{user_id}/stats", response_model=UserStatsOut)
+async def get_user_stats(user_id: int, db: AsyncSession = Depends(get_db)):
+    """Get a user's profile statistics."""
+    stats = await user_stats.get(db, user_id=user_id)
+    if stats is not None:
+        return stats
+    # No writes recorded yet: all zeros, if the user exists
+    if await User.get_by_id(db, user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return UserStatsOut(user_id=user_id)
+
+@router.get("/{user_id}/posts", response_model=List[PostOut])
+async def get_user_posts(
+    user_id: int,
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a user's public posts, answering conditional requests from a version probe."""
+    version = await crud_post.get_user_posts_version(db, user_id=user_id)
+    if version[0] is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    etag = make_weak_etag("user-posts", user_id, skip, limit, *version)
+    not_modified = check_not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    posts = await post_rows.get_user_posts(db, user_id=user_id, skip=skip, limit=limit)
+    response = model_list_response(PostOut, posts)
+    set_etag(response, etag)
+    return response
+
+EXPORT_CSV_FIELDS = [
+    "type", "id", "post_id", "parent_id", "title", "content", "post_type",
+    "image_url", "is_public", "created_at", "updated_at",
+]
+
+async def _history_chunks(user_id: int, after: Optional[Checkpoint]):
+    """
+    Export chunks read through a session owned by the response body.
+
+    The body is sent after request dependencies have exited, so it cannot use
+    the request's session; this one is closed when the stream ends or the
+    client disconnects.
+    """
+    session = get_session_factory()()
+    try:
+        async for chunk in stream_user_history(session, user_id=user_id, after=after):
+            yield chunk
+    finally:
+        await session.close()
+
+async def _export_ndjson(user_id: int, after: Optional[Checkpoint]):
+    """Render export chunks as NDJSON, one flush per chunk followed by a checkpoint line."""
+    async for section, rows, checkpoint in _history_chunks(user_id, after):
+        lines = [dumps({"type": section, **row}) for row in rows]
+        lines.append(dumps({"type": "checkpoint", "cursor": encode_checkpoint(checkpoint)}))
+        yield b"\n".join(lines) + b"\n"
+
+async def _export_csv(user_id: int, after: Optional[Checkpoint]):
+    """Render export chunks as CSV rows; checkpoint rows carry the cursor in `id`."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    async for section, rows, checkpoint in _history_chunks(user_id, after):
+        for row in rows:
+            writer.writerow({"type": section, **row})
+        writer.writerow({"type": "checkpoint", "id": encode_checkpoint(checkpoint)})
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+@router.get("/me/export")
+async def export_history(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    after: Optional[str] = Query(None, description="Resume from a checkpoint cursor"),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the current user's posts, likes and comments as NDJSON or CSV."""
+    try:
+        checkpoint = decode_checkpoint(after) if after else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid export cursor"
+        )
+
+    if format == "csv":
+        body, media_type = _export_csv(current_user.id, checkpoint), "text/csv"
+    else:
+        body, media_type = _export_ndjson(current_user.id, checkpoint), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="gratitude-history.{format}"'},
+    )
+
+@router.delete("/me", status_code=status.HTTP_202_ACCEPTED)
+async def delete_account(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Request deletion of the current user's account and all their data."""
+    purge = await request_account_purge(db, user_id=current_user.id)
+    return {
+        "message": "Account deletion scheduled",
+        "requested_at": purge.requested_at,
+    }
@@ -0,0 +1,97 @@
+"""
+Conditional GET support (weak ETags and If-None-Match handling).
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Optional
+from fastapi import Request, Response, status
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Headers that a 304 response must carry over from the full response (RFC 9110 §15.4.5)
+NOT_MODIFIED_HEADERS = {b"etag", b"cache-control", b"vary", b"expires", b"content-location", b"date"}
+# CORS headers added by inner middleware; without them browsers reject cross-origin 304s
+CORS_HEADER_PREFIX = b"access-control-"
+
+def make_weak_etag(*parts: Any) -> str:
+    """Derive a weak ETag from version components (timestamps, counters, ids, paging)."""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        if isinstance(part, datetime):
+            part = part.isoformat()
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'W/"{digest.hexdigest()}"'
+
+def _opaque_tag(tag: str) -> str:
+    """Strip the weak indicator so tags compare with the weak comparison function."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == opaque for candidate in if_none_match.split(","))
+
+def check_not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client's cached representation is still current."""
+    if request.method in ("GET", "HEAD") and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+        )
+    return None
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach an ETag to a response that clients must revalidate before reuse."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+class ConditionalGetMiddleware:
+    """
+    Answer If-None-Match with 304 for any GET/HEAD response carrying a matching ETag.
+
+    Routes that can probe a cheap version should call `check_not_modified` themselves
+    so the full query never runs; this middleware covers the remaining routes and
+    drops the already-rendered body instead of sending it over the wire.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if not if_none_match:
+            await self.app(scope, receive, send)
+            return
+
+        suppress_body = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal suppress_body
+            if message["type"] == "http.response.start":
+                etag = Headers(raw=message.get("headers", [])).get("etag")
+                if message["status"] == status.HTTP_200_OK and etag and etag_matches(if_none_match, etag):
+                    suppress_body = True
+                    headers = [
+                        (k, v) for k, v in message.get("headers", [])
+                        if k.lower() in NOT_MODIFIED_HEADERS or k.lower().startswith(CORS_HEADER_PREFIX)
+                    ]
+                    await send({"type": "http.response.start", "status": status.HTTP_304_NOT_MODIFIED, "headers": headers})
+                    return
+            elif message["type"] == "http.response.body" and suppress_body:
+                if not message.get("more_body", False):
+                    await send({"type": "http.response.body", "body": b""})
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,145 @@
+"""
+In-memory follow graph for who-to-follow suggestions.
+
+Edges are stored in CSR form: `sources` holds the sorted IDs of users who
+follow anyone, and the users followed by sources[i] are
+targets[indptr[i]:indptr[i + 1]] (sorted). Follows and unfollows since the
+last build are kept in small per-user overlays; once the overlays grow past
+`max_overlay` edges they are merged into fresh arrays.
+
+Suggestions are friends-of-friends: the targets of everyone the user
+follows, gathered with one fancy-indexing pass over the CSR arrays and
+counted with np.unique, best K picked with a heap. Users with no 2-hop
+candidates are padded with the most-followed users.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+def _pair_keys(sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """One int64 per edge (user IDs fit in 32 bits), for vectorized membership tests."""
+    return (sources.astype(np.int64) << 32) | targets.astype(np.int64)
+
+class FollowGraph:
+    """Follow edges (follower -> followed) in CSR arrays plus incremental overlays."""
+
+    def __init__(self, edges: Optional[np.ndarray] = None, max_overlay: int = 10_000) -> None:
+        self.max_overlay = max_overlay
+        self._build(_EMPTY.reshape(0, 2) if edges is None else edges)
+
+    def _build(self, edges: np.ndarray) -> None:
+        # Sorted by (follower, followed) and de-duplicated
+        edges = np.unique(np.asarray(edges, dtype=np.int64).reshape(-1, 2), axis=0)
+        self.sources, counts = np.unique(edges[:, 0], return_counts=True)
+        self.indptr = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.targets = edges[:, 1].copy()
+        followed, in_degree = np.unique(self.targets, return_counts=True)
+        self.popular = followed[np.argsort(-in_degree, kind="stable")]  # Approximate between builds
+        self._added: Dict[int, Set[int]] = {}
+        self._removed: Dict[int, Set[int]] = {}
+        self._overlay_size = 0
+
+    def _row(self, user_id: int) -> np.ndarray:
+        i = np.searchsorted(self.sources, user_id)
+        if i < len(self.sources) and self.sources[i] == user_id:
+            return self.targets[self.indptr[i]:self.indptr[i + 1]]
+        return _EMPTY
+
+    def _in_base(self, follower_id: int, followed_id: int) -> bool:
+        row = self._row(follower_id)
+        i = np.searchsorted(row, followed_id)
+        return bool(i < len(row) and row[i] == followed_id)
+
+    def following(self, user_id: int) -> np.ndarray:
+        """Sorted IDs of the users `user_id` follows."""
+        row = self._row(user_id)
+        removed = self._removed.get(user_id)
+        if removed:
+            row = row[~np.isin(row, list(removed))]
+        added = self._added.get(user_id)
+        if added:
+            row = np.union1d(row, np.fromiter(added, dtype=np.int64))
+        return row
+
+    def add(self, follower_id: int, followed_id: int) -> None:
+        """Record a follow (idempotent)."""
+        removed = self._removed.get(follower_id)
+        if removed and followed_id in removed:
+            removed.discard(followed_id)
+        elif not self._in_base(follower_id, followed_id):
+            self._added.setdefault(follower_id, set()).add(followed_id)
+        self._note_change()
+
+    def remove(self, follower_id: int, followed_id: int) -> None:
+        """Record an unfollow (idempotent)."""
+        added = self._added.get(follower_id)
+        if added and followed_id in added:
+            added.discard(followed_id)
+        elif self._in_base(follower_id, followed_id):
+            self._removed.setdefault(follower_id, set()).add(followed_id)
+        self._note_change()
+
+    def _note_change(self) -> None:
+        self._overlay_size += 1
+        if self._overlay_size > self.max_overlay:
+            self.compact()
+
+    def edges(self) -> np.ndarray:
+        """All current edges as an (n, 2) array."""
+        sources = np.repeat(self.sources, np.diff(self.indptr))
+        targets = self.targets
+        removed = [(s, t) for s, ts in self._removed.items() for t in ts]
+        if removed:
+            removed = np.array(removed, dtype=np.int64)
+            keep = ~np.isin(_pair_keys(sources, targets), _pair_keys(removed[:, 0], removed[:, 1]))
+            sources, targets = sources[keep], targets[keep]
+        base = np.column_stack((sources, targets))
+        added = [(s, t) for s, ts in self._added.items() for t in ts]
+        return np.concatenate((base, np.array(added, dtype=np.int64).reshape(-1, 2)))
+
+    def compact(self) -> None:
+        """Merge the overlays into fresh CSR arrays."""
+        self._build(self.edges())
+
+    def _two_hop(self, following: np.ndarray) -> np.ndarray:
+        """Targets of every user in `following` (with repeats), from the CSR arrays."""
+        if not len(self.sources) or not len(following):
+            return _EMPTY
+        rows = np.searchsorted(self.sources, following)
+        present = self.sources[np.minimum(rows, len(self.sources) - 1)] == following
+        rows = rows[present & (rows < len(self.sources))]
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        # Index of every element of every selected row, without a Python loop
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        return self.targets[offsets]
+
+    def suggest(self, user_id: int, k: int) -> List[Tuple[int, int]]:
+        """Up to k (user_id, mutual_follows) suggestions, most mutual follows first."""
+        following = self.following(user_id)
+        followed = set(following.tolist())
+        extra = [np.fromiter(self._added[f], dtype=np.int64) for f in followed & self._added.keys()]
+        minus = [np.fromiter(self._removed[f], dtype=np.int64) for f in followed & self._removed.keys()]
+
+        candidates, mutual = np.unique(np.concatenate((self._two_hop(following), *extra)), return_counts=True)
+        if minus:
+            minus_ids, minus_counts = np.unique(np.concatenate(minus), return_counts=True)
+            at = np.searchsorted(candidates, minus_ids)
+            hit = at < len(candidates)
+            hit[hit] = candidates[at[hit]] == minus_ids[hit]
+            mutual[at[hit]] -= minus_counts[hit]
+        keep = (mutual > 0) & (candidates != user_id) & ~np.isin(candidates, following)
+        best = heapq.nlargest(k, zip(mutual[keep].tolist(), (-candidates[keep]).tolist()))
+        suggestions = [(-negative_id, count) for count, negative_id in best]
+
+        chosen = {candidate for candidate, _ in suggestions}
+        # Each skipped candidate is the user, someone followed or already chosen
+        for candidate in self.popular[:2 * k + len(followed) + 1].tolist():
+            if len(suggestions) >= k:
+                break
+            if candidate != user_id and candidate not in followed and candidate not in chosen:
+                suggestions.append((candidate, 0))
+        return suggestions
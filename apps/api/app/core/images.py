@@ -0,0 +1,122 @@
+"""
+Image processing for post uploads.
+
+Decoding and encoding run in a separate process pool so the event loop never
+blocks on Pillow and large images never inflate the API worker's RSS; pool
+processes are recycled after a fixed number of tasks for the same reason.
+"""
+
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from fastapi import UploadFile
+from PIL import Image, ImageOps
+
+IMAGE_MAX_UPLOAD_BYTES = int(os.getenv("IMAGE_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", str(50_000_000)))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+IMAGE_TASKS_PER_WORKER = int(os.getenv("IMAGE_TASKS_PER_WORKER", "50"))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Variant name -> longest edge in pixels
+VARIANT_SIZES: Dict[str, int] = {"large": 1600, "medium": 800, "thumb": 320}
+# File extension -> (Pillow format, encoder options)
+VARIANT_FORMATS: Dict[str, Tuple[str, dict]] = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+CONTENT_TYPES = {"webp": "image/webp", "jpg": "image/jpeg"}
+
+class ImageVariant(NamedTuple):
+    """One encoded rendition of an uploaded image."""
+    name: str
+    extension: str
+    width: int
+    height: int
+    data: bytes
+
+class UploadTooLarge(Exception):
+    """Upload exceeded IMAGE_MAX_UPLOAD_BYTES."""
+
+class InvalidImage(Exception):
+    """Upload could not be decoded as an image."""
+
+async def spool_upload(upload: UploadFile, directory: Optional[str] = None) -> Tuple[str, str, int]:
+    """Copy an upload to a temp file in fixed-size chunks; returns (path, sha256, size)."""
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(prefix="upload-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > IMAGE_MAX_UPLOAD_BYTES:
+                    raise UploadTooLarge()
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, digest.hexdigest(), size
+
+def _to_rgb(img: Image.Image) -> Image.Image:
+    """Flatten to RGB, compositing transparency onto white rather than black."""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+def process_image(path: str) -> List[ImageVariant]:
+    """Decode, auto-orient, strip metadata and encode every variant (runs in a worker process)."""
+    Image.MAX_IMAGE_PIXELS = IMAGE_MAX_PIXELS
+    largest = max(VARIANT_SIZES.values())
+    try:
+        with Image.open(path) as source:
+            # JPEG only: let the decoder downscale by 1/2..1/8 instead of materialising full size
+            source.draft("RGB", (largest, largest))
+            img = _to_rgb(ImageOps.exif_transpose(source))
+    except (Image.DecompressionBombError, OSError, SyntaxError, ValueError) as e:
+        raise InvalidImage(str(e)) from e
+
+    variants = []
+    # Largest first so each smaller size is resampled from the previous one
+    for name, edge in sorted(VARIANT_SIZES.items(), key=lambda item: -item[1]):
+        img.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        for extension, (image_format, options) in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            # No exif=/icc_profile= passed, so metadata (GPS, camera) is dropped
+            img.save(buffer, image_format, **options)
+            variants.append(ImageVariant(name, extension, img.width, img.height, buffer.getvalue()))
+    return variants
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def get_image_pool() -> ProcessPoolExecutor:
+    """Lazily start the image process pool."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=IMAGE_TASKS_PER_WORKER,
+        )
+    return _pool
+
+def shutdown_image_pool() -> None:
+    """Stop the image process pool (called on application shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+async def process_upload(path: str) -> List[ImageVariant]:
+    """Process a spooled upload in the pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_image_pool(), process_image, path)
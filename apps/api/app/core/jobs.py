@@ -0,0 +1,90 @@
+"""
+Background job tasks: registry, retry policy and worker throughput metrics.
+
+A task is registered under a name and enqueued by that name with a JSON
+payload. Async handlers run on the worker's event loop; CPU-bound handlers
+are plain module-level functions run in the worker's process pool (the
+function is pickled by reference, so it must be importable).
+"""
+
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Tuple
+
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "3600"))
+JOB_METRICS_WINDOW_SECONDS = 60.0
+
+JobHandler = Callable[[Dict[str, Any]], Any]
+
+@dataclass(frozen=True)
+class JobTask:
+    """A named job handler."""
+    name: str
+    handler: JobHandler
+    cpu_bound: bool = False
+    max_attempts: int = JOB_MAX_ATTEMPTS
+
+JOB_TASKS: Dict[str, JobTask] = {}
+
+def register_task(name: str, *, cpu_bound: bool = False, max_attempts: int = JOB_MAX_ATTEMPTS):
+    """Decorator making a handler runnable as job task `name`."""
+    def decorator(handler: JobHandler) -> JobHandler:
+        JOB_TASKS[name] = JobTask(name, handler, cpu_bound, max_attempts)
+        return handler
+    return decorator
+
+def get_task(name: str) -> JobTask:
+    """Look up a registered task (KeyError if unknown)."""
+    return JOB_TASKS[name]
+
+def retry_delay(
+    attempt: int,
+    base: float = JOB_RETRY_BASE_SECONDS,
+    cap: float = JOB_RETRY_MAX_SECONDS,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """Seconds before retrying after failed attempt `attempt` (1-based): capped exponential, half jittered."""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + rng() * delay / 2
+
+class JobMetrics:
+    """Outcome counters and sliding-window throughput for one worker process."""
+
+    OUTCOMES = ("succeeded", "retried", "failed")
+
+    def __init__(self, window: float = JOB_METRICS_WINDOW_SECONDS, clock: Callable[[], float] = time.monotonic) -> None:
+        self.window = window
+        self.clock = clock
+        self.started_at = clock()
+        self.counts: Dict[str, int] = dict.fromkeys(self.OUTCOMES, 0)
+        self.busy_seconds = 0.0
+        self._recent: Deque[Tuple[float, float]] = deque()  # (finished_at, duration)
+
+    def record(self, outcome: str, duration: float) -> None:
+        """Count one finished attempt."""
+        self.counts[outcome] += 1
+        self.busy_seconds += duration
+        self._recent.append((self.clock(), duration))
+        self._expire()
+
+    def _expire(self) -> None:
+        horizon = self.clock() - self.window
+        while self._recent and self._recent[0][0] < horizon:
+            self._recent.popleft()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters, jobs per second and mean duration over the window."""
+        self._expire()
+        elapsed = min(self.window, max(self.clock() - self.started_at, 1e-9))
+        recent = len(self._recent)
+        return {
+            **self.counts,
+            "jobs_per_second": recent / elapsed,
+            "mean_seconds": sum(duration for _, duration in self._recent) / recent if recent else 0.0,
+            "busy_seconds": self.busy_seconds,
+        }
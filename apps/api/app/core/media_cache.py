@@ -0,0 +1,103 @@
+"""
+Content-addressed local disk cache for media served without a CDN.
+
+Blobs are immutable (keys are content hashes), so a cached file never needs
+revalidation; the only policy needed is evicting least-recently-used files
+once the cache exceeds its disk quota.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, Optional
+from starlette.concurrency import run_in_threadpool
+from app.core.storage import LocalStorage, StorageBackend
+
+logger = logging.getLogger(__name__)
+
+MEDIA_CACHE_DIR = os.getenv("MEDIA_CACHE_DIR", os.path.join(os.getcwd(), "media-cache"))
+MEDIA_CACHE_MAX_BYTES = int(os.getenv("MEDIA_CACHE_MAX_BYTES", str(1024 ** 3)))
+
+# Keys produced by app.core.storage.content_key; anything else is rejected before touching disk
+MEDIA_KEY_PATTERN = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.(webp|jpg)$")
+
+class MediaCache:
+    """LRU, disk-quota-bounded mirror of an origin StorageBackend."""
+
+    def __init__(self, origin: StorageBackend, root: str = MEDIA_CACHE_DIR, max_bytes: int = MEDIA_CACHE_MAX_BYTES) -> None:
+        self.origin = origin
+        self.store = LocalStorage(root=root)
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from disk, oldest access time first."""
+        found = []
+        for directory, _, files in os.walk(self.store.root):
+            for name in files:
+                if name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(directory, name)
+                key = os.path.relpath(path, self.store.root).replace(os.sep, "/")
+                stat = os.stat(path)
+                found.append((stat.st_atime, key, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self.total_bytes += size
+
+    async def get_path(self, key: str) -> Optional[str]:
+        """Local path for `key`, fetching from the origin on a miss; None if the origin lacks it."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self.store.path(key)
+
+        # Collapse concurrent misses for the same key into one origin fetch
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key not in self._entries:
+                data = await self.origin.read(key)
+                if data is None:
+                    self._locks.pop(key, None)
+                    return None
+                await self.store.save(key, data, "")
+                self._entries[key] = len(data)
+                self.total_bytes += len(data)
+                await self._evict()
+        self._locks.pop(key, None)
+        return self.store.path(key) if key in self._entries else None
+
+    async def _evict(self) -> None:
+        """Delete least-recently-used files until the cache fits its quota."""
+        victims = []
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            victims.append(self.store.path(key))
+        if victims:
+            await run_in_threadpool(_remove_files, victims)
+            logger.info(f"Evicted {len(victims)} media files; cache now {self.total_bytes} bytes")
+
+def _remove_files(paths) -> None:
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+_media_cache: Optional[MediaCache] = None
+
+async def resolve_media_path(key: str, storage: StorageBackend) -> Optional[str]:
+    """Local file to serve for `key`: the origin itself when it is on local disk, else the cache."""
+    path = await run_in_threadpool(storage.local_path, key)
+    if path is not None:
+        return path
+
+    global _media_cache
+    if _media_cache is None or _media_cache.origin is not storage:
+        _media_cache = await run_in_threadpool(MediaCache, storage)
+    return await _media_cache.get_path(key)
@@ -0,0 +1,74 @@
+"""
+@username mentions: parsing and a prefix trie for autocomplete.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# "@name" not preceded by a word character, "@" or "." (so emails don't match)
+MENTION_PATTERN = re.compile(r"(?<![\w@.])@(\w{1,50})")
+MAX_MENTIONS = 20  # Per post or comment
+
+def extract_mentions(text: str, limit: int = MAX_MENTIONS) -> List[str]:
+    """Distinct mentioned usernames in order of first appearance (one regex pass)."""
+    mentioned = dict.fromkeys(match.group(1) for match in MENTION_PATTERN.finditer(text or ""))
+    return list(mentioned)[:limit]
+
+class _Node:
+    __slots__ = ("children", "user")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        self.user: Optional[Tuple[str, int]] = None  # (username, user_id) ending here
+
+class UsernameTrie:
+    """Case-insensitive prefix index of usernames."""
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, username: str, user_id: int) -> None:
+        """Add or replace a username."""
+        node = self._root
+        for char in username.lower():
+            node = node.children.setdefault(char, _Node())
+        if node.user is None:
+            self._size += 1
+        node.user = (username, user_id)
+
+    def remove(self, username: str) -> None:
+        """Remove a username (no-op if absent), pruning empty branches."""
+        key = username.lower()
+        path = [self._root]
+        for char in key:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        if path[-1].user is None:
+            return
+        path[-1].user = None
+        self._size -= 1
+        for depth in range(len(key), 0, -1):
+            if path[depth].children or path[depth].user is not None:
+                break
+            del path[depth - 1].children[key[depth - 1]]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Up to `limit` (username, user_id) pairs starting with `prefix`, shortest then alphabetical."""
+        node = self._root
+        for char in prefix.lower():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        # Breadth-first, so shorter usernames come first
+        found: List[Tuple[str, int]] = []
+        level = [node]
+        while level and len(found) < limit:
+            found.extend(sorted((n.user for n in level if n.user is not None), key=lambda user: user[0].lower()))
+            level = [child for n in level for _, child in sorted(n.children.items())]
+        return found[:limit]
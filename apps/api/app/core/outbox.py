@@ -0,0 +1,33 @@
+"""
+Domain events and their in-process subscribers.
+
+Subscribers are registered per event type and called by the outbox relay as
+`handler(db, event)`, in order of registration.
+"""
+
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple
+
+class DomainEvent(NamedTuple):
+    """An event read back from the outbox."""
+    id: int
+    aggregate_type: str
+    aggregate_id: str
+    event_type: str
+    payload: Dict[str, Any]
+    created_at: datetime
+
+Subscriber = Callable[[Any, DomainEvent], Awaitable[None]]
+
+SUBSCRIBERS: Dict[str, List[Subscriber]] = {}
+
+def subscribe(event_type: str):
+    """Decorator registering a subscriber for `event_type`."""
+    def decorator(handler: Subscriber) -> Subscriber:
+        SUBSCRIBERS.setdefault(event_type, []).append(handler)
+        return handler
+    return decorator
+
+def get_subscribers(event_type: str) -> List[Subscriber]:
+    """Subscribers for `event_type` (none: the event is just consumed)."""
+    return SUBSCRIBERS.get(event_type, [])
@@ -0,0 +1,96 @@
+"""
+Feed ranking engine.
+
+Candidate posts arrive as a FeatureBatch of column arrays; a scorer turns the
+whole batch into a score vector in one vectorized pass, and the best K are
+picked with a heap. Scorers are pluggable: register another under a name and
+select it with RANKING_SCORER.
+"""
+
+import heapq
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+import numpy as np
+
+RANKING_SCORER = os.getenv("RANKING_SCORER", "prd")
+
+class FeatureBatch(NamedTuple):
+    """Per-post features as parallel arrays (one element per candidate post)."""
+    post_ids: List[str]
+    hearts: np.ndarray
+    comments: np.ndarray
+    shares: np.ndarray
+    reports: np.ndarray
+    has_image: np.ndarray
+    is_daily: np.ndarray
+    is_spontaneous: np.ndarray
+    in_network: np.ndarray  # Author is the viewer or someone the viewer follows
+    age_hours: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[tuple]) -> "FeatureBatch":
+        """Build from rows ordered like the fields above."""
+        columns = list(zip(*rows)) if rows else [()] * len(cls._fields)
+        numeric = [np.asarray(column, dtype=np.float64) for column in columns[1:]]
+        return cls(list(columns[0]), *numeric)
+
+    def __len__(self) -> int:
+        return len(self.post_ids)
+
+Scorer = Callable[[FeatureBatch], np.ndarray]
+
+@dataclass(frozen=True)
+class PRDWeights:
+    """Weights from PRD §7.4 (completion rate is not tracked yet)."""
+    hearts: float = 1.0
+    comments: float = 2.0
+    shares: float = 4.0
+    reports: float = -10.0
+    photo_bonus: float = 2.5
+    daily_bonus: float = 3.0
+    spontaneous_modifier: float = 0.5
+    recency_bonus: float = 10.0  # Bonus for a brand-new post...
+    recency_half_life_hours: float = 24.0  # ...halving every this many hours
+    relationship_bonus: float = 5.0
+
+class PRDScorer:
+    """Post Score = engagement + photo/daily bonuses + recency + relationship, x0.5 for spontaneous posts."""
+
+    def __init__(self, weights: PRDWeights = PRDWeights()) -> None:
+        self.weights = weights
+
+    def __call__(self, batch: FeatureBatch) -> np.ndarray:
+        w = self.weights
+        score = (
+            batch.hearts * w.hearts
+            + batch.comments * w.comments
+            + batch.shares * w.shares
+            + batch.reports * w.reports
+            + batch.has_image * w.photo_bonus
+            + batch.is_daily * w.daily_bonus
+            + w.recency_bonus * np.exp2(-batch.age_hours / w.recency_half_life_hours)
+            + batch.in_network * w.relationship_bonus
+        )
+        return score * np.where(batch.is_spontaneous > 0, w.spontaneous_modifier, 1.0)
+
+SCORERS: Dict[str, Scorer] = {"prd": PRDScorer()}
+
+def register_scorer(name: str, scorer: Scorer) -> None:
+    """Make a scorer selectable by name."""
+    SCORERS[name] = scorer
+
+def get_scorer(name: str = None) -> Scorer:
+    """Look up a scorer (defaults to RANKING_SCORER)."""
+    return SCORERS[name or RANKING_SCORER]
+
+def top_k(post_ids: Sequence[str], scores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+    """The k highest-scoring posts, best first (O(n log k) heap selection)."""
+    best = heapq.nlargest(k, range(len(post_ids)), key=scores.__getitem__)
+    return [(post_ids[i], float(scores[i])) for i in best]
+
+def rank(batch: FeatureBatch, k: int, scorer: Scorer = None) -> List[Tuple[str, float]]:
+    """Score a batch and return the top k (post_id, score) pairs."""
+    if not len(batch) or k <= 0:
+        return []
+    return top_k(batch.post_ids, (scorer or get_scorer())(batch), k)
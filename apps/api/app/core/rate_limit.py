@@ -0,0 +1,225 @@
+"""
+Token-bucket rate limiting.
+
+Each (policy, subject) pair owns a bucket of `capacity` tokens refilled
+continuously at `capacity / period` per second; a request spends one token.
+The in-process backend is the default; DatabaseBackend shares buckets
+between API processes through Postgres.
+"""
+
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Callable, List, NamedTuple, Optional
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import _token_user_id
+from app.models.rate_limit import RateLimitBucket
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+
+class RateLimit(NamedTuple):
+    """A token-bucket policy: `capacity` requests per `period` seconds."""
+    name: str
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second."""
+        return self.capacity / self.period
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a rate limit check; `remaining` is the whole tokens left."""
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+# Policies from the PRD (§6.6.1, §6.7) plus auth brute-force protection
+INTERACTIONS = RateLimit("interactions", 50, 3600)
+SHARES = RateLimit("shares", 20, 3600)
+LOGIN_FAILURES = RateLimit("login_failures", 5, 900)
+AUTH_REQUESTS = RateLimit("auth", 20, 60)
+
+def _result(limit: RateLimit, tokens: float, allowed: bool, cost: int) -> RateLimitResult:
+    # Seconds until another request of this cost (at least one token) would pass
+    retry_after = max(0.0, (max(cost, 1) - tokens) / limit.rate)
+    return RateLimitResult(allowed, int(tokens), retry_after)
+
+class RateLimitBackend(ABC):
+    """Interface for bucket stores."""
+
+    @abstractmethod
+    async def consume(self, key: str, limit: RateLimit, cost: int = 1) -> RateLimitResult:
+        """Spend `cost` tokens if available (a cost of 0 just inspects the bucket)."""
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """Forget a bucket, restoring full capacity."""
+
+class _Bucket:
+    """Per-key state: two floats plus the time the bucket will be full again."""
+    __slots__ = ("tokens", "updated_at", "full_at")
+
+    def __init__(self, tokens: float, updated_at: float, full_at: float) -> None:
+        self.tokens = tokens
+        self.updated_at = updated_at
+        self.full_at = full_at
+
+class InMemoryBackend(RateLimitBackend):
+    """
+    Process-local buckets in hash-sharded LRU dicts.
+
+    Lookups are O(1). A full bucket carries no information, so buckets are
+    dropped as soon as they refill: every call pops refilled buckets off the
+    LRU end of its shard, and each shard is capped at `max_keys_per_shard`.
+    """
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 100_000, clock: Callable[[], float] = time.monotonic) -> None:
+        self._shards: List["OrderedDict[str, _Bucket]"] = [OrderedDict() for _ in range(shards)]
+        self.max_keys_per_shard = max_keys_per_shard
+        self.clock = clock
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def _shard(self, key: str) -> "OrderedDict[str, _Bucket]":
+        return self._shards[hash(key) % len(self._shards)]
+
+    async def consume(self, key: str, limit: RateLimit, cost: int = 1) -> RateLimitResult:
+        now = self.clock()
+        shard = self._shard(key)
+        bucket = shard.get(key)
+        if bucket is None:
+            tokens = float(limit.capacity)
+        else:
+            tokens = min(limit.capacity, bucket.tokens + (now - bucket.updated_at) * limit.rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+
+        if tokens >= limit.capacity:
+            shard.pop(key, None)
+        elif bucket is None:
+            shard[key] = _Bucket(tokens, now, now + (limit.capacity - tokens) / limit.rate)
+        else:
+            bucket.tokens, bucket.updated_at = tokens, now
+            bucket.full_at = now + (limit.capacity - tokens) / limit.rate
+            shard.move_to_end(key)
+
+        self._expire(shard, now)
+        return _result(limit, tokens, allowed, cost)
+
+    async def reset(self, key: str) -> None:
+        self._shard(key).pop(key, None)
+
+    def _expire(self, shard: "OrderedDict[str, _Bucket]", now: float) -> None:
+        """Drop refilled buckets from the least-recently-used end, then enforce the key cap."""
+        while shard:
+            bucket = next(iter(shard.values()))
+            if bucket.full_at > now:
+                break
+            shard.popitem(last=False)
+        while len(shard) > self.max_keys_per_shard:
+            shard.popitem(last=False)
+
+class DatabaseBackend(RateLimitBackend):
+    """Buckets shared by all API processes, updated with one atomic upsert per check."""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    async def consume(self, key: str, limit: RateLimit, cost: int = 1) -> RateLimitResult:
+        table = RateLimitBucket.__table__
+        elapsed = func.extract("epoch", func.now() - table.c.updated_at)
+        refilled = func.least(limit.capacity, table.c.tokens + elapsed * limit.rate)
+        allowed = refilled >= cost
+        first_allowed = limit.capacity >= cost
+
+        stmt = pg_insert(table).values(
+            key=key,
+            tokens=limit.capacity - (cost if first_allowed else 0),
+            allowed=first_allowed,
+            updated_at=func.now(),
+            expires_at=func.now() + timedelta(seconds=limit.period),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                "tokens": refilled - case((allowed, cost), else_=0),
+                "allowed": allowed,
+                "updated_at": func.now(),
+                "expires_at": func.now() + timedelta(seconds=limit.period),
+            },
+        ).returning(table.c.tokens, table.c.allowed)
+
+        async with self.session_factory() as session:
+            row = (await session.execute(stmt)).one()
+            await session.commit()
+        return _result(limit, row.tokens, row.allowed, cost)
+
+    async def reset(self, key: str) -> None:
+        async with self.session_factory() as session:
+            await session.execute(delete(RateLimitBucket).where(RateLimitBucket.key == key))
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        """Delete buckets that have certainly refilled (run periodically)."""
+        async with self.session_factory() as session:
+            result = await session.execute(delete(RateLimitBucket).where(RateLimitBucket.expires_at < func.now()))
+            await session.commit()
+        return result.rowcount
+
+_rate_limiter: Optional[RateLimitBackend] = None
+
+def get_rate_limiter() -> RateLimitBackend:
+    """Get the configured rate limit backend."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        if RATE_LIMIT_BACKEND == "database":
+            from app.core.database import get_session_factory
+            _rate_limiter = DatabaseBackend(get_session_factory())
+        else:
+            _rate_limiter = InMemoryBackend()
+    return _rate_limiter
+
+def set_rate_limiter(backend: Optional[RateLimitBackend]) -> None:
+    """Swap the backend (tests, or wiring a shared store at startup)."""
+    global _rate_limiter
+    _rate_limiter = backend
+
+def client_ip(request: Request) -> str:
+    """Client address used as the subject for unauthenticated limits."""
+    return request.client.host if request.client else "unknown"
+
+def raise_rate_limited(result: RateLimitResult, detail: str = "Rate limit exceeded") -> None:
+    """Raise a 429 carrying Retry-After."""
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(result.retry_after)))},
+    )
+
+def rate_limit(limit: RateLimit, per: str = "user"):
+    """
+    Dependency enforcing `limit` per authenticated user (token subject) or per client IP.
+
+    The subject is read from the bearer token without a database lookup, so
+    throttled requests are rejected before any session is opened.
+    """
+    async def dependency(request: Request, response: Response) -> None:
+        subject = _token_user_id(request) if per == "user" else None
+        key = f"{limit.name}:{'user:' + str(subject) if subject is not None else 'ip:' + client_ip(request)}"
+        result = await get_rate_limiter().consume(key, limit)
+        if not result.allowed:
+            raise_rate_limited(result)
+        response.headers["X-RateLimit-Limit"] = str(limit.capacity)
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+
+    return dependency
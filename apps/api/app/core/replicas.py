@@ -0,0 +1,192 @@
+"""
+Read-replica routing.
+
+Sessions are bound to the primary by default. Inside a CRUD method decorated
+with @replica_read, plain SELECTs are routed to a healthy, sufficiently fresh
+replica chosen round-robin; everything else (flushes, DML, locking reads,
+reads after a write in the same transaction) stays on the primary. After a
+user commits a write, their reads stick to the primary for a short window so
+they always see their own changes.
+"""
+
+import asyncio
+import functools
+import itertools
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+DATABASE_REPLICA_URLS = [url for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "10"))
+REPLICA_HEALTH_TIMEOUT = float(os.getenv("REPLICA_HEALTH_TIMEOUT", "2"))
+STICKY_PRIMARY_SECONDS = float(os.getenv("STICKY_PRIMARY_SECONDS", "10"))
+STICKY_PRIMARY_MAX_USERS = 100_000
+
+# Replication delay in seconds; 0 when the replica has replayed everything it received
+POSTGRES_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+LagProbe = Callable[[AsyncConnection], Awaitable[float]]
+
+async def postgres_replica_lag(conn: AsyncConnection) -> float:
+    """Replication lag of the replica behind `conn` (0 for dialects without replication info)."""
+    if conn.dialect.name != "postgresql":
+        return 0.0
+    return float((await conn.execute(POSTGRES_LAG_QUERY)).scalar())
+
+class ReplicaRouter:
+    """Primary engine plus replicas, with health state and per-user sticky-primary windows."""
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: Optional[List[AsyncEngine]] = None,
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+        health_interval: float = REPLICA_HEALTH_INTERVAL,
+        sticky_seconds: float = STICKY_PRIMARY_SECONDS,
+        lag_probe: LagProbe = postgres_replica_lag,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas or [])
+        self.max_lag = max_lag
+        self.health_interval = health_interval
+        self.sticky_seconds = sticky_seconds
+        self.lag_probe = lag_probe
+        self.clock = clock
+        self._healthy: List[AsyncEngine] = []  # Nothing is trusted until the first check
+        self._round_robin = itertools.count()
+        self._checked_at: Optional[float] = None
+        self._check_lock = asyncio.Lock()
+        self._sticky_until: "OrderedDict[int, float]" = OrderedDict()
+
+    @property
+    def healthy_replicas(self) -> List[AsyncEngine]:
+        return list(self._healthy)
+
+    async def _replica_ok(self, engine: AsyncEngine) -> bool:
+        try:
+            async with engine.connect() as conn:
+                lag = await asyncio.wait_for(self.lag_probe(conn), REPLICA_HEALTH_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Replica {engine.url.render_as_string(hide_password=True)} unavailable: {e}")
+            return False
+        if lag > self.max_lag:
+            logger.warning(f"Replica {engine.url.render_as_string(hide_password=True)} lagging {lag:.1f}s")
+            return False
+        return True
+
+    async def check_health(self) -> List[AsyncEngine]:
+        """Probe every replica and keep only reachable ones within the lag budget."""
+        results = await asyncio.gather(*(self._replica_ok(engine) for engine in self.replicas))
+        self._healthy = [engine for engine, ok in zip(self.replicas, results) if ok]
+        self._checked_at = self.clock()
+        return self.healthy_replicas
+
+    async def maybe_check_health(self) -> None:
+        """Re-probe replicas if the last check is older than the health interval (one caller at a time)."""
+        if not self.replicas or self._check_lock.locked():
+            return
+        if self._checked_at is not None and self.clock() - self._checked_at < self.health_interval:
+            return
+        async with self._check_lock:
+            await self.check_health()
+
+    def record_write(self, user_id: int) -> None:
+        """Pin the user's reads to the primary for the sticky window."""
+        now = self.clock()
+        self._sticky_until[user_id] = now + self.sticky_seconds
+        self._sticky_until.move_to_end(user_id)
+        # Entries are ordered by expiry, so expired ones are at the front
+        while self._sticky_until:
+            oldest = next(iter(self._sticky_until.values()))
+            if oldest > now and len(self._sticky_until) <= STICKY_PRIMARY_MAX_USERS:
+                break
+            self._sticky_until.popitem(last=False)
+
+    def is_sticky(self, user_id: Optional[int]) -> bool:
+        """Whether the user wrote recently enough that replicas may not have their change yet."""
+        return user_id is not None and self._sticky_until.get(user_id, 0.0) > self.clock()
+
+    def choose_replica(self, user_id: Optional[int] = None) -> Optional[AsyncEngine]:
+        """Next healthy replica round-robin, or None to use the primary."""
+        healthy = self._healthy
+        if not healthy or self.is_sticky(user_id):
+            return None
+        return healthy[next(self._round_robin) % len(healthy)]
+
+class RoutingSession(Session):
+    """Sync session (behind AsyncSession) that picks the primary or a replica per statement."""
+
+    def __init__(self, *args, router: Optional[ReplicaRouter] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self._wrote = False
+        event.listen(self, "after_flush", self._on_write)
+        event.listen(self, "after_commit", self._on_commit)
+        event.listen(self, "after_transaction_end", self._on_transaction_end)
+
+    def _on_write(self, *args) -> None:
+        self._wrote = True
+
+    def _on_commit(self, session) -> None:
+        if self._wrote and self.router is not None and self.info.get("user_id") is not None:
+            self.router.record_write(self.info["user_id"])
+
+    def _on_transaction_end(self, session, transaction) -> None:
+        if transaction.parent is None:
+            self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.router is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+        if not is_plain_select(clause):
+            self._wrote = True
+        elif self.info.get("replica_reads") and not self._wrote and not self._flushing:
+            replica = self.router.choose_replica(self.info.get("user_id"))
+            if replica is not None:
+                return replica.sync_engine
+        return self.router.primary.sync_engine
+
+def is_plain_select(statement) -> bool:
+    """
+    Whether a statement only reads: a SELECT without row locks. SELECTs over a
+    data-modifying CTE are marked with the `writes=True` execution option.
+    """
+    return (
+        statement is not None
+        and getattr(statement, "is_select", False)
+        and getattr(statement, "_for_update_arg", None) is None
+        and not statement.get_execution_options().get("writes", False)
+    )
+
+def replica_read(func):
+    """
+    Mark an async CRUD method (taking `db` as its first argument) as safe to
+    serve from a replica. Only use it for reads whose results are not written
+    back in the same request.
+    """
+    @functools.wraps(func)
+    async def wrapper(owner, *args, **kwargs):
+        db = args[0] if args else kwargs["db"]
+        previous = db.info.get("replica_reads", False)
+        db.info["replica_reads"] = True
+        try:
+            return await func(owner, *args, **kwargs)
+        finally:
+            db.info["replica_reads"] = previous
+    return wrapper
@@ -0,0 +1,56 @@
+"""
+Fast JSON response rendering.
+"""
+
+import json
+import enum
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Iterable, List, Type
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for types the JSON backend does not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """
+    Opt-in JSON response for list endpoints.
+
+    Return it directly from a route to skip FastAPI's `jsonable_encoder` pass;
+    datetimes, enums and Pydantic models are encoded by the JSON backend itself.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Cached list adapter so the validator/serializer is only built once per schema."""
+    return TypeAdapter(List[model])
+
+def model_list_response(model: Type[BaseModel], items: Iterable[Any], **kwargs: Any) -> Response:
+    """Validate ORM objects with `from_attributes` and dump them straight to JSON bytes."""
+    adapter = _list_adapter(model)
+    content = adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
+    return Response(content=content, media_type="application/json", **kwargs)
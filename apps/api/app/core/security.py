@@ -5,6 +5,7 @@ Security utilities for authentication.
 import bcrypt
 import jwt
 from datetime import datetime, timedelta, timezone
+from starlette.concurrency import run_in_threadpool
 
 # Constants
 SECRET_KEY = "your-super-secret-key-change-this-in-production"  # Should be in environment variables
@@ -22,6 +23,14 @@ def get_password_hash(password: str) -> str:
     salt = bcrypt.gensalt()
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
+async def verify_password_in_thread(plain_password: str, hashed_password: str) -> bool:
+    """verify_password in a worker thread, keeping bcrypt off the event loop."""
+    return await run_in_threadpool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_in_thread(password: str) -> str:
+    """get_password_hash in a worker thread, keeping bcrypt off the event loop."""
+    return await run_in_threadpool(get_password_hash, password)
+
 def create_access_token(data: dict) -> str:
     """Create JWT access token."""
     return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
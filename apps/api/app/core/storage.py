@@ -0,0 +1,106 @@
+"""
+Pluggable blob storage for uploaded media (content-addressed, immutable keys).
+"""
+
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
+
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", os.path.join(os.getcwd(), "media"))
+MEDIA_URL = os.getenv("MEDIA_URL", "/api/v1/media")
+
+def content_key(data: bytes, extension: str) -> str:
+    """Content-addressed key: identical bytes always map to the same key."""
+    digest = hashlib.sha256(data).hexdigest()
+    return f"{digest[:2]}/{digest[2:4]}/{digest}.{extension}"
+
+class StorageBackend(ABC):
+    """Interface for media storage backends."""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Whether a blob is stored under `key`."""
+
+    @abstractmethod
+    async def save(self, key: str, data: bytes, content_type: str) -> None:
+        """Write a blob under `key`."""
+
+    @abstractmethod
+    async def read(self, key: str) -> Optional[bytes]:
+        """The blob stored under `key`, or None if there is none."""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """Public URL of a key."""
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Path of the blob on local disk if it can be served directly, else None."""
+        return None
+
+    async def store(self, data: bytes, extension: str, content_type: str) -> str:
+        """Store `data` under its content key unless an identical blob already exists."""
+        key = content_key(data, extension)
+        if not await self.exists(key):
+            await self.save(key, data, content_type)
+        return key
+
+class LocalStorage(StorageBackend):
+    """Store blobs on the local filesystem (development and tests)."""
+
+    def __init__(self, root: str = MEDIA_ROOT, base_url: str = MEDIA_URL) -> None:
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def path(self, key: str) -> str:
+        """Filesystem path of a key."""
+        return os.path.join(self.root, *key.split("/"))
+
+    async def exists(self, key: str) -> bool:
+        return await run_in_threadpool(os.path.exists, self.path(key))
+
+    async def save(self, key: str, data: bytes, content_type: str) -> None:
+        await run_in_threadpool(self._write_atomic, self.path(key), data)
+
+    async def read(self, key: str) -> Optional[bytes]:
+        return await run_in_threadpool(self._read, self.path(key))
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    def local_path(self, key: str) -> Optional[str]:
+        path = self.path(key)
+        return path if os.path.isfile(path) else None
+
+    @staticmethod
+    def _read(path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        """Write via a temp file + rename so readers never see a partial blob."""
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+_storage: Optional[StorageBackend] = None
+
+def get_storage() -> StorageBackend:
+    """Get the configured storage backend (FastAPI dependency; override in tests)."""
+    global _storage
+    if _storage is None:
+        _storage = LocalStorage()
+    return _storage
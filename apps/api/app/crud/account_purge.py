@@ -0,0 +1,205 @@
+"""
+Account deletion: chunked, resumable purge of a user's data.
+
+The schema has no ON DELETE CASCADE, so a user's rows are deleted child-first
+in stages. Every chunk is its own short transaction that also records the
+stage and keyset cursor in `account_purges`, so a crashed purge resumes from
+the last committed chunk and never holds long locks on `likes`/`posts`.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.reactions import reaction as crud_reaction
+from app.models.account_purge import AccountPurge
+from app.models.bookmark import Bookmark
+from app.models.interaction import Like, Comment, Follow
+from app.models.notification import Notification
+from app.models.post import Post
+from app.models.reaction import Reaction
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+PURGE_CHUNK_SIZE = 500
+
+# (rows deleted, keys scanned, last key) for one chunk of a stage
+ChunkResult = Tuple[int, int, Optional[str]]
+StageHandler = Callable[[AsyncSession, int, Optional[str], int], Awaitable[ChunkResult]]
+
+def _user_post_ids(user_id: int):
+    """Subquery of the IDs of a user's posts."""
+    return select(Post.id).where(Post.author_id == user_id)
+
+async def _delete_keyset_chunk(db: AsyncSession, model, condition, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """Delete the next `chunk_size` rows matching `condition` in primary-key order."""
+    ids = select(model.id).where(condition)
+    if cursor is not None:
+        ids = ids.where(model.id > cursor)
+    ids = ids.order_by(model.id).limit(chunk_size).scalar_subquery()
+    result = await db.execute(delete(model).where(model.id.in_(ids)).returning(model.id))
+    deleted = result.scalars().all()
+    return len(deleted), len(deleted), max(deleted) if deleted else cursor
+
+async def _purge_likes(db: AsyncSession, user_id: int, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """Likes the user gave."""
+    return await _delete_keyset_chunk(db, Like, Like.user_id == user_id, cursor, chunk_size)
+
+async def _purge_post_likes(db: AsyncSession, user_id: int, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """Likes other users gave to the user's posts."""
+    return await _delete_keyset_chunk(db, Like, Like.post_id.in_(_user_post_ids(user_id)), cursor, chunk_size)
+
+async def _purge_reactions(db: AsyncSession, user_id: int, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """Reactions the user gave (the reacted posts' histograms are adjusted)."""
+    ids = select(Reaction.id).where(Reaction.user_id == user_id)
+    if cursor is not None:
+        ids = ids.where(Reaction.id > cursor)
+    ids = ids.order_by(Reaction.id).limit(chunk_size).scalar_subquery()
+    deleted = await crud_reaction.remove_reactions(db, Reaction.id.in_(ids))
+    return len(deleted), len(deleted), max(deleted) if deleted else cursor
+
+async def _purge_post_reactions(db: AsyncSession, user_id: int, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """Reactions other users gave to the user's posts (histograms go with the posts)."""
+    return await _delete_keyset_chunk(db, Reaction, Reaction.post_id.in_(_user_post_ids(user_id)), cursor, chunk_size)
+
+async def _purge_bookmarks(db: AsyncSession, user_id: int, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """The user's bookmarks, and other users' bookmarks of the user's posts."""
+    condition = or_(Bookmark.user_id == user_id, Bookmark.post_id.in_(_user_post_ids(user_id)))
+    return await _delete_keyset_chunk(db, Bookmark, condition, cursor, chunk_size)
+
+async def _purge_comments(db: AsyncSession, user_id: int, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """Comments by the user or on the user's posts, together with their reply subtrees."""
+    roots = select(Comment.id).where(
+        or_(Comment.author_id == user_id, Comment.post_id.in_(_user_post_ids(user_id)))
+    )
+    if cursor is not None:
+        roots = roots.where(Comment.id > cursor)
+    root_ids = (await db.execute(roots.order_by(Comment.id).limit(chunk_size))).scalars().all()
+    if not root_ids:
+        return 0, 0, cursor
+
+    subtree = select(Comment.id).where(Comment.id.in_(root_ids)).cte("subtree", recursive=True)
+    subtree = subtree.union(select(Comment.id).join(subtree, Comment.parent_id == subtree.c.id))
+    # Parent/child FKs are checked at statement end, so a whole subtree can go in one DELETE
+    result = await db.execute(delete(Comment).where(Comment.id.in_(select(subtree.c.id))).returning(Comment.id))
+    return len(result.scalars().all()), len(root_ids), max(root_ids)
+
+async def _purge_follows(db: AsyncSession, user_id: int, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """Follow relationships in both directions."""
+    condition = or_(Follow.follower_id == user_id, Follow.followed_id == user_id)
+    return await _delete_keyset_chunk(db, Follow, condition, cursor, chunk_size)
+
+async def _purge_notifications(db: AsyncSession, user_id: int, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """Notifications addressed to the user."""
+    return await _delete_keyset_chunk(db, Notification, Notification.user_id == user_id, cursor, chunk_size)
+
+async def _purge_posts(db: AsyncSession, user_id: int, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """The user's posts, sweeping up likes/reactions/bookmarks/comments that arrived after the earlier stages."""
+    posts = select(Post.id).where(Post.author_id == user_id)
+    if cursor is not None:
+        posts = posts.where(Post.id > cursor)
+    post_ids = (await db.execute(posts.order_by(Post.id).limit(chunk_size))).scalars().all()
+    if not post_ids:
+        return 0, 0, cursor
+
+    await db.execute(delete(Like).where(Like.post_id.in_(post_ids)))
+    await db.execute(delete(Reaction).where(Reaction.post_id.in_(post_ids)))
+    await db.execute(delete(Bookmark).where(Bookmark.post_id.in_(post_ids)))
+    await db.execute(delete(Comment).where(Comment.post_id.in_(post_ids)))
+    result = await db.execute(delete(Post).where(Post.id.in_(post_ids)))
+    return result.rowcount, len(post_ids), max(post_ids)
+
+async def _purge_user(db: AsyncSession, user_id: int, cursor: Optional[str], chunk_size: int) -> ChunkResult:
+    """
+    The user row itself.
+
+    Purges that were already past the reactions and bookmarks stages when
+    those were added never ran them, so the user's remaining reactions and
+    bookmarks are swept first; their foreign keys would block the delete.
+    """
+    swept = len(await crud_reaction.remove_reactions(db, Reaction.user_id == user_id))
+    swept += (await db.execute(delete(Bookmark).where(Bookmark.user_id == user_id))).rowcount
+    result = await db.execute(delete(User).where(User.id == user_id))
+    return swept + result.rowcount, 0, None
+
+# Child tables first; each stage runs to exhaustion before the next starts.
+# Purges in progress never revisit earlier stages, so a stage added before
+# "posts" needs a matching sweep in _purge_posts or _purge_user.
+PURGE_STAGES: Dict[str, StageHandler] = {
+    "likes": _purge_likes,
+    "post_likes": _purge_post_likes,
+    "reactions": _purge_reactions,
+    "post_reactions": _purge_post_reactions,
+    "bookmarks": _purge_bookmarks,
+    "comments": _purge_comments,
+    "follows": _purge_follows,
+    "notifications": _purge_notifications,
+    "posts": _purge_posts,
+    "user": _purge_user,
+}
+PURGE_DONE = "done"
+
+def _next_stage(stage: str) -> str:
+    """Stage that follows `stage` in PURGE_STAGES."""
+    stages = list(PURGE_STAGES)
+    index = stages.index(stage) + 1
+    return stages[index] if index < len(stages) else PURGE_DONE
+
+async def request_account_purge(db: AsyncSession, *, user_id: int) -> AccountPurge:
+    """Record a deletion request (idempotent); the purge itself runs out of band."""
+    purge = await db.get(AccountPurge, user_id)
+    if purge is None:
+        purge = AccountPurge(user_id=user_id, stage=next(iter(PURGE_STAGES)), rows_deleted=0)
+        db.add(purge)
+        await db.commit()
+        await db.refresh(purge)
+    return purge
+
+async def purge_account(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    chunk_size: int = PURGE_CHUNK_SIZE,
+    max_chunks: Optional[int] = None
+) -> AccountPurge:
+    """
+    Run (or resume) the purge for one user, committing after every chunk.
+
+    A stage ends once a sweep that started from the beginning of its keyset
+    deletes less than a full chunk; a sweep that started mid-way is followed by
+    one more from the start to catch rows inserted behind the cursor.
+    `max_chunks` bounds the work done in this call (None = run to completion).
+    """
+    purge = await request_account_purge(db, user_id=user_id)
+    chunks = 0
+    while purge.stage != PURGE_DONE and (max_chunks is None or chunks < max_chunks):
+        started_at = purge.cursor
+        deleted, scanned, last_key = await PURGE_STAGES[purge.stage](db, user_id, purge.cursor, chunk_size)
+        purge.rows_deleted += deleted
+
+        if scanned >= chunk_size:
+            purge.cursor = last_key
+        elif started_at is not None:
+            purge.cursor = None
+        else:
+            purge.stage, purge.cursor = _next_stage(purge.stage), None
+            if purge.stage == PURGE_DONE:
+                purge.completed_at = datetime.now(timezone.utc)
+
+        await db.commit()
+        chunks += 1
+
+    logger.info(f"Account purge for user {user_id}: stage={purge.stage}, rows_deleted={purge.rows_deleted}")
+    return purge
+
+async def purge_pending_accounts(db: AsyncSession, *, limit: int = 10, chunk_size: int = PURGE_CHUNK_SIZE) -> List[AccountPurge]:
+    """Run the oldest outstanding purges to completion."""
+    result = await db.execute(
+        select(AccountPurge.user_id)
+        .where(AccountPurge.completed_at.is_(None))
+        .order_by(AccountPurge.requested_at)
+        .limit(limit)
+    )
+    return [await purge_account(db, user_id=user_id, chunk_size=chunk_size) for user_id in result.scalars().all()]
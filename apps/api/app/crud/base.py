@@ -1,8 +1,8 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from fastapi.encoders import jsonable_encoder
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Generic, List, Optional, Type, TypeVar, Union
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, inspect
 from app.core.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -16,6 +16,11 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
+    @cached_property
+    def column_keys(self) -> FrozenSet[str]:
+        """Attribute names of the model's mapped columns."""
+        return frozenset(attr.key for attr in inspect(self.model).column_attrs)
+
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         """Get a single record by ID."""
         result = await db.execute(select(self.model).where(self.model.id == id))
@@ -47,19 +52,27 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
         """Update a record."""
-        obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        self._apply_update(db_obj, update_data)
         db.add(db_obj)
+        await self.after_update(db, db_obj)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    def _apply_update(self, db_obj: ModelType, update_data: Dict[str, Any]) -> None:
+        """Copy updated fields that are mapped columns onto `db_obj`."""
+        column_keys = self.column_keys
+        for field, value in update_data.items():
+            if field in column_keys:
+                setattr(db_obj, field, value)
+
+    async def after_update(self, db: AsyncSession, db_obj: ModelType) -> None:
+        """Hook run in the update's transaction, before it commits."""
+
     async def remove(self, db: AsyncSession, *, id: Any) -> ModelType:
         """Delete a record."""
         obj = await db.get(self.model, id)
@@ -0,0 +1,56 @@
+"""
+Private bookmarks (PRD §6.3).
+"""
+
+from typing import List
+from sqlalchemy import and_, bindparam, delete, desc, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.replicas import replica_read
+from app.models.bookmark import Bookmark
+from app.models.post import Post
+
+ADD_BOOKMARK = (
+    pg_insert(Bookmark.__table__)
+    .values(user_id=bindparam("target_user_id"), post_id=bindparam("target_id"))
+    .on_conflict_do_nothing(index_elements=["user_id", "post_id"])
+    .returning(Bookmark.__table__.c.id)
+)
+REMOVE_BOOKMARK = (
+    delete(Bookmark)
+    .where(Bookmark.user_id == bindparam("target_user_id"), Bookmark.post_id == bindparam("target_id"))
+    .returning(Bookmark.id)
+)
+# Bookmarked posts the user can still see, most recently saved first
+BOOKMARKED_POST_IDS = (
+    select(Bookmark.post_id)
+    .join(Post, Post.id == Bookmark.post_id)
+    .where(Bookmark.user_id == bindparam("target_user_id"))
+    .where(or_(and_(Post.is_public == True, Post.is_draft == False), Post.author_id == Bookmark.user_id))
+    .order_by(desc(Bookmark.created_at), desc(Bookmark.id))
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+class CRUDBookmark:
+    """Bookmark writes and listing."""
+
+    async def add(self, db: AsyncSession, *, user_id: int, post_id: str) -> bool:
+        """Bookmark a post; False if it was already bookmarked."""
+        created = await db.scalar(ADD_BOOKMARK, {"target_user_id": user_id, "target_id": post_id})
+        await db.commit()
+        return created is not None
+
+    async def remove(self, db: AsyncSession, *, user_id: int, post_id: str) -> bool:
+        """Remove a bookmark; False if there was none."""
+        removed = await db.scalar(REMOVE_BOOKMARK, {"target_user_id": user_id, "target_id": post_id})
+        await db.commit()
+        return removed is not None
+
+    @replica_read
+    async def get_post_ids(self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 20) -> List[str]:
+        """IDs of a page of the user's bookmarked posts."""
+        result = await db.execute(BOOKMARKED_POST_IDS, {"target_user_id": user_id, "skip": skip, "limit": limit})
+        return list(result.scalars())
+
+bookmark = CRUDBookmark()
@@ -0,0 +1,76 @@
+"""
+Like, comment and follow notifications, delivered from the outbox.
+
+Each subscriber resolves the recipient and the actor's username with one
+query and inserts the notification in the relay's transaction. Self-likes,
+self-comments and events whose post, actor or recipient no longer exists
+notify nobody.
+"""
+
+from typing import Any, Dict, Optional
+from sqlalchemy import bindparam, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.core.outbox import DomainEvent, subscribe
+from app.models.notification import Notification
+from app.models.post import Post
+from app.models.user import User
+
+POST_AUTHOR_AND_ACTOR = select(
+    select(Post.author_id).where(Post.id == bindparam("target_id")).scalar_subquery(),
+    select(User.username).where(User.id == bindparam("actor_id")).scalar_subquery(),
+)
+_recipient = aliased(User)
+ACTOR_IF_RECIPIENT = select(User.username).where(
+    User.id == bindparam("actor_id"),
+    select(_recipient.id).where(_recipient.id == bindparam("recipient_id")).exists(),
+)
+
+async def _notify(db: AsyncSession, *, user_id: int, type: str, title: str, message: str, data: Dict[str, Any]) -> None:
+    await db.execute(insert(Notification), [
+        {"user_id": user_id, "type": type, "title": title, "message": message, "data": data}
+    ])
+
+async def _post_author_and_actor(db: AsyncSession, post_id: str, actor_id: int) -> Optional[tuple]:
+    """(author_id, actor username), or None if nobody should be notified."""
+    author_id, username = (await db.execute(POST_AUTHOR_AND_ACTOR, {"target_id": post_id, "actor_id": actor_id})).one()
+    if author_id is None or username is None or author_id == actor_id:
+        return None
+    return author_id, username
+
+@subscribe("like.created")
+async def notify_like(db: AsyncSession, event: DomainEvent) -> None:
+    liker_id = event.payload["user_id"]
+    found = await _post_author_and_actor(db, event.aggregate_id, liker_id)
+    if found:
+        author_id, username = found
+        await _notify(
+            db, user_id=author_id, type="like", title="New like",
+            message=f"@{username} liked your post",
+            data={"post_id": event.aggregate_id, "user_id": liker_id},
+        )
+
+@subscribe("comment.created")
+async def notify_comment(db: AsyncSession, event: DomainEvent) -> None:
+    commenter_id = event.payload["author_id"]
+    found = await _post_author_and_actor(db, event.aggregate_id, commenter_id)
+    if found:
+        author_id, username = found
+        await _notify(
+            db, user_id=author_id, type="comment", title="New comment",
+            message=f"@{username} commented on your post",
+            data={"post_id": event.aggregate_id, "comment_id": event.payload["comment_id"], "author_id": commenter_id},
+        )
+
+@subscribe("follow.created")
+async def notify_follow(db: AsyncSession, event: DomainEvent) -> None:
+    follower_id = event.payload["follower_id"]
+    username = await db.scalar(
+        ACTOR_IF_RECIPIENT, {"actor_id": follower_id, "recipient_id": int(event.aggregate_id)}
+    )
+    if username is not None:
+        await _notify(
+            db, user_id=int(event.aggregate_id), type="follow", title="New follower",
+            message=f"@{username} started following you",
+            data={"follower_id": follower_id},
+        )
@@ -0,0 +1,92 @@
+"""
+Streaming export of a user's gratitude history (posts, likes, comments).
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.post import Post
+from app.models.interaction import Like, Comment
+
+EXPORT_CHUNK_SIZE = 500
+
+# Section name -> (model, owner column, exported columns); exported in this order
+SECTIONS = {
+    "post": (Post, Post.author_id, (
+        Post.id, Post.title, Post.content, Post.post_type, Post.image_url,
+        Post.is_public, Post.created_at, Post.updated_at,
+    )),
+    "like": (Like, Like.user_id, (Like.id, Like.post_id, Like.created_at)),
+    "comment": (Comment, Comment.author_id, (
+        Comment.id, Comment.post_id, Comment.parent_id, Comment.content,
+        Comment.created_at, Comment.updated_at,
+    )),
+}
+
+class Checkpoint(NamedTuple):
+    """Keyset position: everything up to and including this row has been exported."""
+    section: str
+    created_at: Optional[datetime]
+    id: str
+
+def encode_checkpoint(checkpoint: Checkpoint) -> str:
+    """Encode a checkpoint as an opaque URL-safe cursor."""
+    created_at = checkpoint.created_at.isoformat() if checkpoint.created_at else None
+    raw = json.dumps([checkpoint.section, created_at, checkpoint.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_checkpoint(cursor: str) -> Checkpoint:
+    """Decode a cursor produced by `encode_checkpoint` (raises ValueError if malformed)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        section, created_at, row_id = json.loads(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid export cursor") from e
+    if section not in SECTIONS or not isinstance(row_id, str):
+        raise ValueError("Invalid export cursor")
+    return Checkpoint(section, datetime.fromisoformat(created_at) if created_at else None, row_id)
+
+async def stream_user_history(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    after: Optional[Checkpoint] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> AsyncIterator[Tuple[str, List[Dict[str, Any]], Checkpoint]]:
+    """
+    Yield (section, rows, checkpoint) chunks of a user's history.
+
+    Rows come from a server-side cursor over column-only selects, so memory
+    stays bounded by `chunk_size` regardless of history length. Each section
+    is ordered by the (created_at, id) keyset, which is what makes `after`
+    resumable.
+    """
+    sections = list(SECTIONS)
+    start = sections.index(after.section) if after else 0
+
+    for section in sections[start:]:
+        model, owner_column, columns = SECTIONS[section]
+        query = (
+            select(*columns)
+            .where(owner_column == user_id)
+            .order_by(model.created_at, model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        if after and after.section == section:
+            if after.created_at is None:
+                query = query.where(model.created_at.is_(None), model.id > after.id)
+            else:
+                # NULL timestamps sort last in Postgres, so they are still ahead of us
+                query = query.where(or_(
+                    tuple_(model.created_at, model.id) > tuple_(after.created_at, after.id),
+                    model.created_at.is_(None),
+                ))
+
+        result = await db.stream(query)
+        async for partition in result.mappings().partitions(chunk_size):
+            rows = [dict(row) for row in partition]
+            last = rows[-1]
+            yield section, rows, Checkpoint(section, last["created_at"], last["id"])
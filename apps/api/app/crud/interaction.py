@@ -2,7 +2,14 @@ from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, desc
 from sqlalchemy.orm import selectinload
+from app.core.replicas import replica_read
 from app.crud.base import CRUDBase
+from app.crud.mentions import notify_mentions
+from app.crud.outbox import outbox
+from app.crud.post_features import post_features
+from app.crud.suggestions import follow_suggestions
+from app.crud.trending import COMMENT_WEIGHT, LIKE_WEIGHT, trending
+from app.crud.user_stats import user_stats
 from app.models.interaction import Like, Comment, Follow
 from app.schemas.interaction import LikeCreate, CommentCreate, CommentUpdate, FollowCreate
 
@@ -22,6 +29,14 @@ class CRUDLike(CRUDBase[Like, LikeCreate, LikeCreate]):
         # Create new like directly
         like = Like(user_id=user_id, post_id=post_id)
         db.add(like)
+        await post_features.adjust_counts(db, post_id=post_id, hearts=1)
+        await trending.record_event(db, post_id=post_id, weight=LIKE_WEIGHT)
+        await user_stats.adjust_hearts(db, post_id=post_id, delta=1)
+        await db.flush()
+        await outbox.emit(
+            db, aggregate_type="post", aggregate_id=post_id, event_type="like.created",
+            payload={"like_id": like.id, "user_id": user_id},
+        )
         await db.commit()
         await db.refresh(like)
         return like
@@ -37,10 +52,14 @@ class CRUDLike(CRUDBase[Like, LikeCreate, LikeCreate]):
         like = like.scalar_one_or_none()
         if like:
             await db.delete(like)
+            await post_features.adjust_counts(db, post_id=post_id, hearts=-1)
+            await trending.remove_event(db, post_id=post_id, weight=LIKE_WEIGHT, at=like.created_at)
+            await user_stats.adjust_hearts(db, post_id=post_id, delta=-1)
             await db.commit()
             return True
         return False
 
+    @replica_read
     async def get_post_likes(self, db: AsyncSession, *, post_id: str, skip: int = 0, limit: int = 20) -> List[Like]:
         """Get all likes for a post."""
         result = await db.execute(
@@ -54,6 +73,7 @@ class CRUDLike(CRUDBase[Like, LikeCreate, LikeCreate]):
         return result.scalars().all()
 
 class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
+    @replica_read
     async def get_post_comments(
         self, 
         db: AsyncSession, 
@@ -83,6 +103,7 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
         
         return comments
 
+    @replica_read
     async def get_comment_replies(
         self, 
         db: AsyncSession, 
@@ -119,6 +140,14 @@ class CRUDComment(CRUDBase[Comment, CommentCreate, CommentUpdate]):
             parent_id=parent_id
         )
         db.add(comment)
+        await post_features.adjust_counts(db, post_id=post_id, comments=1)
+        await trending.record_event(db, post_id=post_id, weight=COMMENT_WEIGHT)
+        await db.flush()
+        await notify_mentions(db, author_id=author_id, content=content, post_id=post_id, comment_id=comment.id)
+        await outbox.emit(
+            db, aggregate_type="post", aggregate_id=post_id, event_type="comment.created",
+            payload={"comment_id": comment.id, "author_id": author_id, "parent_id": parent_id},
+        )
         await db.commit()
         await db.refresh(comment)
         return comment
@@ -139,7 +168,13 @@ class CRUDFollow(CRUDBase[Follow, FollowCreate, FollowCreate]):
         # Create new follow directly
         follow = Follow(follower_id=follower_id, followed_id=followed_id)
         db.add(follow)
+        await user_stats.adjust_follow(db, follower_id=follower_id, followed_id=followed_id, delta=1)
+        await outbox.emit(
+            db, aggregate_type="user", aggregate_id=followed_id, event_type="follow.created",
+            payload={"follower_id": follower_id},
+        )
         await db.commit()
+        follow_suggestions.follow_added(follower_id, followed_id)
         await db.refresh(follow)
         return follow
 
@@ -154,10 +189,13 @@ class CRUDFollow(CRUDBase[Follow, FollowCreate, FollowCreate]):
         follow = follow.scalar_one_or_none()
         if follow:
             await db.delete(follow)
+            await user_stats.adjust_follow(db, follower_id=follower_id, followed_id=followed_id, delta=-1)
             await db.commit()
+            follow_suggestions.follow_removed(follower_id, followed_id)
             return True
         return False
 
+    @replica_read
     async def get_followers(
         self, 
         db: AsyncSession, 
@@ -177,6 +215,7 @@ class CRUDFollow(CRUDBase[Follow, FollowCreate, FollowCreate]):
         )
         return result.scalars().all()
 
+    @replica_read
     async def get_following(
         self, 
         db: AsyncSession, 
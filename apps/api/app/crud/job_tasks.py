@@ -0,0 +1,41 @@
+"""
+Maintenance jobs runnable on the job queue (the scripts/ equivalents, for
+deployments that schedule work by enqueueing instead of cron).
+"""
+
+from typing import Any, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.jobs import register_task
+from app.crud.account_purge import PURGE_CHUNK_SIZE, purge_pending_accounts
+from app.crud.jobs import JOB_RETENTION_HOURS, job
+from app.crud.post_features import post_features
+from app.crud.scheduled_posts import scheduled_posts
+from app.crud.trending import trending
+from app.crud.user_stats import USER_STATS_BATCH_SIZE, user_stats
+
+@register_task("purge_accounts")
+async def purge_accounts(db: AsyncSession, payload: Dict[str, Any]) -> None:
+    await purge_pending_accounts(
+        db, limit=payload.get("limit", 10), chunk_size=payload.get("chunk_size", PURGE_CHUNK_SIZE)
+    )
+
+@register_task("reconcile_user_stats")
+async def reconcile_user_stats(db: AsyncSession, payload: Dict[str, Any]) -> None:
+    await user_stats.reconcile(db, batch_size=payload.get("batch_size", USER_STATS_BATCH_SIZE))
+
+@register_task("refresh_post_features")
+async def refresh_post_features(db: AsyncSession, payload: Dict[str, Any]) -> None:
+    # Committed together with the job's completion
+    await post_features.refresh(db, post_ids=payload.get("post_ids"))
+
+@register_task("compact_trending")
+async def compact_trending(db: AsyncSession, payload: Dict[str, Any]) -> None:
+    await trending.compact(db)
+
+@register_task("publish_scheduled_posts")
+async def publish_scheduled_posts(db: AsyncSession, payload: Dict[str, Any]) -> None:
+    await scheduled_posts.publish_due(db)
+
+@register_task("prune_jobs")
+async def prune_jobs(db: AsyncSession, payload: Dict[str, Any]) -> None:
+    await job.prune(db, retention_hours=payload.get("retention_hours", JOB_RETENTION_HOURS))
@@ -0,0 +1,344 @@
+"""
+Postgres-backed job queue and worker.
+
+Jobs are rows in `jobs`. Enqueueing is one INSERT in the caller's
+transaction, so a job exists exactly when the write that requested it
+commits. Workers claim ready jobs with `FOR UPDATE SKIP LOCKED` inside the
+claiming UPDATE, so any number of worker processes share a queue without
+handing out a job twice. A claim is a lease: `run_at` moves to the end of the
+visibility timeout, and a job whose worker died becomes claimable again once
+it passes. The attempt number is the lease token; completing or retrying a
+job whose lease was lost (and re-claimed) is a no-op.
+
+Failed attempts are retried with capped exponential backoff until
+`max_attempts`, after which the job is marked failed and kept for
+inspection; finished jobs are pruned after JOB_RETENTION_HOURS.
+
+Async handlers are called as `handler(db, payload)` with a session whose
+transaction also records the job's completion, so a handler that doesn't
+commit itself has its writes and completion committed together. CPU-bound
+handlers are called as `handler(payload)` in a process pool.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set
+from sqlalchemy import JSON, Interval, and_, bindparam, case, delete, func, insert, literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_session_factory
+from app.core.replicas import replica_read
+from app.core.jobs import JOB_MAX_ATTEMPTS, JOB_TASKS, JobMetrics, get_task, retry_delay
+from app.models.job import JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, Job
+
+logger = logging.getLogger(__name__)
+
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "8"))
+JOB_PROCESSES = int(os.getenv("JOB_PROCESSES", "2"))
+JOB_VISIBILITY_TIMEOUT_SECONDS = float(os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "300"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "72"))
+JOB_METRICS_LOG_SECONDS = float(os.getenv("JOB_METRICS_LOG_SECONDS", "60"))
+
+_jobs = Job.__table__
+# Spelled as in the ix_jobs_ready predicate so the planner can use the partial index
+_live = _jobs.c.status.in_([literal_column(f"'{JOB_QUEUED}'"), literal_column(f"'{JOB_RUNNING}'")])
+
+def _after(name: str):
+    """now() plus the timedelta bound to `name`."""
+    return func.now() + bindparam(name, type_=Interval)
+
+class ClaimedJob(NamedTuple):
+    """A leased job."""
+    id: int
+    task: str
+    payload: Dict[str, Any]
+    attempt: int
+    max_attempts: int
+
+ENQUEUE = (
+    insert(_jobs)
+    .values(
+        queue=bindparam("queue_name"),
+        task=bindparam("task_name"),
+        payload=bindparam("job_payload", type_=JSON),
+        max_attempts=bindparam("attempt_limit"),
+        run_at=_after("delay"),
+    )
+    .returning(_jobs.c.id)
+)
+
+_ready = (
+    select(_jobs.c.id)
+    .where(_jobs.c.queue == bindparam("queue_name"), _live, _jobs.c.run_at <= func.now())
+    .where(_jobs.c.attempts < _jobs.c.max_attempts)
+    .order_by(_jobs.c.run_at)
+    .limit(bindparam("batch_size"))
+    .with_for_update(skip_locked=True)
+)
+CLAIM = (
+    update(_jobs)
+    .where(_jobs.c.id.in_(_ready.scalar_subquery()))
+    .values(status=JOB_RUNNING, attempts=_jobs.c.attempts + 1, run_at=_after("visibility"))
+    .returning(_jobs.c.id, _jobs.c.task, _jobs.c.payload, _jobs.c.attempts, _jobs.c.max_attempts)
+)
+# Leases that expired on their last attempt (the worker died or hung)
+EXPIRE_EXHAUSTED = (
+    update(_jobs)
+    .where(_jobs.c.queue == bindparam("queue_name"), _live, _jobs.c.run_at <= func.now())
+    .where(_jobs.c.status == JOB_RUNNING, _jobs.c.attempts >= _jobs.c.max_attempts)
+    .values(status=JOB_FAILED, finished_at=func.now(), last_error="Visibility timeout expired")
+)
+
+_leased = and_(
+    _jobs.c.id == bindparam("job_id"), _jobs.c.attempts == bindparam("attempt"), _jobs.c.status == JOB_RUNNING
+)
+COMPLETE = update(_jobs).where(_leased).values(status=JOB_DONE, finished_at=func.now(), last_error=None)
+_exhausted = _jobs.c.attempts >= _jobs.c.max_attempts
+RETRY = (
+    update(_jobs)
+    .where(_leased)
+    .values(
+        status=case((_exhausted, JOB_FAILED), else_=JOB_QUEUED),
+        run_at=_after("delay"),
+        finished_at=case((_exhausted, func.now()), else_=None),
+        last_error=bindparam("error"),
+    )
+    .returning(_jobs.c.status)
+)
+FAIL = update(_jobs).where(_leased).values(status=JOB_FAILED, finished_at=func.now(), last_error=bindparam("error"))
+
+PRUNE = delete(Job).where(Job.finished_at < func.now() - bindparam("retention", type_=Interval))
+
+LIVE_COUNTS = (
+    select(
+        _jobs.c.queue,
+        func.count().filter(_jobs.c.status == JOB_QUEUED),
+        func.count().filter(_jobs.c.status == JOB_RUNNING),
+        # Age of the oldest job waiting past its run_at: how far behind the workers are
+        func.coalesce(func.extract("epoch", func.now() - func.min(_jobs.c.run_at).filter(
+            _jobs.c.status == JOB_QUEUED, _jobs.c.run_at <= func.now()
+        )), 0),
+    )
+    .where(_live)
+    .group_by(_jobs.c.queue)
+)
+FINISHED_COUNTS = (
+    select(
+        _jobs.c.queue,
+        func.count().filter(_jobs.c.status == JOB_DONE),
+        func.count().filter(_jobs.c.status == JOB_FAILED),
+    )
+    .where(_jobs.c.finished_at > func.now() - bindparam("window", type_=Interval))
+    .group_by(_jobs.c.queue)
+)
+
+class CRUDJob:
+    """Enqueueing, leasing and bookkeeping of jobs."""
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        *,
+        task: str,
+        payload: Optional[Dict[str, Any]] = None,
+        queue: str = "default",
+        delay: float = 0.0,
+        max_attempts: Optional[int] = None
+    ) -> int:
+        """Add a job, runnable after `delay` seconds; the caller commits. Returns the job ID."""
+        if max_attempts is None:
+            max_attempts = JOB_TASKS[task].max_attempts if task in JOB_TASKS else JOB_MAX_ATTEMPTS
+        return await db.scalar(ENQUEUE, {
+            "queue_name": queue,
+            "task_name": task,
+            "job_payload": payload or {},
+            "attempt_limit": max_attempts,
+            "delay": timedelta(seconds=delay),
+        })
+
+    async def claim(
+        self,
+        db: AsyncSession,
+        *,
+        queue: str = "default",
+        limit: int = 1,
+        visibility_timeout: float = JOB_VISIBILITY_TIMEOUT_SECONDS
+    ) -> List[ClaimedJob]:
+        """Lease up to `limit` ready jobs not leased by another worker and commit."""
+        await db.execute(EXPIRE_EXHAUSTED, {"queue_name": queue})
+        result = await db.execute(
+            CLAIM, {"queue_name": queue, "batch_size": limit, "visibility": timedelta(seconds=visibility_timeout)}
+        )
+        claimed = [ClaimedJob(*row) for row in result]
+        await db.commit()
+        return claimed
+
+    async def complete(self, db: AsyncSession, *, job: ClaimedJob) -> bool:
+        """Mark a leased job done and commit; False if the lease was lost."""
+        result = await db.execute(COMPLETE, {"job_id": job.id, "attempt": job.attempt})
+        await db.commit()
+        return result.rowcount == 1
+
+    async def retry(self, db: AsyncSession, *, job: ClaimedJob, error: str, delay: Optional[float] = None) -> Optional[str]:
+        """Record a failed attempt and commit: requeued with backoff, or failed once out of attempts.
+
+        Returns the new status (None if the lease was lost).
+        """
+        if delay is None:
+            delay = retry_delay(job.attempt)
+        status = await db.scalar(RETRY, {"job_id": job.id, "attempt": job.attempt, "error": error, "delay": timedelta(seconds=delay)})
+        await db.commit()
+        return status
+
+    async def fail(self, db: AsyncSession, *, job: ClaimedJob, error: str) -> None:
+        """Fail a leased job without retrying (e.g. an unknown task) and commit."""
+        await db.execute(FAIL, {"job_id": job.id, "attempt": job.attempt, "error": error})
+        await db.commit()
+
+    async def prune(self, db: AsyncSession, *, retention_hours: float = JOB_RETENTION_HOURS) -> int:
+        """Delete jobs finished more than `retention_hours` ago and commit; returns the number removed."""
+        result = await db.execute(PRUNE, {"retention": timedelta(hours=retention_hours)})
+        await db.commit()
+        return result.rowcount
+
+    @replica_read
+    async def queue_stats(self, db: AsyncSession, *, window_seconds: float = 60.0) -> Dict[str, Dict[str, float]]:
+        """Per-queue backlog and throughput over the last `window_seconds`, across all workers."""
+        stats: Dict[str, Dict[str, float]] = {}
+        for queue, queued, running, lag in await db.execute(LIVE_COUNTS):
+            stats[queue] = {"queued": queued, "running": running, "lag_seconds": float(lag)}
+        for queue, done, failed in await db.execute(FINISHED_COUNTS, {"window": timedelta(seconds=window_seconds)}):
+            stats.setdefault(queue, {"queued": 0, "running": 0, "lag_seconds": 0.0})
+            stats[queue].update(done=done, failed=failed, jobs_per_second=done / window_seconds)
+        for queue_stats in stats.values():
+            queue_stats.setdefault("done", 0)
+            queue_stats.setdefault("failed", 0)
+            queue_stats.setdefault("jobs_per_second", 0.0)
+        return stats
+
+job = CRUDJob()
+
+class JobWorker:
+    """Runs jobs from one or more queues: up to `concurrency` at a time, CPU-bound ones in a process pool."""
+
+    def __init__(
+        self,
+        queues: Sequence[str] = ("default",),
+        concurrency: int = JOB_CONCURRENCY,
+        processes: int = JOB_PROCESSES,
+        visibility_timeout: float = JOB_VISIBILITY_TIMEOUT_SECONDS,
+        poll_seconds: float = JOB_POLL_SECONDS,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        metrics: Optional[JobMetrics] = None,
+    ) -> None:
+        self.queues = list(queues)
+        self.concurrency = concurrency
+        self.processes = processes
+        self.visibility_timeout = visibility_timeout
+        self.poll_seconds = poll_seconds
+        self.session_factory = session_factory
+        self.metrics = metrics or JobMetrics()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._stopping = asyncio.Event()
+
+    def _sessions(self):
+        return (self.session_factory or get_session_factory())()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def _claim(self, limit: int) -> List[ClaimedJob]:
+        claimed: List[ClaimedJob] = []
+        async with self._sessions() as db:
+            for queue in self.queues:
+                if len(claimed) >= limit:
+                    break
+                claimed += await job.claim(
+                    db, queue=queue, limit=limit - len(claimed), visibility_timeout=self.visibility_timeout
+                )
+        return claimed
+
+    async def _execute(self, claimed: ClaimedJob) -> None:
+        started = time.monotonic()
+        async with self._sessions() as db:
+            try:
+                task = get_task(claimed.task)
+            except KeyError:
+                await job.fail(db, job=claimed, error=f"Unknown task {claimed.task!r}")
+                self.metrics.record("failed", time.monotonic() - started)
+                return
+            try:
+                # Never outlive the lease: past it, another worker may run the job again
+                if task.cpu_bound:
+                    run = asyncio.get_running_loop().run_in_executor(self._get_pool(), task.handler, claimed.payload)
+                else:
+                    run = task.handler(db, claimed.payload)
+                await asyncio.wait_for(run, timeout=self.visibility_timeout)
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"Job {claimed.id} ({claimed.task}) attempt {claimed.attempt} failed: {e!r}")
+                status = await job.retry(db, job=claimed, error=repr(e))
+                self.metrics.record("failed" if status == JOB_FAILED else "retried", time.monotonic() - started)
+                return
+            if not await job.complete(db, job=claimed):
+                logger.warning(f"Job {claimed.id} ({claimed.task}) finished after losing its lease")
+            self.metrics.record("succeeded", time.monotonic() - started)
+
+    async def run_once(self) -> int:
+        """Run ready jobs until none are left; returns the number of attempts made."""
+        total = 0
+        while True:
+            claimed = await self._claim(self.concurrency)
+            if not claimed:
+                return total
+            await asyncio.gather(*(self._execute(c) for c in claimed))
+            total += len(claimed)
+
+    async def run(self) -> None:
+        """Run jobs until stopped, refilling free slots as jobs finish."""
+        running: Set[asyncio.Task] = set()
+        logged_at = time.monotonic()
+        while not self._stopping.is_set():
+            claimed = []
+            if len(running) < self.concurrency:
+                try:
+                    claimed = await self._claim(self.concurrency - len(running))
+                except Exception:
+                    logger.exception("Claiming jobs failed")
+            running.update(asyncio.create_task(self._execute(c)) for c in claimed)
+
+            if time.monotonic() - logged_at >= JOB_METRICS_LOG_SECONDS:
+                logger.info(f"Job worker metrics: {self.metrics.snapshot()}")
+                logged_at = time.monotonic()
+
+            if claimed and len(running) < self.concurrency:
+                continue  # The queue may have more ready jobs
+            # Idle or full: wait for a slot to free up, a poll interval, or stop()
+            stopping = asyncio.create_task(self._stopping.wait())
+            done, _ = await asyncio.wait(
+                running | {stopping}, timeout=self.poll_seconds, return_when=asyncio.FIRST_COMPLETED
+            )
+            stopping.cancel()
+            for finished in done & running:
+                if finished.exception() is not None:
+                    logger.error(f"Job bookkeeping failed: {finished.exception()!r}")
+            running -= done
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    def stop(self) -> None:
+        """Ask `run` to return once in-flight jobs finish."""
+        self._stopping.set()
+
+    def shutdown(self) -> None:
+        """Stop the process pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,113 @@
+"""
+Mention notifications and username autocomplete.
+
+Mentions in new posts and comments are parsed in one pass, resolved with a
+single `lower(username) = ANY(...)` query and notified with one bulk insert,
+in the caller's transaction. Handles match case-insensitively, like
+autocomplete.
+
+Autocomplete is served from a per-process UsernameTrie. Signups in this
+process are added directly; users created elsewhere are picked up by
+polling for IDs above the highest one indexed, and a periodic full reload
+drops deleted accounts.
+"""
+
+import asyncio
+import os
+import time
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import String, bindparam, func, insert, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.mentions import UsernameTrie, extract_mentions
+from app.core.replicas import replica_read
+from app.models.notification import Notification
+from app.models.user import User
+
+USERNAME_INDEX_POLL_SECONDS = float(os.getenv("USERNAME_INDEX_POLL_SECONDS", "5"))
+USERNAME_INDEX_RELOAD_SECONDS = float(os.getenv("USERNAME_INDEX_RELOAD_SECONDS", "3600"))
+
+# Mentioned users and the author, in one round trip (served by ix_users_username_lower)
+RESOLVE_MENTIONS = select(User.id, User.username).where(
+    or_(func.lower(User.username) == bindparam("usernames", type_=ARRAY(String)).any_(), User.id == bindparam("author_id"))
+)
+USERS_AFTER = select(User.id, User.username).where(User.id > bindparam("after_id")).order_by(User.id)
+
+async def notify_mentions(
+    db: AsyncSession,
+    *,
+    author_id: int,
+    content: str,
+    post_id: str,
+    comment_id: Optional[str] = None
+) -> List[int]:
+    """Notify users mentioned in a new post or comment; the caller commits. Returns the notified user IDs."""
+    usernames = extract_mentions(content)
+    if not usernames:
+        return []
+    handles = [username.lower() for username in usernames]
+    rows = (await db.execute(RESOLVE_MENTIONS, {"usernames": handles, "author_id": author_id})).all()
+    author = next((username for user_id, username in rows if user_id == author_id), None)
+    mentioned = [user_id for user_id, username in rows if user_id != author_id]
+    if not mentioned:
+        return []
+    where = "a comment" if comment_id else "a post"
+    await db.execute(insert(Notification), [
+        {
+            "user_id": user_id,
+            "type": "mention",
+            "title": "New mention",
+            "message": f"@{author} mentioned you in {where}",
+            "data": {"post_id": post_id, "comment_id": comment_id, "author_id": author_id},
+        }
+        for user_id in mentioned
+    ])
+    return mentioned
+
+class UsernameIndex:
+    """Process-wide username trie kept current incrementally."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the index (the next request reloads)."""
+        self.trie: Optional[UsernameTrie] = None
+        self._max_id = 0
+        self._loaded_at = self._polled_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @replica_read
+    async def _add_users_after(self, db: AsyncSession, trie: UsernameTrie, after_id: int) -> int:
+        for user_id, username in await db.execute(USERS_AFTER, {"after_id": after_id}):
+            trie.insert(username, user_id)
+            after_id = max(after_id, user_id)
+        return after_id
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Load or catch up the index if it is due."""
+        now = self.clock()
+        if self.trie is not None and now - self._polled_at < USERNAME_INDEX_POLL_SECONDS:
+            return
+        async with self._lock:
+            if self.trie is None or now - self._loaded_at >= USERNAME_INDEX_RELOAD_SECONDS:
+                trie = UsernameTrie()
+                self._max_id = await self._add_users_after(db, trie, 0)
+                self.trie, self._loaded_at = trie, now
+            elif now - self._polled_at >= USERNAME_INDEX_POLL_SECONDS:
+                self._max_id = await self._add_users_after(db, self.trie, self._max_id)
+            self._polled_at = now
+
+    def user_added(self, user_id: int, username: str) -> None:
+        """Index a user committed by this process."""
+        if self.trie is not None:
+            self.trie.insert(username, user_id)
+            self._max_id = max(self._max_id, user_id)
+
+    async def complete(self, db: AsyncSession, *, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Up to `limit` (username, user_id) pairs starting with `prefix`."""
+        await self.refresh(db)
+        return self.trie.complete(prefix, limit)
+
+username_index = UsernameIndex()
@@ -0,0 +1,175 @@
+"""
+Transactional outbox for domain events.
+
+Writes emit events with one INSERT into `outbox_events` in the same
+transaction as the change, so an event exists exactly when its change commits. A relay
+drains the table in batches, in ID order, and calls the in-process
+subscribers (app.core.outbox). A subscriber's database writes share the
+relay's transaction with the removal of the event, so they are applied once;
+anything else a subscriber does is at-least-once (an event is redelivered if
+the relay dies mid-batch).
+
+Every API process runs a relay, but each batch first takes a transaction-level
+advisory lock, so one relay drains at a time and events stay in ID order.
+Events of one aggregate are emitted after the write has locked a row of that
+aggregate (e.g. the post's trending row), so their IDs follow commit order.
+A failing event is retried on the next batch, and later events of its
+aggregate wait behind it. After OUTBOX_MAX_ATTEMPTS failures it is set aside
+with `failed_at` so its aggregate can move on.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from sqlalchemy import BigInteger, JSON, bindparam, case, delete, func, insert, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_session_factory
+from app.core.outbox import DomainEvent, get_subscribers
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "200"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_LOCK_KEY = 0x6F7574626F78  # Advisory lock held while relaying a batch
+
+_events = OutboxEvent.__table__
+
+EMIT = insert(_events).values(
+    aggregate_type=bindparam("aggregate_kind"),
+    aggregate_id=bindparam("aggregate_key"),
+    event_type=bindparam("event_name"),
+    payload=bindparam("event_payload", type_=JSON),
+)
+TRY_RELAY_LOCK = text("SELECT pg_try_advisory_xact_lock(:lock_key)")
+PENDING = (
+    select(
+        _events.c.id, _events.c.aggregate_type, _events.c.aggregate_id,
+        _events.c.event_type, _events.c.payload, _events.c.created_at,
+    )
+    .where(_events.c.failed_at.is_(None))
+    .order_by(_events.c.id)
+    .limit(bindparam("batch_size"))
+)
+DELIVERED = delete(OutboxEvent).where(OutboxEvent.id == func.any(bindparam("event_ids", type_=ARRAY(BigInteger))))
+RECORD_FAILURE = (
+    update(_events)
+    .where(_events.c.id == bindparam("event_id"))
+    .values(
+        attempts=_events.c.attempts + 1,
+        last_error=bindparam("error"),
+        failed_at=case((_events.c.attempts + 1 >= bindparam("max_attempts"), func.now()), else_=None),
+    )
+)
+
+class CRUDOutbox:
+    """Emitting and relaying domain events."""
+
+    async def emit(
+        self,
+        db: AsyncSession,
+        *,
+        aggregate_type: str,
+        aggregate_id: Any,
+        event_type: str,
+        payload: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Record an event in the caller's transaction; the caller commits."""
+        await db.execute(EMIT, {
+            "aggregate_kind": aggregate_type,
+            "aggregate_key": str(aggregate_id),
+            "event_name": event_type,
+            "event_payload": payload or {},
+        })
+
+    async def relay_batch(self, db: AsyncSession, *, batch_size: int = OUTBOX_BATCH_SIZE) -> Optional[int]:
+        """Deliver up to `batch_size` pending events and commit.
+
+        Returns the number of events delivered, or None if another relay holds the lock.
+        """
+        if not await db.scalar(TRY_RELAY_LOCK, {"lock_key": OUTBOX_LOCK_KEY}):
+            await db.rollback()
+            return None
+        events = [DomainEvent(*row) for row in await db.execute(PENDING, {"batch_size": batch_size})]
+        delivered: List[int] = []
+        blocked: Set[Tuple[str, str]] = set()
+        for event in events:
+            aggregate = (event.aggregate_type, event.aggregate_id)
+            if aggregate in blocked:
+                continue
+            try:
+                async with db.begin_nested():
+                    for subscriber in get_subscribers(event.event_type):
+                        await subscriber(db, event)
+            except Exception as e:
+                logger.warning(f"Outbox event {event.id} ({event.event_type}) failed: {e!r}")
+                blocked.add(aggregate)
+                await db.execute(
+                    RECORD_FAILURE, {"event_id": event.id, "error": repr(e), "max_attempts": OUTBOX_MAX_ATTEMPTS}
+                )
+                continue
+            delivered.append(event.id)
+        if delivered:
+            await db.execute(DELIVERED, {"event_ids": delivered})
+        await db.commit()
+        return len(delivered)
+
+outbox = CRUDOutbox()
+
+class OutboxRelay:
+    """Background task draining the outbox."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_seconds: float = OUTBOX_POLL_SECONDS,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    async def run_once(self) -> int:
+        """Relay full batches until the outbox is drained, an event fails or another relay has the lock.
+
+        Returns the number of events delivered.
+        """
+        total = 0
+        async with (self.session_factory or get_session_factory())() as db:
+            while True:
+                delivered = await outbox.relay_batch(db, batch_size=self.batch_size)
+                total += delivered or 0
+                if delivered is None or delivered < self.batch_size:
+                    return total
+
+    async def run(self) -> None:
+        """Relay events until stopped."""
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Outbox relay failed")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Run the relay as a background task of the current event loop."""
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the background task, letting an in-flight batch finish."""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+
+outbox_relay = OutboxRelay()
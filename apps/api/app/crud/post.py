@@ -1,13 +1,193 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import Integer, String, Text, bindparam, cast, desc, func, literal_column, select, true
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.orm import selectinload
+from app.core.replicas import replica_read
 from app.crud.base import CRUDBase
+from app.crud.mentions import notify_mentions
+from app.crud.outbox import outbox
+from app.crud.post_features import post_features
+from app.crud.trending import trending
+from app.crud.user_stats import user_stats
+from app.crud.viewer_state import LIKED, viewer_state
 from app.models.post import Post, PostType
+from app.models.user import User
 from app.models.interaction import Like, Comment, Follow
 from app.schemas.post import PostCreate, PostUpdate
 
+# Hot statements are built once with bind parameters: each call skips rebuilding
+# the construct, hits SQLAlchemy's compiled cache, and reuses asyncpg's
+# per-connection prepared statement for the same SQL text.
+LIKES_COUNT = select(func.count(Like.id)).where(Like.post_id == bindparam("post_id"))
+COMMENTS_COUNT = select(func.count(Comment.id)).where(Comment.post_id == bindparam("post_id"))
+
+PUBLIC_PAGE = (
+    select(Post)
+    .options(selectinload(Post.author))
+    .where(Post.is_public == True, Post.is_draft == False)
+    .order_by(desc(Post.created_at), desc(Post.id))
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+POST_WITH_AUTHOR = select(Post).options(selectinload(Post.author)).where(Post.id == bindparam("post_id"))
+USER_POSTS_PAGE = PUBLIC_PAGE.where(Post.author_id == bindparam("user_id"))
+FEED_PAGE = PUBLIC_PAGE.where(
+    (Post.author_id == bindparam("user_id")) |
+    (Post.author_id.in_(
+        select(Follow.followed_id).where(Follow.follower_id == bindparam("user_id"))
+    ))
+)
+SEARCH_PAGE = PUBLIC_PAGE.where(Post.content.ilike(bindparam("pattern")))
+TYPE_PAGE = PUBLIC_PAGE.where(Post.post_type == bindparam("post_type"))
+
+_user_public_post_ids = (
+    select(Post.id)
+    .where(Post.author_id == bindparam("user_id"))
+    .where(Post.is_public == True, Post.is_draft == False)
+)
+USER_POSTS_VERSION = select(
+    select(User.username).where(User.id == bindparam("user_id")).scalar_subquery(),
+    select(func.count(Post.id))
+    .where(Post.author_id == bindparam("user_id"))
+    .where(Post.is_public == True, Post.is_draft == False)
+    .scalar_subquery(),
+    select(func.max(func.coalesce(Post.updated_at, Post.created_at)))
+    .where(Post.author_id == bindparam("user_id"))
+    .where(Post.is_public == True, Post.is_draft == False)
+    .scalar_subquery(),
+    select(func.count(Like.id)).where(Like.post_id.in_(_user_public_post_ids)).scalar_subquery(),
+    select(func.max(Like.created_at)).where(Like.post_id.in_(_user_public_post_ids)).scalar_subquery(),
+    select(func.count(Comment.id)).where(Comment.post_id.in_(_user_public_post_ids)).scalar_subquery(),
+    select(func.max(Comment.created_at)).where(Comment.post_id.in_(_user_public_post_ids)).scalar_subquery(),
+)
+
+def _json_object(**fields):
+    """json_build_object() with inline key literals (its VARIADIC "any" signature can't type bind params)."""
+    args = []
+    for key, value in fields.items():
+        args.extend((literal_column(f"'{key}'"), value))
+    return func.json_build_object(*args)
+
+def _page_json(page, order_by=None):
+    """
+    One statement returning a whole page as a JSON array text, shaped like
+    FeedPostOut: post columns, author summary, counts and the viewer's like flag.
+    Counts are LATERAL subqueries evaluated only for the rows on the page.
+    """
+    likes = select(func.count(Like.id).label("n")).where(Like.post_id == page.c.id).lateral("like_counts")
+    comments = select(func.count(Comment.id).label("n")).where(Comment.post_id == page.c.id).lateral("comment_counts")
+    liked = select(
+        select(Like.id)
+        .where(Like.post_id == page.c.id, Like.user_id == bindparam("viewer_id", type_=Integer))
+        .correlate_except(Like)
+        .exists()
+        .label("v")
+    ).lateral("viewer_like")
+    row = _json_object(
+        id=page.c.id,
+        title=page.c.title,
+        content=page.c.content,
+        # The enum stores member names; the API uses the (lowercase) values
+        post_type=func.lower(cast(page.c.post_type, Text)),
+        image_url=page.c.image_url,
+        image_variants=page.c.image_variants,
+        is_public=page.c.is_public,
+        created_at=page.c.created_at,
+        updated_at=page.c.updated_at,
+        author=_json_object(id=User.id, username=User.username),
+        likes_count=likes.c.n,
+        comments_count=comments.c.n,
+        is_liked=liked.c.v,
+    )
+    order_by = order_by if order_by is not None else (page.c.created_at.desc(), page.c.id.desc())
+    rows = func.json_agg(aggregate_order_by(row, *order_by))
+    return (
+        select(cast(func.coalesce(rows, literal_column("'[]'::json")), Text))
+        .select_from(
+            page.join(User, User.id == page.c.author_id)
+            .join(likes, true())
+            .join(comments, true())
+            .join(liked, true())
+        )
+    )
+
+_public_rows = (
+    select(Post)
+    .where(Post.is_public == True, Post.is_draft == False)
+    .order_by(desc(Post.created_at), desc(Post.id))
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+PUBLIC_PAGE_JSON = _page_json(_public_rows.subquery("page"))
+FEED_PAGE_JSON = _page_json(
+    _public_rows.where(
+        (Post.author_id == bindparam("user_id")) |
+        (Post.author_id.in_(
+            select(Follow.followed_id).where(Follow.follower_id == bindparam("user_id"))
+        ))
+    ).subquery("page")
+)
+# Set only by scheduled_posts, never by a generic update
+PUBLISH_FIELDS = frozenset({"is_draft", "scheduled_for"})
+
+# Posts in the order given by :post_ids (e.g. a ranked page)
+_ids_page = select(Post).where(Post.id == func.any(bindparam("post_ids", type_=ARRAY(String)))).subquery("page")
+POSTS_BY_IDS_JSON = _page_json(
+    _ids_page, order_by=(func.array_position(bindparam("post_ids", type_=ARRAY(String)), _ids_page.c.id),)
+)
+
 class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
+    async def create_with_author(self, db: AsyncSession, *, obj_in: PostCreate, author_id: int) -> Post:
+        """Create a post, with its ranking features, author stats and mention notifications.
+
+        Drafts (including posts scheduled for later) get their stats and notifications when
+        published by the scheduler or `scheduled_posts.publish_now`.
+        """
+        db_obj = Post(**obj_in.model_dump(), author_id=author_id)
+        db_obj.is_draft = obj_in.is_draft or obj_in.scheduled_for is not None
+        db.add(db_obj)
+        await db.flush()
+        await post_features.refresh(db, post_ids=[db_obj.id])
+        if not db_obj.is_draft:
+            await self.published(db, posts=[(db_obj.id, author_id, db_obj.content)])
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def published(self, db: AsyncSession, *, posts: Sequence[Tuple[str, int, str]]) -> None:
+        """Side effects of (post_id, author_id, content) posts becoming visible; the caller commits."""
+        for post_id, author_id, content in posts:
+            await user_stats.post_created(db, user_id=author_id)
+            await notify_mentions(db, author_id=author_id, content=content, post_id=post_id)
+            await outbox.emit(
+                db, aggregate_type="post", aggregate_id=post_id, event_type="post.published",
+                payload={"author_id": author_id},
+            )
+
+    def _apply_update(self, db_obj: Post, update_data: Dict[str, Any]) -> None:
+        """Copy updated fields, except draft state: publishing goes through scheduled_posts, which runs the publish hooks."""
+        super()._apply_update(db_obj, {
+            field: value for field, value in update_data.items() if field not in PUBLISH_FIELDS
+        })
+
+    async def after_update(self, db: AsyncSession, db_obj: Post) -> None:
+        """Re-derive the updated post's ranking features."""
+        await db.flush()
+        await post_features.refresh(db, post_ids=[db_obj.id])
+        await trending.sync_post(db, post_id=db_obj.id)
+
+    async def _add_counts(self, db: AsyncSession, posts: List[Post], liked_by: Optional[str] = None) -> List[Post]:
+        """Attach interaction counts (and like status for `liked_by`) to loaded posts."""
+        states = await viewer_state.load(db, viewer_id=liked_by, post_ids=[post.id for post in posts]) if liked_by else {}
+        for post in posts:
+            post.likes_count = (await db.execute(LIKES_COUNT, {"post_id": post.id})).scalar()
+            post.comments_count = (await db.execute(COMMENTS_COUNT, {"post_id": post.id})).scalar()
+            if liked_by:
+                post.is_liked = bool(states.get(post.id, 0) & LIKED)
+        return posts
+
+    @replica_read
     async def get_multi_with_author(
         self, 
         db: AsyncSession, 
@@ -16,66 +196,32 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         limit: int = 100
     ) -> List[Post]:
         """Get multiple posts with author information and interaction counts."""
-        query = (
-            select(Post)
-            .options(selectinload(Post.author))
-            .where(Post.is_public == True)
-            .order_by(desc(Post.created_at))
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await db.execute(query)
-        posts = result.scalars().all()
-        
-        # Add interaction counts
-        for post in posts:
-            likes_count = await db.execute(
-                select(func.count(Like.id)).where(Like.post_id == post.id)
-            )
-            post.likes_count = likes_count.scalar()
-            
-            comments_count = await db.execute(
-                select(func.count(Comment.id)).where(Comment.post_id == post.id)
-            )
-            post.comments_count = comments_count.scalar()
-        
-        return posts
+        result = await db.execute(PUBLIC_PAGE, {"skip": skip, "limit": limit})
+        return await self._add_counts(db, result.scalars().all())
+
+    @replica_read
+    async def get_multi_with_author_json(
+        self,
+        db: AsyncSession,
+        *,
+        viewer_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> str:
+        """Single-query variant of get_multi_with_author returning the page as JSON text."""
+        result = await db.execute(PUBLIC_PAGE_JSON, {"viewer_id": viewer_id, "skip": skip, "limit": limit})
+        return result.scalar_one()
 
+    @replica_read
     async def get_with_author(self, db: AsyncSession, *, post_id: str, current_user_id: Optional[str] = None) -> Optional[Post]:
         """Get post with author information and interaction counts."""
-        query = (
-            select(Post)
-            .options(selectinload(Post.author))
-            .where(Post.id == post_id)
-        )
-        result = await db.execute(query)
+        result = await db.execute(POST_WITH_AUTHOR, {"post_id": post_id})
         post = result.scalar_one_or_none()
-        
         if post:
-            # Get likes count
-            likes_count = await db.execute(
-                select(func.count(Like.id)).where(Like.post_id == post_id)
-            )
-            post.likes_count = likes_count.scalar()
-            
-            # Get comments count
-            comments_count = await db.execute(
-                select(func.count(Comment.id)).where(Comment.post_id == post_id)
-            )
-            post.comments_count = comments_count.scalar()
-            
-            # Check if current user liked the post
-            if current_user_id:
-                is_liked = await db.execute(
-                    select(Like).where(
-                        Like.post_id == post_id,
-                        Like.user_id == current_user_id
-                    )
-                )
-                post.is_liked = is_liked.scalar_one_or_none() is not None
-        
+            await self._add_counts(db, [post], liked_by=current_user_id)
         return post
 
+    @replica_read
     async def get_user_feed(
         self, 
         db: AsyncSession, 
@@ -85,51 +231,31 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         limit: int = 20
     ) -> List[Post]:
         """Get feed for a user (posts from followed users + their own posts)."""
-        # Get posts from followed users and own posts
-        query = (
-            select(Post)
-            .options(selectinload(Post.author))
-            .where(
-                (Post.author_id == user_id) |
-                (Post.author_id.in_(
-                    select(Follow.followed_id)
-                    .join(Follow, Follow.follower_id == user_id)
-                    .where(Follow.followed_id == Follow.followed_id)
-                ))
-            )
-            .where(Post.is_public == True)
-            .order_by(desc(Post.created_at))
-            .offset(skip)
-            .limit(limit)
+        result = await db.execute(FEED_PAGE, {"user_id": user_id, "skip": skip, "limit": limit})
+        return await self._add_counts(db, result.scalars().all(), liked_by=user_id)
+
+    @replica_read
+    async def get_user_feed_json(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 20
+    ) -> str:
+        """Single-query variant of get_user_feed returning the page as JSON text."""
+        result = await db.execute(
+            FEED_PAGE_JSON, {"user_id": user_id, "viewer_id": user_id, "skip": skip, "limit": limit}
         )
-        result = await db.execute(query)
-        posts = result.scalars().all()
-        
-        # Add interaction counts and like status
-        for post in posts:
-            # Likes count
-            likes_count = await db.execute(
-                select(func.count(Like.id)).where(Like.post_id == post.id)
-            )
-            post.likes_count = likes_count.scalar()
-            
-            # Comments count
-            comments_count = await db.execute(
-                select(func.count(Comment.id)).where(Comment.post_id == post.id)
-            )
-            post.comments_count = comments_count.scalar()
-            
-            # Check if user liked
-            is_liked = await db.execute(
-                select(Like).where(
-                    Like.post_id == post.id,
-                    Like.user_id == user_id
-                )
-            )
-            post.is_liked = is_liked.scalar_one_or_none() is not None
-        
-        return posts
+        return result.scalar_one()
+
+    @replica_read
+    async def get_posts_json(self, db: AsyncSession, *, post_ids: List[str], viewer_id: Optional[int] = None) -> str:
+        """Posts with the given IDs, in that order, as a JSON array text."""
+        result = await db.execute(POSTS_BY_IDS_JSON, {"post_ids": post_ids, "viewer_id": viewer_id})
+        return result.scalar_one()
 
+    @replica_read
     async def get_user_posts(
         self, 
         db: AsyncSession, 
@@ -139,32 +265,16 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         limit: int = 20
     ) -> List[Post]:
         """Get posts by a specific user."""
-        query = (
-            select(Post)
-            .options(selectinload(Post.author))
-            .where(Post.author_id == user_id)
-            .where(Post.is_public == True)
-            .order_by(desc(Post.created_at))
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await db.execute(query)
-        posts = result.scalars().all()
-        
-        # Add interaction counts
-        for post in posts:
-            likes_count = await db.execute(
-                select(func.count(Like.id)).where(Like.post_id == post.id)
-            )
-            post.likes_count = likes_count.scalar()
-            
-            comments_count = await db.execute(
-                select(func.count(Comment.id)).where(Comment.post_id == post.id)
-            )
-            post.comments_count = comments_count.scalar()
-        
-        return posts
+        result = await db.execute(USER_POSTS_PAGE, {"user_id": user_id, "skip": skip, "limit": limit})
+        return await self._add_counts(db, result.scalars().all())
 
+    @replica_read
+    async def get_user_posts_version(self, db: AsyncSession, *, user_id: str) -> tuple:
+        """Cheap version probe for a user's public posts (used to derive ETags without loading rows)."""
+        result = await db.execute(USER_POSTS_VERSION, {"user_id": user_id})
+        return tuple(result.one())
+
+    @replica_read
     async def search_posts(
         self, 
         db: AsyncSession, 
@@ -174,33 +284,10 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         limit: int = 20
     ) -> List[Post]:
         """Search posts by content."""
-        search_query = f"%{query}%"
-        query = (
-            select(Post)
-            .options(selectinload(Post.author))
-            .where(Post.content.ilike(search_query))
-            .where(Post.is_public == True)
-            .order_by(desc(Post.created_at))
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await db.execute(query)
-        posts = result.scalars().all()
-        
-        # Add interaction counts
-        for post in posts:
-            likes_count = await db.execute(
-                select(func.count(Like.id)).where(Like.post_id == post.id)
-            )
-            post.likes_count = likes_count.scalar()
-            
-            comments_count = await db.execute(
-                select(func.count(Comment.id)).where(Comment.post_id == post.id)
-            )
-            post.comments_count = comments_count.scalar()
-        
-        return posts
+        result = await db.execute(SEARCH_PAGE, {"pattern": f"%{query}%", "skip": skip, "limit": limit})
+        return await self._add_counts(db, result.scalars().all())
 
+    @replica_read
     async def get_by_type(
         self, 
         db: AsyncSession, 
@@ -210,30 +297,7 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         limit: int = 20
     ) -> List[Post]:
         """Get posts by type."""
-        query = (
-            select(Post)
-            .options(selectinload(Post.author))
-            .where(Post.post_type == post_type)
-            .where(Post.is_public == True)
-            .order_by(desc(Post.created_at))
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await db.execute(query)
-        posts = result.scalars().all()
-        
-        # Add interaction counts
-        for post in posts:
-            likes_count = await db.execute(
-                select(func.count(Like.id)).where(Like.post_id == post.id)
-            )
-            post.likes_count = likes_count.scalar()
-            
-            comments_count = await db.execute(
-                select(func.count(Comment.id)).where(Comment.post_id == post.id)
-            )
-            post.comments_count = comments_count.scalar()
-        
-        return posts
+        result = await db.execute(TYPE_PAGE, {"post_type": post_type, "skip": skip, "limit": limit})
+        return await self._add_counts(db, result.scalars().all())
 
-post = CRUDPost(Post) 
\ No newline at end of file
+post = CRUDPost(Post) 
@@ -0,0 +1,123 @@
+"""
+Per-post ranking features (`post_features`) and the ranked feed.
+
+Interaction writes adjust a post's counters in the same transaction (an O(1)
+UPDATE); post writes re-derive the post's row. A full refresh recomputes
+rows from the source tables to repair drift (e.g. after deletes that bypass
+the CRUD layer) and to backfill posts created before the table existed.
+"""
+
+import os
+from datetime import timedelta
+from typing import List, Optional, Sequence
+from sqlalchemy import Interval, and_, bindparam, desc, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.ranking import FeatureBatch, Scorer, rank
+from app.core.replicas import replica_read
+from app.models.interaction import Comment, Follow, Like
+from app.models.post import Post, PostType
+from app.models.post_features import PostFeatures
+
+RANKING_WINDOW_HOURS = int(os.getenv("RANKING_WINDOW_HOURS", str(24 * 7)))
+RANKING_MAX_CANDIDATES = int(os.getenv("RANKING_MAX_CANDIDATES", "1000"))
+
+_DERIVED_COLUMNS = (
+    "post_id", "author_id", "is_public", "has_image", "is_daily", "is_spontaneous",
+    "hearts", "comments", "created_at",
+)
+
+def _derived_rows(post_ids: Optional[Sequence[str]]):
+    """Feature rows computed from posts, likes and comments."""
+    query = select(
+        Post.id,
+        Post.author_id,
+        and_(func.coalesce(Post.is_public, True), Post.is_draft == False),  # Drafts rank as private
+        Post.image_url.isnot(None),
+        Post.post_type == PostType.DAILY,
+        Post.post_type == PostType.SPONTANEOUS,
+        select(func.count(Like.id)).where(Like.post_id == Post.id).scalar_subquery(),
+        select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery(),
+        func.coalesce(Post.created_at, func.now()),
+    )
+    if post_ids is not None:
+        query = query.where(Post.id.in_(post_ids))
+    return query
+
+_network = select(Follow.followed_id).where(Follow.follower_id == bindparam("viewer_id"))
+_in_network = or_(PostFeatures.author_id == bindparam("viewer_id"), PostFeatures.author_id.in_(_network))
+
+# Newest public posts in the window, the viewer's network first
+FEED_CANDIDATES = (
+    select(
+        PostFeatures.post_id,
+        PostFeatures.hearts,
+        PostFeatures.comments,
+        PostFeatures.shares,
+        PostFeatures.reports,
+        PostFeatures.has_image,
+        PostFeatures.is_daily,
+        PostFeatures.is_spontaneous,
+        _in_network,
+        func.extract("epoch", func.now() - PostFeatures.created_at) / 3600.0,
+    )
+    .where(PostFeatures.is_public == True)
+    .where(PostFeatures.created_at > func.now() - bindparam("window", type_=Interval))
+    .order_by(desc(_in_network), desc(PostFeatures.created_at))
+    .limit(bindparam("limit"))
+)
+
+class CRUDPostFeatures:
+    """Maintenance of post_features and ranked feed queries."""
+
+    async def refresh(self, db: AsyncSession, *, post_ids: Optional[Sequence[str]] = None) -> None:
+        """Recompute feature rows for the given posts (all posts if None); the caller commits."""
+        stmt = pg_insert(PostFeatures).from_select(_DERIVED_COLUMNS, _derived_rows(post_ids))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PostFeatures.post_id],
+            set_={column: stmt.excluded[column] for column in _DERIVED_COLUMNS[1:]} | {"updated_at": func.now()},
+        )
+        await db.execute(stmt)
+
+    async def adjust_counts(self, db: AsyncSession, *, post_id: str, hearts: int = 0, comments: int = 0, shares: int = 0) -> None:
+        """Apply counter deltas from an interaction write; the caller commits."""
+        await db.execute(
+            update(PostFeatures)
+            .where(PostFeatures.post_id == post_id)
+            .values(
+                hearts=PostFeatures.hearts + hearts,
+                comments=PostFeatures.comments + comments,
+                shares=PostFeatures.shares + shares,
+            )
+        )
+
+    @replica_read
+    async def load_feed_candidates(
+        self,
+        db: AsyncSession,
+        *,
+        viewer_id: int,
+        window_hours: int = RANKING_WINDOW_HOURS,
+        limit: int = RANKING_MAX_CANDIDATES
+    ) -> FeatureBatch:
+        """Candidate posts for a viewer's ranked feed as a FeatureBatch."""
+        result = await db.execute(
+            FEED_CANDIDATES, {"viewer_id": viewer_id, "window": timedelta(hours=window_hours), "limit": limit}
+        )
+        return FeatureBatch.from_rows(result.all())
+
+    async def ranked_feed_ids(
+        self,
+        db: AsyncSession,
+        *,
+        viewer_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        scorer: Optional[Scorer] = None
+    ) -> List[str]:
+        """Post IDs for one page of the viewer's ranked feed, best first."""
+        batch = await self.load_feed_candidates(db, viewer_id=viewer_id)
+        ranked = rank(batch, skip + limit, scorer)
+        return [post_id for post_id, _ in ranked[skip:]]
+
+post_features = CRUDPostFeatures()
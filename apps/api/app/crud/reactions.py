@@ -0,0 +1,210 @@
+"""
+Emoji reactions (PRD §6.5).
+
+A reaction is one row per (user, post) holding a small-int emoji code, set
+with an upsert. Each post's histogram row in `post_reaction_counts` is
+adjusted in the same transaction, so the reaction button and summary read a
+single row. The reaction viewer pages with a keyset on (reacted_at, id).
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import bindparam, delete, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.replicas import replica_read
+from app.models.post import Post
+from app.models.reaction import REACTION_EMOJIS, PostReactionCounts, Reaction
+from app.models.user import User
+
+_reactions = Reaction.__table__
+_counts = PostReactionCounts.__table__
+_COUNT_COLUMNS = tuple(f"count_{code}" for code in range(len(REACTION_EMOJIS)))
+
+class ReactionSummary(NamedTuple):
+    """Histogram of a post's reactions plus the viewer's own."""
+    total: int
+    counts: Dict[str, int]  # Emoji -> count, all emojis in PRD order
+    viewer_reaction: Optional[str]
+
+class Reactor(NamedTuple):
+    """One row of the reaction viewer."""
+    id: str
+    emoji: str
+    reacted_at: datetime
+    user_id: int
+    username: str
+
+LOCK_REACTION = (
+    select(Reaction.emoji_code)
+    .where(Reaction.user_id == bindparam("target_user_id"), Reaction.post_id == bindparam("target_id"))
+    .with_for_update()
+)
+
+_insert_reaction = pg_insert(_reactions).values(
+    user_id=bindparam("target_user_id"), post_id=bindparam("target_id"), emoji_code=bindparam("code")
+)
+# Returns whether the row is new (xmax = 0) rather than an updated existing reaction
+UPSERT_REACTION = _insert_reaction.on_conflict_do_update(
+    index_elements=[_reactions.c.user_id, _reactions.c.post_id],
+    set_={"emoji_code": _insert_reaction.excluded.emoji_code, "reacted_at": func.now()},
+).returning(literal_column("xmax = 0"))
+
+DELETE_REACTION = (
+    delete(Reaction)
+    .where(Reaction.user_id == bindparam("target_user_id"), Reaction.post_id == bindparam("target_id"))
+    .returning(Reaction.emoji_code)
+)
+
+_insert_deltas = pg_insert(_counts).values(
+    post_id=bindparam("target_id"),
+    total=bindparam("d_total"),
+    **{column: bindparam(f"d_{column}") for column in _COUNT_COLUMNS},
+)
+ADJUST_COUNTS = _insert_deltas.on_conflict_do_update(
+    index_elements=[_counts.c.post_id],
+    set_={column: _counts.c[column] + _insert_deltas.excluded[column] for column in ("total", *_COUNT_COLUMNS)},
+)
+
+_insert_actual = pg_insert(_counts).from_select(
+    ["post_id", "total", *_COUNT_COLUMNS],
+    select(
+        bindparam("target_id"),
+        func.count(Reaction.id),
+        *(func.count(Reaction.id).filter(Reaction.emoji_code == code) for code in range(len(REACTION_EMOJIS))),
+    ).where(Reaction.post_id == bindparam("target_id")),
+)
+REBUILD_COUNTS = _insert_actual.on_conflict_do_update(
+    index_elements=[_counts.c.post_id],
+    set_={column: _insert_actual.excluded[column] for column in ("total", *_COUNT_COLUMNS)},
+)
+
+_viewer_code = (
+    select(Reaction.emoji_code)
+    .where(Reaction.post_id == Post.id, Reaction.user_id == bindparam("viewer_id"))
+    .scalar_subquery()
+)
+# NULL histogram columns: no reactions yet; no row at all: no such post
+SUMMARY = (
+    select(_counts.c.total, *(_counts.c[column] for column in _COUNT_COLUMNS), _viewer_code)
+    .select_from(Post)
+    .outerjoin(_counts, _counts.c.post_id == Post.id)
+    .where(Post.id == bindparam("target_id"))
+)
+
+_REACTOR_PAGE = (
+    select(Reaction.id, Reaction.emoji_code, Reaction.reacted_at, User.id, User.username)
+    .join(User, User.id == Reaction.user_id)
+    .where(Reaction.post_id == bindparam("target_id"))
+    .order_by(Reaction.reacted_at.desc(), Reaction.id.desc())
+    .limit(bindparam("limit"))
+)
+FIRST_REACTORS = _REACTOR_PAGE
+NEXT_REACTORS = _REACTOR_PAGE.where(
+    tuple_(Reaction.reacted_at, Reaction.id) < tuple_(bindparam("after_at"), bindparam("after_id"))
+)
+
+def _deltas(added: Optional[int] = None, removed: Optional[int] = None) -> Dict[str, int]:
+    """ADJUST_COUNTS parameters for one reaction added and/or removed."""
+    deltas = {f"d_{column}": 0 for column in _COUNT_COLUMNS}
+    if added is not None:
+        deltas[f"d_count_{added}"] += 1
+    if removed is not None:
+        deltas[f"d_count_{removed}"] -= 1
+    deltas["d_total"] = (added is not None) - (removed is not None)
+    return deltas
+
+def encode_reactor_cursor(reactor: Reactor) -> str:
+    """Opaque URL-safe cursor for the page after `reactor`."""
+    raw = json.dumps([reactor.reacted_at.isoformat(), reactor.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_reactor_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor from `encode_reactor_cursor` (raises ValueError if malformed)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        reacted_at, reaction_id = json.loads(raw)
+        return datetime.fromisoformat(reacted_at), str(reaction_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid reactions cursor") from e
+
+class CRUDReaction:
+    """Reaction writes, histograms and the reaction viewer."""
+
+    async def set_reaction(self, db: AsyncSession, *, user_id: int, post_id: str, code: int) -> None:
+        """Add or change the user's reaction to a post."""
+        params = {"target_user_id": user_id, "target_id": post_id}
+        previous = await db.scalar(LOCK_REACTION, params)
+        if previous == code:
+            await db.commit()
+            return
+        inserted = await db.scalar(UPSERT_REACTION, {**params, "code": code})
+        if previous is None and not inserted:
+            # A concurrent first reaction won the insert; its emoji is unknown here, so recount
+            await db.execute(REBUILD_COUNTS, {"target_id": post_id})
+        else:
+            await db.execute(ADJUST_COUNTS, {"target_id": post_id, **_deltas(added=code, removed=previous)})
+        await db.commit()
+
+    async def remove_reaction(self, db: AsyncSession, *, user_id: int, post_id: str) -> bool:
+        """Remove the user's reaction to a post."""
+        removed = await db.scalar(DELETE_REACTION, {"target_user_id": user_id, "target_id": post_id})
+        if removed is None:
+            await db.rollback()
+            return False
+        await db.execute(ADJUST_COUNTS, {"target_id": post_id, **_deltas(removed=removed)})
+        await db.commit()
+        return True
+
+    async def remove_reactions(self, db: AsyncSession, condition) -> List[str]:
+        """Delete reactions matching `condition`, keeping histograms exact; the caller commits. Returns the IDs."""
+        result = await db.execute(
+            delete(Reaction).where(condition).returning(Reaction.id, Reaction.post_id, Reaction.emoji_code)
+        )
+        removed = result.all()
+        per_post: Dict[str, Dict[str, int]] = {}
+        for _, post_id, code in removed:
+            deltas = per_post.setdefault(post_id, _deltas())
+            deltas[f"d_count_{code}"] -= 1
+            deltas["d_total"] -= 1
+        if per_post:
+            await db.execute(ADJUST_COUNTS, [{"target_id": post_id, **deltas} for post_id, deltas in per_post.items()])
+        return [reaction_id for reaction_id, _, _ in removed]
+
+    @replica_read
+    async def get_summary(self, db: AsyncSession, *, post_id: str, viewer_id: Optional[int] = None) -> Optional[ReactionSummary]:
+        """A post's reaction histogram and the viewer's reaction (None if the post doesn't exist)."""
+        row = (await db.execute(SUMMARY, {"target_id": post_id, "viewer_id": viewer_id})).first()
+        if row is None:
+            return None
+        total, *counts, viewer_code = row
+        return ReactionSummary(
+            total or 0,
+            {emoji: count or 0 for emoji, count in zip(REACTION_EMOJIS, counts)},
+            REACTION_EMOJIS[viewer_code] if viewer_code is not None else None,
+        )
+
+    @replica_read
+    async def get_reactors(
+        self,
+        db: AsyncSession,
+        *,
+        post_id: str,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 20
+    ) -> List[Reactor]:
+        """A page of a post's reactions, most recent first, after the keyset position `after`."""
+        if after is None:
+            result = await db.execute(FIRST_REACTORS, {"target_id": post_id, "limit": limit})
+        else:
+            result = await db.execute(
+                NEXT_REACTORS, {"target_id": post_id, "limit": limit, "after_at": after[0], "after_id": after[1]}
+            )
+        return [
+            Reactor(reaction_id, REACTION_EMOJIS[code], reacted_at, user_id, username)
+            for reaction_id, code, reacted_at, user_id, username in result
+        ]
+
+reaction = CRUDReaction()
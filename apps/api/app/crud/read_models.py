@@ -0,0 +1,101 @@
+"""
+Read models for listing endpoints.
+
+Column-only selects materialized into slotted, immutable dataclasses: no
+identity map, no change tracking, no lazy-load machinery, and only the
+columns a response needs. User rows contribute `id` and `username` only, so
+sensitive columns such as `hashed_password` are never fetched.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import bindparam, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.replicas import replica_read
+from app.models.interaction import Comment, Like
+from app.models.post import Post, PostType
+from app.models.user import User
+
+@dataclass(slots=True, frozen=True)
+class AuthorRow:
+    """Public author summary."""
+    id: int
+    username: str
+
+@dataclass(slots=True, frozen=True)
+class PostRow:
+    """A post as shown in lists (matches PostOut)."""
+    id: str
+    title: Optional[str]
+    content: str
+    post_type: PostType
+    image_url: Optional[str]
+    image_variants: Optional[Dict[str, Any]]
+    is_public: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    author: AuthorRow
+    likes_count: int
+    comments_count: int
+
+_POST_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.content,
+    Post.post_type,
+    Post.image_url,
+    Post.image_variants,
+    Post.is_public,
+    Post.created_at,
+    Post.updated_at,
+)
+
+def _post_rows_query(*conditions):
+    """Page of public posts with author summary and counts, as plain columns."""
+    return (
+        select(
+            *_POST_COLUMNS,
+            User.id,
+            User.username,
+            select(func.count(Like.id)).where(Like.post_id == Post.id).scalar_subquery(),
+            select(func.count(Comment.id)).where(Comment.post_id == Post.id).scalar_subquery(),
+        )
+        .join(User, User.id == Post.author_id)
+        .where(Post.is_public == True, Post.is_draft == False, *conditions)
+        .order_by(desc(Post.created_at), desc(Post.id))
+        .offset(bindparam("skip"))
+        .limit(bindparam("limit"))
+    )
+
+PUBLIC_POST_ROWS = _post_rows_query()
+USER_POST_ROWS = _post_rows_query(Post.author_id == bindparam("user_id"))
+
+def _to_post_rows(rows) -> List[PostRow]:
+    return [
+        PostRow(
+            id, title, content, post_type, image_url, image_variants, is_public, created_at, updated_at,
+            AuthorRow(author_id, username), likes_count, comments_count,
+        )
+        for (
+            id, title, content, post_type, image_url, image_variants, is_public, created_at, updated_at,
+            author_id, username, likes_count, comments_count,
+        ) in rows
+    ]
+
+class PostReadModel:
+    """Listing queries returning PostRow pages."""
+
+    @replica_read
+    async def get_public_posts(self, db: AsyncSession, *, skip: int = 0, limit: int = 20) -> List[PostRow]:
+        """Get recent public posts."""
+        result = await db.execute(PUBLIC_POST_ROWS, {"skip": skip, "limit": limit})
+        return _to_post_rows(result.tuples())
+
+    @replica_read
+    async def get_user_posts(self, db: AsyncSession, *, user_id: int, skip: int = 0, limit: int = 20) -> List[PostRow]:
+        """Get a user's public posts."""
+        result = await db.execute(USER_POST_ROWS, {"user_id": user_id, "skip": skip, "limit": limit})
+        return _to_post_rows(result.tuples())
+
+post_rows = PostReadModel()
@@ -0,0 +1,154 @@
+"""
+Scheduled posts (PRD §6.1): drafts with a `scheduled_for` time are published
+by a background publisher, and any draft can be published now by its author.
+
+Every API process may run the publisher. Each batch claims due posts with
+`FOR UPDATE SKIP LOCKED` and publishes them in the same statement, so
+concurrent publishers split the work and a post is published exactly once.
+Publishing moves `created_at` to the publish time (feeds are read by
+recency), refreshes the post's ranking features and trending row, and runs
+the author stats and mention notification hooks in the same transaction.
+
+When nothing is due the publisher sleeps until the next scheduled time,
+capped at SCHEDULED_POSTS_POLL_SECONDS; that probe reads one entry of the
+partial `scheduled_for` index.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Callable, List, Optional
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_session_factory
+from app.crud.post import post as crud_post
+from app.crud.post_features import post_features
+from app.crud.trending import trending
+from app.models.post import Post
+
+logger = logging.getLogger(__name__)
+
+SCHEDULED_POSTS_BATCH_SIZE = int(os.getenv("SCHEDULED_POSTS_BATCH_SIZE", "100"))
+SCHEDULED_POSTS_POLL_SECONDS = float(os.getenv("SCHEDULED_POSTS_POLL_SECONDS", "30"))
+
+_due = (
+    select(Post.id)
+    .where(Post.scheduled_for <= func.now(), Post.is_draft == True)
+    .order_by(Post.scheduled_for)
+    .limit(bindparam("batch_size"))
+    .with_for_update(skip_locked=True)
+)
+PUBLISH_DUE = (
+    update(Post)
+    .where(Post.id.in_(_due.scalar_subquery()))
+    .values(is_draft=False, scheduled_for=None, created_at=func.now(), updated_at=None)
+    .returning(Post.id, Post.author_id, Post.content)
+)
+PUBLISH_DRAFT = (
+    update(Post)
+    .where(Post.id == bindparam("target_id"), Post.author_id == bindparam("target_author_id"), Post.is_draft == True)
+    .values(is_draft=False, scheduled_for=None, created_at=func.now(), updated_at=None)
+    .returning(Post.id, Post.author_id, Post.content)
+)
+SECONDS_UNTIL_NEXT_DUE = select(func.extract("epoch", func.min(Post.scheduled_for) - func.now())).where(
+    Post.scheduled_for.isnot(None)
+)
+
+class CRUDScheduledPosts:
+    """Claiming and publishing due posts."""
+
+    async def publish_due(self, db: AsyncSession, *, batch_size: int = SCHEDULED_POSTS_BATCH_SIZE) -> List[str]:
+        """Publish up to `batch_size` due posts not claimed by another publisher and commit; returns their IDs."""
+        published = (await db.execute(PUBLISH_DUE, {"batch_size": batch_size})).tuples().all()
+        await self._published(db, published)
+        await db.commit()
+        return [post_id for post_id, _, _ in published]
+
+    async def publish_now(self, db: AsyncSession, *, post_id: str, author_id: int) -> bool:
+        """Publish one of the author's drafts (scheduled or not) and commit; False if it is not an unpublished draft of theirs.
+
+        The row lock taken by the UPDATE serialises this with the publisher, so the post is published once.
+        """
+        published = (await db.execute(PUBLISH_DRAFT, {"target_id": post_id, "target_author_id": author_id})).tuples().all()
+        await self._published(db, published)
+        await db.commit()
+        return bool(published)
+
+    async def _published(self, db: AsyncSession, published) -> None:
+        if published:
+            post_ids = [post_id for post_id, _, _ in published]
+            await post_features.refresh(db, post_ids=post_ids)
+            for post_id in post_ids:
+                await trending.sync_post(db, post_id=post_id)
+            await crud_post.published(db, posts=published)
+
+    async def seconds_until_next_due(self, db: AsyncSession) -> Optional[float]:
+        """Seconds until the earliest scheduled post is due (negative if overdue), None if none is scheduled."""
+        seconds = await db.scalar(SECONDS_UNTIL_NEXT_DUE)
+        await db.rollback()
+        return None if seconds is None else float(seconds)
+
+scheduled_posts = CRUDScheduledPosts()
+
+class ScheduledPublisher:
+    """Background task publishing due posts in batches."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        batch_size: int = SCHEDULED_POSTS_BATCH_SIZE,
+        poll_seconds: float = SCHEDULED_POSTS_POLL_SECONDS,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    async def run_once(self) -> int:
+        """Publish everything due now; returns the number of posts published."""
+        total = 0
+        async with (self.session_factory or get_session_factory())() as db:
+            while True:
+                published = await scheduled_posts.publish_due(db, batch_size=self.batch_size)
+                total += len(published)
+                if len(published) < self.batch_size:
+                    return total
+
+    async def _idle_seconds(self) -> float:
+        async with (self.session_factory or get_session_factory())() as db:
+            seconds = await scheduled_posts.seconds_until_next_due(db)
+        if seconds is None:
+            return self.poll_seconds
+        return min(max(seconds, 0.0), self.poll_seconds)
+
+    async def run(self) -> None:
+        """Publish due posts until stopped."""
+        while not self._stopping.is_set():
+            try:
+                published = await self.run_once()
+                if published:
+                    logger.info(f"Published {published} scheduled posts")
+                delay = await self._idle_seconds()
+            except Exception:
+                logger.exception("Scheduled post publishing failed")
+                delay = self.poll_seconds
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Run the publisher as a background task of the current event loop."""
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the background task, letting an in-flight batch finish."""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+
+scheduled_publisher = ScheduledPublisher()
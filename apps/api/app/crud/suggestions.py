@@ -0,0 +1,127 @@
+"""
+Who-to-follow suggestions (PRD §7.5) from the in-memory follow graph.
+
+The graph is loaded once per process and kept current incrementally: this
+process's follow/unfollow writes are applied directly, follows written
+elsewhere are polled by `created_at` every FOLLOW_GRAPH_POLL_SECONDS, and a
+full reload every FOLLOW_GRAPH_RELOAD_SECONDS picks up other processes'
+unfollows and deleted accounts.
+
+`created_at` is the writing transaction's start time, so a follow can commit
+after a poll has already moved the watermark past it. Each poll therefore
+re-reads the last FOLLOW_GRAPH_POLL_OVERLAP_SECONDS before the watermark
+(adds are idempotent); a follow whose transaction ran longer than that is
+only picked up by the next full reload. Results are cached per user for
+SUGGESTION_CACHE_SECONDS; a user's own follow or unfollow drops their entry.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.follow_graph import FollowGraph
+from app.core.replicas import replica_read
+from app.models.interaction import Follow
+from app.models.user import User
+
+FOLLOW_GRAPH_RELOAD_SECONDS = float(os.getenv("FOLLOW_GRAPH_RELOAD_SECONDS", "3600"))
+FOLLOW_GRAPH_POLL_SECONDS = float(os.getenv("FOLLOW_GRAPH_POLL_SECONDS", "30"))
+FOLLOW_GRAPH_POLL_OVERLAP_SECONDS = float(os.getenv("FOLLOW_GRAPH_POLL_OVERLAP_SECONDS", "60"))
+SUGGESTION_CACHE_SECONDS = float(os.getenv("SUGGESTION_CACHE_SECONDS", "300"))
+SUGGESTION_CACHE_SIZE = 10_000
+
+ALL_FOLLOWS = select(Follow.follower_id, Follow.followed_id)
+LATEST_FOLLOW = select(func.max(Follow.created_at))
+FOLLOWS_SINCE = select(Follow.follower_id, Follow.followed_id, Follow.created_at).where(
+    Follow.created_at >= bindparam("since")
+)
+USERNAMES = select(User.id, User.username).where(User.id.in_(bindparam("user_ids", expanding=True)))
+
+class FollowSuggestions:
+    """Process-wide follow graph with a per-user suggestion cache."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the graph and cache (the next request reloads)."""
+        self.graph: Optional[FollowGraph] = None
+        self._loaded_at = self._polled_at = 0.0
+        self._watermark = None
+        self._cache: "OrderedDict[int, Tuple[float, int, List[Tuple[int, int]]]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    @replica_read
+    async def _load(self, db: AsyncSession) -> None:
+        # Watermark first: follows committed in between are polled again (adds are idempotent)
+        watermark = await db.scalar(LATEST_FOLLOW)
+        rows = (await db.execute(ALL_FOLLOWS)).all()
+        self.graph = FollowGraph(np.array(rows, dtype=np.int64).reshape(-1, 2))
+        self._watermark = watermark
+        self._loaded_at = self._polled_at = self.clock()
+        self._cache.clear()
+
+    @replica_read
+    async def _poll(self, db: AsyncSession) -> None:
+        if self._watermark is None:
+            # Graph was empty when loaded: nothing to poll from yet
+            return await self._load(db)
+        since = self._watermark - timedelta(seconds=FOLLOW_GRAPH_POLL_OVERLAP_SECONDS)
+        for follower_id, followed_id, created_at in await db.execute(FOLLOWS_SINCE, {"since": since}):
+            self.graph.add(follower_id, followed_id)
+            self._watermark = max(self._watermark, created_at)
+        self._polled_at = self.clock()
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Load or catch up the graph if it is due."""
+        now = self.clock()
+        if self.graph is not None and now - self._polled_at < FOLLOW_GRAPH_POLL_SECONDS:
+            return
+        async with self._lock:
+            if self.graph is None or now - self._loaded_at >= FOLLOW_GRAPH_RELOAD_SECONDS:
+                await self._load(db)
+            elif now - self._polled_at >= FOLLOW_GRAPH_POLL_SECONDS:
+                await self._poll(db)
+
+    def follow_added(self, follower_id: int, followed_id: int) -> None:
+        """Apply a committed follow from this process."""
+        if self.graph is not None:
+            self.graph.add(follower_id, followed_id)
+        self._cache.pop(follower_id, None)
+
+    def follow_removed(self, follower_id: int, followed_id: int) -> None:
+        """Apply a committed unfollow from this process."""
+        if self.graph is not None:
+            self.graph.remove(follower_id, followed_id)
+        self._cache.pop(follower_id, None)
+
+    async def suggest(self, db: AsyncSession, *, user_id: int, limit: int = 10) -> List[Tuple[int, int]]:
+        """Up to `limit` (user_id, mutual_follows) suggestions for a user."""
+        now = self.clock()
+        cached = self._cache.get(user_id)
+        if cached is not None and cached[0] > now and cached[1] >= limit:
+            self._cache.move_to_end(user_id)
+            return cached[2][:limit]
+
+        await self.refresh(db)
+        suggestions = self.graph.suggest(user_id, limit)
+        self._cache[user_id] = (now + SUGGESTION_CACHE_SECONDS, limit, suggestions)
+        self._cache.move_to_end(user_id)
+        if len(self._cache) > SUGGESTION_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return suggestions
+
+    @replica_read
+    async def get_usernames(self, db: AsyncSession, *, user_ids: List[int]) -> Dict[int, str]:
+        """Map user IDs to usernames (IDs of deleted users are missing)."""
+        if not user_ids:
+            return {}
+        return dict((await db.execute(USERNAMES, {"user_ids": user_ids})).tuples().all())
+
+follow_suggestions = FollowSuggestions()
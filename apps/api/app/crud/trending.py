@@ -0,0 +1,140 @@
+"""
+Trending posts for the Discovery Feed (PRD §7.3).
+
+Each like or comment is an event worth w·2^(-age / half-life). Storing every
+event decayed to "now" would mean rewriting all rows as time passes, so
+scores are kept relative to a fixed epoch instead: an event at time t adds
+w·2^((t - epoch) / half-life), and the row holds log2 of the running sum.
+All rows decay by the same factor, so ordering by the stored score *is*
+ordering by current trending score, and top-N lists are index scans. Log
+space keeps the values small (about 2 per day with a 12 hour half-life);
+sums and differences use log-add-exp.
+
+Compaction deletes rows whose decayed score has fallen below
+TRENDING_MIN_SCORE (run `python -m scripts.compact_trending` periodically).
+"""
+
+import math
+import os
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import DateTime, Float, and_, bindparam, case, delete, desc, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.ranking import PRDWeights
+from app.core.replicas import replica_read
+from app.models.post import Post, PostType
+from app.models.trending import TrendingPost
+
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "12"))
+TRENDING_MIN_SCORE = float(os.getenv("TRENDING_MIN_SCORE", "0.1"))  # Decayed engagement below this stops trending
+TRENDING_EPOCH = 1735689600  # 2025-01-01T00:00:00Z
+
+LIKE_WEIGHT = PRDWeights().hearts
+COMMENT_WEIGHT = PRDWeights().comments
+
+_LN2 = math.log(2)
+_HALF_LIFE_SECONDS = TRENDING_HALF_LIFE_HOURS * 3600
+
+def _half_lives_since_epoch(at):
+    return (func.extract("epoch", at) - TRENDING_EPOCH) / _HALF_LIFE_SECONDS
+
+def _log2(value):
+    return func.ln(value) / _LN2
+
+def _pow2(value):
+    return func.power(literal(2.0, Float), value)
+
+# log2(weight) + half-lives since epoch, for an event at :at (NULL: now)
+_event = bindparam("log_weight", type_=Float) + _half_lives_since_epoch(
+    func.coalesce(bindparam("at", type_=DateTime(timezone=True)), func.now())
+)
+# Current floor: rows below it have decayed under TRENDING_MIN_SCORE
+_floor = _half_lives_since_epoch(func.now()) + math.log2(TRENDING_MIN_SCORE)
+
+# Drafts rank as private until published
+_listed = and_(func.coalesce(Post.is_public, True), Post.is_draft == False)
+
+# Core insert: ORM inserts treat a parameter dict as rows to insert
+_insert_event = pg_insert(TrendingPost.__table__).from_select(
+    ["post_id", "post_type", "is_public", "score"],
+    select(Post.id, Post.post_type, _listed, _event).where(Post.id == bindparam("target_id")),
+)
+ADD_EVENT = _insert_event.on_conflict_do_update(
+    index_elements=[TrendingPost.post_id],
+    set_={
+        # log2(2^a + 2^b)
+        "score": func.greatest(TrendingPost.score, _insert_event.excluded.score)
+        + _log2(1 + _pow2(-func.abs(TrendingPost.score - _insert_event.excluded.score))),
+        "updated_at": func.now(),
+    },
+)
+
+REMOVE_EVENT = (
+    update(TrendingPost)
+    .where(TrendingPost.post_id == bindparam("target_id"))
+    .values(score=case(
+        # log2(2^a - 2^b); nothing left once the event was the whole score
+        (TrendingPost.score - _event > 1e-9, TrendingPost.score + _log2(1 - _pow2(_event - TrendingPost.score))),
+        else_=literal(float("-inf"), Float),
+    ))
+)
+
+SYNC_POST = (
+    update(TrendingPost)
+    .where(TrendingPost.post_id == Post.id, Post.id == bindparam("target_id"))
+    .values(post_type=Post.post_type, is_public=_listed)
+)
+
+def _top_query(*conditions):
+    return (
+        select(TrendingPost.post_id)
+        .where(TrendingPost.is_public == True, TrendingPost.score > _floor, *conditions)
+        .order_by(desc(TrendingPost.score))
+        .offset(bindparam("skip"))
+        .limit(bindparam("limit"))
+    )
+
+TOP_TRENDING = _top_query()
+TOP_TRENDING_BY_TYPE = _top_query(TrendingPost.post_type == bindparam("post_type"))
+
+COMPACT = delete(TrendingPost).where(TrendingPost.score < _floor)
+
+class CRUDTrending:
+    """Trending rollup maintenance and top-N queries."""
+
+    async def record_event(self, db: AsyncSession, *, post_id: str, weight: float, at: Optional[datetime] = None) -> None:
+        """Add an engagement event (at `at`, default now); the caller commits."""
+        await db.execute(ADD_EVENT, {"target_id": post_id, "log_weight": math.log2(weight), "at": at})
+
+    async def remove_event(self, db: AsyncSession, *, post_id: str, weight: float, at: datetime) -> None:
+        """Subtract an event recorded at `at` (e.g. an unlike); the caller commits."""
+        await db.execute(REMOVE_EVENT, {"target_id": post_id, "log_weight": math.log2(weight), "at": at})
+
+    async def sync_post(self, db: AsyncSession, *, post_id: str) -> None:
+        """Copy the post's type and visibility into its trending row; the caller commits."""
+        await db.execute(SYNC_POST, {"target_id": post_id})
+
+    async def compact(self, db: AsyncSession) -> int:
+        """Delete rows that have decayed below TRENDING_MIN_SCORE and commit; returns the number removed."""
+        result = await db.execute(COMPACT)
+        await db.commit()
+        return result.rowcount
+
+    @replica_read
+    async def get_trending_ids(
+        self,
+        db: AsyncSession,
+        *,
+        post_type: Optional[PostType] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[str]:
+        """IDs of the top trending public posts, optionally of one type."""
+        if post_type is None:
+            result = await db.execute(TOP_TRENDING, {"skip": skip, "limit": limit})
+        else:
+            result = await db.execute(TOP_TRENDING_BY_TYPE, {"post_type": post_type, "skip": skip, "limit": limit})
+        return list(result.scalars())
+
+trending = CRUDTrending()
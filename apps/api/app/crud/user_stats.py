@@ -0,0 +1,142 @@
+"""
+Profile statistics (`user_stats`).
+
+Post, like and follow writes apply deltas to the affected users' rows in the
+same transaction (upserts, so a missing row is created on first write).
+Deletes that bypass the CRUD layer, such as account purges, can leave rows
+stale; the nightly reconciler (`python -m scripts.reconcile_user_stats`)
+recomputes them from the source tables in batches of users.
+"""
+
+import os
+from typing import Optional, Tuple
+from sqlalchemy import Date, Integer, bindparam, case, cast, distinct, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.replicas import replica_read
+from app.models.interaction import Follow, Like
+from app.models.post import Post
+from app.models.user import User
+from app.models.user_stats import UserStats
+
+USER_STATS_BATCH_SIZE = int(os.getenv("USER_STATS_BATCH_SIZE", "500"))
+
+_stats = UserStats.__table__
+_COUNTERS = ("posts_count", "hearts_received", "followers_count", "following_count", "days_active")
+
+def _adjust(column: str, source):
+    """Upsert adding `source`'s (user_id, delta) row to one counter."""
+    stmt = pg_insert(_stats).from_select(["user_id", column], source)
+    return stmt.on_conflict_do_update(
+        index_elements=[_stats.c.user_id],
+        set_={column: _stats.c[column] + stmt.excluded[column], "updated_at": func.now()},
+    )
+
+_user_delta = select(bindparam("target_user_id", type_=Integer), bindparam("delta", type_=Integer))
+
+ADJUST_HEARTS = _adjust(
+    "hearts_received",
+    select(Post.author_id, bindparam("delta", type_=Integer)).where(Post.id == bindparam("target_id")),
+)
+ADJUST_FOLLOWERS = _adjust("followers_count", _user_delta)
+ADJUST_FOLLOWING = _adjust("following_count", _user_delta)
+
+_today = cast(func.timezone("UTC", func.now()), Date)
+_insert_post = pg_insert(_stats).from_select(
+    ["user_id", "posts_count", "days_active", "last_post_date"],
+    select(bindparam("target_user_id", type_=Integer), literal(1), literal(1), _today),
+)
+POST_CREATED = _insert_post.on_conflict_do_update(
+    index_elements=[_stats.c.user_id],
+    set_={
+        "posts_count": _stats.c.posts_count + 1,
+        # First post of the (UTC) day counts towards days active
+        "days_active": _stats.c.days_active + case(
+            (_stats.c.last_post_date.is_distinct_from(_insert_post.excluded.last_post_date), 1), else_=0
+        ),
+        "last_post_date": _insert_post.excluded.last_post_date,
+        "updated_at": func.now(),
+    },
+)
+
+GET_STATS = select(UserStats).where(UserStats.user_id == bindparam("target_user_id"))
+
+# Last user ID of the next reconciler batch
+_batch = select(User.id).where(User.id > bindparam("after_id")).order_by(User.id).limit(bindparam("batch_size")).subquery()
+BATCH_END = select(func.max(_batch.c.id))
+
+_post_day = cast(func.timezone("UTC", Post.created_at), Date)
+_published = (Post.author_id == User.id, Post.is_draft == False)
+_reconcile_columns = ("user_id", *_COUNTERS, "last_post_date")
+_insert_actual = pg_insert(_stats).from_select(
+    _reconcile_columns,
+    select(
+        User.id,
+        select(func.count(Post.id)).where(*_published).scalar_subquery(),
+        select(func.count(Like.id)).join(Post, Post.id == Like.post_id).where(Post.author_id == User.id).scalar_subquery(),
+        select(func.count(Follow.id)).where(Follow.followed_id == User.id).scalar_subquery(),
+        select(func.count(Follow.id)).where(Follow.follower_id == User.id).scalar_subquery(),
+        select(func.count(distinct(_post_day))).where(*_published).scalar_subquery(),
+        select(func.max(_post_day)).where(*_published).scalar_subquery(),
+    ).where(User.id > bindparam("after_id"), User.id <= bindparam("last_id")),
+)
+# Recompute a range of users, touching (and returning) only rows that were wrong
+RECONCILE = _insert_actual.on_conflict_do_update(
+    index_elements=[_stats.c.user_id],
+    set_={column: _insert_actual.excluded[column] for column in _reconcile_columns[1:]} | {"updated_at": func.now()},
+    where=tuple_(*(_stats.c[column] for column in _reconcile_columns[1:])).is_distinct_from(
+        tuple_(*(_insert_actual.excluded[column] for column in _reconcile_columns[1:]))
+    ),
+).returning(_stats.c.user_id)
+
+class CRUDUserStats:
+    """Incremental maintenance, reconciliation and reads of user_stats."""
+
+    async def post_created(self, db: AsyncSession, *, user_id: int) -> None:
+        """Count a new post by `user_id`; the caller commits."""
+        await db.execute(POST_CREATED, {"target_user_id": user_id})
+
+    async def adjust_hearts(self, db: AsyncSession, *, post_id: str, delta: int) -> None:
+        """Apply a like/unlike on `post_id` to its author's hearts; the caller commits."""
+        await db.execute(ADJUST_HEARTS, {"target_id": post_id, "delta": delta})
+
+    async def adjust_follow(self, db: AsyncSession, *, follower_id: int, followed_id: int, delta: int) -> None:
+        """Apply a follow/unfollow to both users' counts; the caller commits."""
+        await db.execute(ADJUST_FOLLOWING, {"target_user_id": follower_id, "delta": delta})
+        await db.execute(ADJUST_FOLLOWERS, {"target_user_id": followed_id, "delta": delta})
+
+    @replica_read
+    async def get(self, db: AsyncSession, *, user_id: int) -> Optional[UserStats]:
+        """A user's stats row (one primary-key lookup)."""
+        result = await db.execute(GET_STATS, {"target_user_id": user_id})
+        return result.scalar_one_or_none()
+
+    async def reconcile_batch(
+        self,
+        db: AsyncSession,
+        *,
+        after_id: int = 0,
+        batch_size: int = USER_STATS_BATCH_SIZE
+    ) -> Tuple[Optional[int], int]:
+        """Recompute the next batch of users after `after_id` and commit.
+
+        Returns (last user ID in the batch or None when done, rows corrected).
+        """
+        last_id = await db.scalar(BATCH_END, {"after_id": after_id, "batch_size": batch_size})
+        if last_id is None:
+            return None, 0
+        result = await db.execute(RECONCILE, {"after_id": after_id, "last_id": last_id})
+        corrected = len(result.all())
+        await db.commit()
+        return last_id, corrected
+
+    async def reconcile(self, db: AsyncSession, *, batch_size: int = USER_STATS_BATCH_SIZE) -> int:
+        """Reconcile every user, one committed batch at a time; returns rows corrected."""
+        after_id, total = 0, 0
+        while True:
+            after_id, corrected = await self.reconcile_batch(db, after_id=after_id, batch_size=batch_size)
+            if after_id is None:
+                return total
+            total += corrected
+
+user_stats = CRUDUserStats()
@@ -0,0 +1,57 @@
+"""
+Per-viewer state for a page of posts, in one query.
+
+Each post's state is a small int bitset:
+
+    bit 0     liked
+    bit 1     bookmarked
+    bits 2-5  reaction emoji code + 1 (0: no reaction)
+"""
+
+from typing import Dict, List, Optional
+from sqlalchemy import Integer, String, bindparam, cast, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.replicas import replica_read
+from app.models.bookmark import Bookmark
+from app.models.interaction import Like
+from app.models.reaction import REACTION_EMOJIS, Reaction
+
+LIKED = 1
+BOOKMARKED = 2
+REACTION_SHIFT = 2
+
+def reaction_of(state: int) -> Optional[str]:
+    """The reaction emoji encoded in a state bitset, if any."""
+    code = (state >> REACTION_SHIFT) & 0b1111
+    return REACTION_EMOJIS[code - 1] if code else None
+
+_page = select(func.unnest(bindparam("post_ids", type_=ARRAY(String))).label("post_id")).subquery("page")
+_viewer = bindparam("viewer_id")
+
+def _flag(model):
+    """1 if the viewer has a `model` row for the post, else 0."""
+    return cast(select(model.id).where(model.post_id == _page.c.post_id, model.user_id == _viewer).exists(), Integer)
+
+_reaction = func.coalesce(
+    select(Reaction.emoji_code + 1).where(Reaction.post_id == _page.c.post_id, Reaction.user_id == _viewer).scalar_subquery(),
+    0,
+)
+# Each lookup is a probe of a (user_id, post_id) unique index
+VIEWER_STATE = select(
+    _page.c.post_id,
+    _flag(Like).op("|")(_flag(Bookmark).op("<<")(1)).op("|")(_reaction.op("<<")(REACTION_SHIFT)),
+)
+
+class ViewerStateLoader:
+    """Batched liked/bookmarked/reaction lookups."""
+
+    @replica_read
+    async def load(self, db: AsyncSession, *, viewer_id: int, post_ids: List[str]) -> Dict[str, int]:
+        """State bitset per post ID (0 for posts the viewer hasn't touched)."""
+        if not post_ids:
+            return {}
+        result = await db.execute(VIEWER_STATE, {"viewer_id": viewer_id, "post_ids": list(dict.fromkeys(post_ids))})
+        return dict(result.tuples().all())
+
+viewer_state = ViewerStateLoader()
@@ -2,6 +2,15 @@ from .user import User
 from .post import Post
 from .interaction import Like, Comment, Follow
 from .notification import Notification
+from .account_purge import AccountPurge
+from .rate_limit import RateLimitBucket
+from .post_features import PostFeatures
+from .trending import TrendingPost
+from .user_stats import UserStats
+from .reaction import Reaction, PostReactionCounts
+from .bookmark import Bookmark
+from .job import Job
+from .outbox import OutboxEvent
 
 __all__ = [
     "User",
@@ -9,5 +18,15 @@ __all__ = [
     "Like",
     "Comment",
     "Follow",
-    "Notification"
+    "Notification",
+    "AccountPurge",
+    "RateLimitBucket",
+    "PostFeatures",
+    "TrendingPost",
+    "UserStats",
+    "Reaction",
+    "PostReactionCounts",
+    "Bookmark",
+    "Job",
+    "OutboxEvent"
 ] 
\ No newline at end of file
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class AccountPurge(Base):
+    """Progress of an account deletion; survives crashes so purges can resume."""
+    __tablename__ = "account_purges"
+
+    # No foreign key: the row must outlive the user it describes
+    user_id = Column(Integer, primary_key=True)
+    stage = Column(String, nullable=False, default="likes")
+    cursor = Column(String, nullable=True)  # Keyset position within the current stage
+    rows_deleted = Column(Integer, nullable=False, default=0)
+    requested_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<AccountPurge(user_id={self.user_id}, stage={self.stage}, rows_deleted={self.rows_deleted})>"
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+class Bookmark(Base):
+    """A post saved privately by a user."""
+    __tablename__ = "bookmarks"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    post_id = Column(String, ForeignKey("posts.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "post_id", name="unique_user_post_bookmark"),
+        # A user's bookmarks, newest first
+        Index("ix_bookmarks_user_created", "user_id", created_at.desc(), id.desc()),
+    )
+
+    def __repr__(self):
+        return f"<Bookmark(user_id={self.user_id}, post_id={self.post_id})>"
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, String, DateTime, Text, ForeignKey, UniqueConstraint, Integer
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 import uuid
@@ -14,6 +15,8 @@ class Like(Base):
     # Ensure one like per user per post
     __table_args__ = (UniqueConstraint('user_id', 'post_id', name='unique_user_post_like'),)
 
+    user = relationship("User")
+
     def __repr__(self):
         return f"<Like(user_id={self.user_id}, post_id={self.post_id})>"
 
@@ -28,6 +31,8 @@ class Comment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    author = relationship("User")
+
     def __repr__(self):
         return f"<Comment(id={self.id}, author_id={self.author_id}, post_id={self.post_id})>"
 
@@ -42,5 +47,8 @@ class Follow(Base):
     # Ensure one follow relationship per pair
     __table_args__ = (UniqueConstraint('follower_id', 'followed_id', name='unique_follow'),)
 
+    follower = relationship("User", foreign_keys=[follower_id])
+    followed = relationship("User", foreign_keys=[followed_id])
+
     def __repr__(self):
         return f"<Follow(follower_id={self.follower_id}, followed_id={self.followed_id})>" 
\ No newline at end of file
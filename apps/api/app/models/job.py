@@ -0,0 +1,34 @@
+from sqlalchemy import Column, String, DateTime, Text, Integer, BigInteger, JSON, Index, text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+class Job(Base):
+    """A background job (see app.crud.jobs for claiming and retries)."""
+    __tablename__ = "jobs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    queue = Column(String, nullable=False, default="default")
+    task = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(String, nullable=False, default=JOB_QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    # Queued: when it may first run (or be retried); running: when its visibility timeout expires
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Claims scan only live jobs; finished ones drop out of the index
+        Index("ix_jobs_ready", "queue", "run_at", postgresql_where=text("status IN ('queued', 'running')")),
+        Index("ix_jobs_finished", "finished_at", postgresql_where=text("finished_at IS NOT NULL")),
+    )
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, task={self.task}, status={self.status})>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime, Text, Integer, BigInteger, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class OutboxEvent(Base):
+    """A domain event awaiting delivery (see app.crud.outbox)."""
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)  # Delivery order
+    aggregate_type = Column(String, nullable=False)
+    aggregate_id = Column(String, nullable=False)
+    event_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    failed_at = Column(DateTime(timezone=True), nullable=True)  # Out of attempts; kept for inspection
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<OutboxEvent(id={self.id}, type={self.event_type}, aggregate={self.aggregate_type}:{self.aggregate_id})>"
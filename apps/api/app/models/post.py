@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, DateTime, Text, Boolean, Integer, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, Text, Boolean, Integer, ForeignKey, Enum, JSON, Index, text
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 import enum
@@ -18,9 +19,20 @@ class Post(Base):
     content = Column(Text, nullable=False)
     post_type = Column(Enum(PostType, name="posttype", schema="public"), default=PostType.DAILY, nullable=False)
     image_url = Column(String, nullable=True)
+    image_variants = Column(JSON, nullable=True)  # {"source_sha256": ..., "large": {"webp": {...}, "jpg": {...}}, ...}
     is_public = Column(Boolean, default=True)
+    # Drafts are hidden from every listing; a draft with scheduled_for is published then
+    is_draft = Column(Boolean, nullable=False, default=False, server_default=text("false"))
+    scheduled_for = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    author = relationship("User")
+
+    __table_args__ = (
+        # Only pending posts are indexed, so the publisher's probe is a tiny index scan
+        Index("ix_posts_scheduled_for", "scheduled_for", postgresql_where=text("scheduled_for IS NOT NULL")),
+    )
+
     def __repr__(self):
         return f"<Post(id={self.id}, author_id={self.author_id}, type={self.post_type})>" 
\ No newline at end of file
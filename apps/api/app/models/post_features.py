@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, Integer, Boolean, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class PostFeatures(Base):
+    """Precomputed ranking inputs for a post, kept current by interaction writes."""
+    __tablename__ = "post_features"
+
+    post_id = Column(String, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    author_id = Column(Integer, nullable=False, index=True)
+    is_public = Column(Boolean, nullable=False, default=True)
+    has_image = Column(Boolean, nullable=False, default=False)
+    is_daily = Column(Boolean, nullable=False, default=False)
+    is_spontaneous = Column(Boolean, nullable=False, default=False)
+    hearts = Column(Integer, nullable=False, default=0)
+    comments = Column(Integer, nullable=False, default=0)
+    shares = Column(Integer, nullable=False, default=0)
+    reports = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)  # Post creation time
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<PostFeatures(post_id={self.post_id}, hearts={self.hearts}, comments={self.comments})>"
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, Float, Boolean
+from app.core.database import Base
+
+class RateLimitBucket(Base):
+    """Token bucket shared between API processes (see app.core.rate_limit.DatabaseBackend)."""
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String, primary_key=True)  # "<policy>:<subject>"
+    tokens = Column(Float, nullable=False)
+    allowed = Column(Boolean, nullable=False)  # Outcome of the most recent check
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RateLimitBucket(key={self.key}, tokens={self.tokens})>"
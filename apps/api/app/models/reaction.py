@@ -0,0 +1,48 @@
+from sqlalchemy import Column, String, DateTime, Integer, SmallInteger, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+# PRD §6.5 reaction emojis; a reaction stores the index into this tuple
+REACTION_EMOJIS = ("😍", "🤗", "🙏", "💪", "🌟", "🔥", "🥰", "👏")
+EMOJI_CODES = {emoji: code for code, emoji in enumerate(REACTION_EMOJIS)}
+
+class Reaction(Base):
+    """A user's emoji reaction to a post (one per user per post, changeable)."""
+    __tablename__ = "reactions"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    post_id = Column(String, ForeignKey("posts.id"), nullable=False)
+    emoji_code = Column(SmallInteger, nullable=False)
+    reacted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Set again on change
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "post_id", name="unique_user_post_reaction"),
+        # Reaction viewer pages: keyset on (reacted_at, id) within a post
+        Index("ix_reactions_post_reacted", "post_id", reacted_at.desc(), id.desc()),
+    )
+
+    user = relationship("User")
+
+    def __repr__(self):
+        return f"<Reaction(user_id={self.user_id}, post_id={self.post_id}, emoji_code={self.emoji_code})>"
+
+class PostReactionCounts(Base):
+    """Per-post reaction histogram: count_<code> for each emoji, plus the total."""
+    __tablename__ = "post_reaction_counts"
+
+    post_id = Column(String, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    count_0 = Column(Integer, nullable=False, default=0)
+    count_1 = Column(Integer, nullable=False, default=0)
+    count_2 = Column(Integer, nullable=False, default=0)
+    count_3 = Column(Integer, nullable=False, default=0)
+    count_4 = Column(Integer, nullable=False, default=0)
+    count_5 = Column(Integer, nullable=False, default=0)
+    count_6 = Column(Integer, nullable=False, default=0)
+    count_7 = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PostReactionCounts(post_id={self.post_id}, total={self.total})>"
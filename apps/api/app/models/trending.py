@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, Float, Boolean, Enum, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.models.post import PostType
+
+class TrendingPost(Base):
+    """Time-decayed engagement rollup for a post (see app.crud.trending for the score encoding)."""
+    __tablename__ = "trending_posts"
+
+    post_id = Column(String, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    post_type = Column(Enum(PostType), nullable=False)
+    is_public = Column(Boolean, nullable=False, default=True)
+    score = Column(Float, nullable=False)  # log2 of engagement scaled to the trending epoch
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Top-N lists are index scans, overall and per post type
+    __table_args__ = (
+        Index("ix_trending_posts_score", score.desc(), postgresql_where=is_public),
+        Index("ix_trending_posts_type_score", post_type, score.desc(), postgresql_where=is_public),
+    )
+
+    def __repr__(self):
+        return f"<TrendingPost(post_id={self.post_id}, score={self.score})>"
@@ -2,10 +2,19 @@
 User model.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, func
+from typing import NamedTuple, Optional
+from sqlalchemy import Column, Index, Integer, String, DateTime, bindparam, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.core.database import Base
+from app.core.replicas import replica_read
+
+class SignupResult(NamedTuple):
+    """Outcome of User.insert_if_new: the new ID, or which unique columns were already taken."""
+    user_id: Optional[int]
+    email_taken: bool
+    username_taken: bool
 
 class User(Base):
     """User model."""
@@ -17,20 +26,56 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Mentions resolve handles case-insensitively
+        Index("ix_users_username_lower", func.lower(username)),
+    )
+
     @classmethod
     async def get_by_email(cls, db: AsyncSession, email: str):
         """Get user by email."""
-        result = await db.execute(select(cls).where(cls.email == email))
+        result = await db.execute(_BY_EMAIL, {"email": email})
         return result.scalar_one_or_none()
 
     @classmethod
+    @replica_read
     async def get_by_id(cls, db: AsyncSession, user_id: int):
         """Get user by ID."""
-        result = await db.execute(select(cls).where(cls.id == user_id))
+        result = await db.execute(_BY_ID, {"user_id": user_id})
         return result.scalar_one_or_none()
 
+    @classmethod
+    async def insert_if_new(cls, db: AsyncSession, *, email: str, username: str, hashed_password: str) -> "SignupResult":
+        """Insert a user unless the email or username is taken, in one statement; the caller commits."""
+        result = await db.execute(
+            _INSERT_IF_NEW, {"new_email": email, "new_username": username, "new_hashed_password": hashed_password}
+        )
+        return SignupResult(*result.one())
+
     @classmethod
     async def get_by_username(cls, db: AsyncSession, username: str):
         """Get user by username."""
         result = await db.execute(select(cls).where(cls.username == username))
-        return result.scalar_one_or_none() 
\ No newline at end of file
+        return result.scalar_one_or_none()
+
+# Built once: these run on every login and authenticated request
+_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_BY_ID = select(User).where(User.id == bindparam("user_id"))
+# The EXISTS probes read the snapshot from before the insert, so they report
+# pre-existing rows only; both are false if a concurrent signup won the race.
+_inserted = (
+    pg_insert(User)
+    .values(
+        email=bindparam("new_email"),
+        username=bindparam("new_username"),
+        hashed_password=bindparam("new_hashed_password"),
+    )
+    .on_conflict_do_nothing()
+    .returning(User.id)
+    .cte("inserted")
+)
+_INSERT_IF_NEW = select(
+    select(_inserted.c.id).scalar_subquery(),
+    select(User.id).where(User.email == bindparam("new_email")).exists(),
+    select(User.id).where(User.username == bindparam("new_username")).exists(),
+).execution_options(writes=True)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Date, DateTime, Integer, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class UserStats(Base):
+    """Profile statistics for a user (PRD §8.2), kept current by post, like and follow writes."""
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    posts_count = Column(Integer, nullable=False, default=0)
+    hearts_received = Column(Integer, nullable=False, default=0)
+    followers_count = Column(Integer, nullable=False, default=0)
+    following_count = Column(Integer, nullable=False, default=0)
+    days_active = Column(Integer, nullable=False, default=0)  # Distinct UTC days with a post
+    last_post_date = Column(Date, nullable=True)  # UTC
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<UserStats(user_id={self.user_id}, posts_count={self.posts_count})>"
@@ -0,0 +1,67 @@
+"""
+Interaction schemas.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from app.models.reaction import EMOJI_CODES
+from app.schemas.post import AuthorSummary
+
+class LikeCreate(BaseModel):
+    """Schema for like creation."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    user_id: int
+    post_id: str
+
+class CommentCreate(BaseModel):
+    """Schema for comment creation."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    post_id: str
+    content: str = Field(..., min_length=1, max_length=200)
+    parent_id: Optional[str] = None
+
+class CommentUpdate(BaseModel):
+    """Schema for comment update."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    content: str = Field(..., min_length=1, max_length=200)
+
+class FollowCreate(BaseModel):
+    """Schema for follow creation."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    follower_id: int
+    followed_id: int
+
+class ReactionSet(BaseModel):
+    """Schema for adding or changing a reaction."""
+    emoji: str
+
+    @field_validator("emoji")
+    @classmethod
+    def emoji_is_supported(cls, value: str) -> str:
+        if value not in EMOJI_CODES:
+            raise ValueError("Unsupported reaction emoji")
+        return value
+
+class ReactionSummaryOut(BaseModel):
+    """Schema for a post's reaction counts and the viewer's reaction."""
+    model_config = ConfigDict(from_attributes=True)
+
+    total: int
+    counts: Dict[str, int]
+    viewer_reaction: Optional[str] = None
+
+class ReactorOut(BaseModel):
+    """Schema for one row of the reaction viewer."""
+    user: AuthorSummary
+    emoji: str
+    reacted_at: datetime
+
+class ReactorPage(BaseModel):
+    """Schema for a page of the reaction viewer."""
+    items: List[ReactorOut]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,58 @@
+"""
+Post schemas.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from app.models.post import PostType
+
+class PostCreate(BaseModel):
+    """Schema for post creation."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    title: Optional[str] = None
+    content: str = Field(..., min_length=1)
+    post_type: PostType = PostType.DAILY
+    image_url: Optional[str] = None
+    is_public: bool = True
+    is_draft: bool = False
+    scheduled_for: Optional[datetime] = None  # Implies a draft until then
+
+class PostUpdate(BaseModel):
+    """Schema for post update."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    title: Optional[str] = None
+    content: Optional[str] = Field(None, min_length=1)
+    post_type: Optional[PostType] = None
+    image_url: Optional[str] = None
+    is_public: Optional[bool] = None
+
+class AuthorSummary(BaseModel):
+    """Schema for the author embedded in post responses."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    username: str
+
+class PostOut(BaseModel):
+    """Schema for post output with interaction counts."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: str
+    title: Optional[str] = None
+    content: str
+    post_type: PostType
+    image_url: Optional[str] = None
+    image_variants: Optional[Dict[str, Any]] = None
+    is_public: bool = True
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    author: AuthorSummary
+    likes_count: int = 0
+    comments_count: int = 0
+
+class FeedPostOut(PostOut):
+    """Schema for post output in feeds, with the viewer's like status."""
+    is_liked: bool = False
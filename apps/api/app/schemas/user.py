@@ -1,6 +1,8 @@
 """
 User schemas.
 """
+from datetime import date
+from typing import Optional
 from pydantic import BaseModel, EmailStr, ConfigDict
 
 class UserCreate(BaseModel):
@@ -17,4 +19,27 @@ class UserOut(BaseModel):
     
     id: int
     email: EmailStr
-    username: str 
\ No newline at end of file
+    username: str
+
+class UserStatsOut(BaseModel):
+    """Schema for profile statistics."""
+    model_config = ConfigDict(from_attributes=True)
+
+    user_id: int
+    posts_count: int = 0
+    hearts_received: int = 0
+    followers_count: int = 0
+    following_count: int = 0
+    days_active: int = 0
+    last_post_date: Optional[date] = None
+
+class UserSuggestionOut(BaseModel):
+    """Schema for a who-to-follow suggestion."""
+    id: int
+    username: str
+    mutual_follows: int
+
+class UserSummaryOut(BaseModel):
+    """Schema for a user in autocomplete results."""
+    id: int
+    username: str
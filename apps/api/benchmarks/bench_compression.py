@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compression ratio and throughput per codec and level.
+
+Compresses a 100-post feed page (the same payload as bench_serialization.py)
+with every codec CompressionMiddleware can use here and reports the size
+ratio and MB/s at each level, to pick COMPRESSION_*_LEVEL values.
+
+Usage: python benchmarks/bench_compression.py [--rows 100] [--repeat 50]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.compression import available_encoders
+from app.core.responses import model_list_response
+from app.schemas.post import PostOut
+from bench_serialization import build_page
+
+LEVELS = {
+    "gzip": range(1, 10),
+    "br": range(0, 12),
+    "zstd": (1, 3, 6, 9, 12, 15, 19),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    body = model_list_response(PostOut, build_page(args.rows)).body
+    print(f"payload: {len(body)} bytes ({args.rows} posts)")
+    for name, encoder_cls in available_encoders().items():
+        print(f"\n{name}")
+        for level in LEVELS[name]:
+            def run():
+                encoder = encoder_cls(level)
+                return encoder.compress(body) + encoder.finish()
+            size = len(run())
+            seconds = min(timeit.repeat(run, number=args.repeat, repeat=3)) / args.repeat
+            throughput = len(body) / seconds / 1e6
+            print(f"  level {level:>2}: {size:>7} bytes  ratio {len(body) / size:5.1f}x  {throughput:8.1f} MB/s  {seconds * 1e6:8.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-request statement CPU in the CRUD layer.
+
+Compares building a fresh select() for every call (the old CRUDPost code)
+with the module-level statements in app.crud.post that take bind parameters.
+Both paths then do what Session.execute does before touching the network:
+derive the cache key and look the compiled SQL up in an LRU cache, compiling
+on a miss. One "request" is a get_user_posts page: the page query plus two
+count queries per row. No database needed.
+
+Usage: python benchmarks/bench_crud_statements.py [--rows 20] [--repeat 2000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.orm import selectinload
+from sqlalchemy.util import LRUCache
+from app.crud.post import COMMENTS_COUNT, LIKES_COUNT, USER_POSTS_PAGE
+from app.models import Comment, Like, Post
+
+DIALECT = asyncpg_dialect()
+
+def run(statement, cache: LRUCache) -> None:
+    """Cache-key generation plus compiled-cache lookup, as done per execute()."""
+    key = statement._generate_cache_key().key
+    if key not in cache:
+        cache[key] = statement.compile(dialect=DIALECT)
+
+def rebuilt_request(cache: LRUCache, rows: int) -> None:
+    run(
+        select(Post)
+        .options(selectinload(Post.author))
+        .where(Post.author_id == 1)
+        .where(Post.is_public == True)
+        .order_by(desc(Post.created_at))
+        .offset(0)
+        .limit(rows),
+        cache,
+    )
+    for i in range(rows):
+        run(select(func.count(Like.id)).where(Like.post_id == str(i)), cache)
+        run(select(func.count(Comment.id)).where(Comment.post_id == str(i)), cache)
+
+def prebuilt_request(cache: LRUCache, rows: int) -> None:
+    run(USER_POSTS_PAGE, cache)
+    for _ in range(rows):
+        run(LIKES_COUNT, cache)
+        run(COMMENTS_COUNT, cache)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, request in (("rebuilt per call", rebuilt_request), ("prebuilt + bindparam", prebuilt_request)):
+        cache = LRUCache(500)
+        request(cache, args.rows)  # Warm the compiled cache
+        seconds = timeit.timeit(lambda: request(cache, args.rows), number=args.repeat)
+        print(f"{name:22s} {seconds / args.repeat * 1e6:9.1f} us/request  ({1 + 2 * args.rows} statements)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ORM listing vs. read models for a page of posts.
+
+Runs CRUDPost.get_user_posts (ORM instances, selectinload authors, per-row
+counts) and post_rows.get_user_posts (one column-only select into slotted
+dataclasses) against the same data, reporting latency and the number and
+size of allocations per page (tracemalloc).
+
+Uses a temporary SQLite database unless --database-url points at an empty
+Postgres database (tables are created and dropped).
+
+Usage: python benchmarks/bench_read_models.py [--rows 100] [--repeat 50] [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.crud.post import post as crud_post
+from app.crud.read_models import post_rows
+from app.models import Comment, Like, Post, User
+
+async def seed(engine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User).values(
+            [{"id": i, "email": f"u{i}@example.com", "username": f"user{i}", "hashed_password": "x" * 60} for i in (1, 2)]
+        ))
+        await conn.execute(insert(Post).values([
+            {"id": f"post-{i:04d}", "author_id": 1, "title": f"Grateful #{i}", "content": "Sunshine and coffee. " * 10}
+            for i in range(rows)
+        ]))
+        await conn.execute(insert(Like).values([{"id": f"like-{i}", "user_id": 2, "post_id": f"post-{i:04d}"} for i in range(rows)]))
+        await conn.execute(insert(Comment).values(
+            [{"id": f"comment-{i}", "author_id": 2, "post_id": f"post-{i:04d}", "content": "Yes!"} for i in range(rows)]
+        ))
+
+async def measure(factory, fetch, rows: int, repeat: int):
+    """Mean latency (ms) and allocations per page (count, KiB)."""
+    async with factory() as session:
+        await fetch(session, user_id=1, limit=rows)  # Warm caches
+    elapsed = 0.0
+    for _ in range(repeat):
+        async with factory() as session:
+            start = time.perf_counter()
+            await fetch(session, user_id=1, limit=rows)
+            elapsed += time.perf_counter() - start
+
+    async with factory() as session:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        page = await fetch(session, user_id=1, limit=rows)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    size = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    assert len(page) == rows
+    return elapsed / repeat * 1000, blocks, size / 1024
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_async_engine(url)
+        try:
+            await seed(engine, args.rows)
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            for name, fetch in (("ORM (CRUDPost)", crud_post.get_user_posts), ("read model (PostRow)", post_rows.get_user_posts)):
+                latency, blocks, kib = await measure(factory, fetch, args.rows, args.repeat)
+                print(f"{name:22s} {latency:8.2f} ms/page  {blocks:7d} live allocations  {kib:8.1f} KiB")
+        finally:
+            if args.database_url:
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.drop_all)
+            await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
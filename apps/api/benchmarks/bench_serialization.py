@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: serializing a 100-post page.
+
+Compares FastAPI's default path (dicts -> jsonable_encoder -> json.dumps) with
+FastJSONResponse (orjson when installed) and the Pydantic `from_attributes`
+path used by list endpoints. No database needed; posts are transient ORM objects.
+
+Usage: python benchmarks/bench_serialization.py [--rows 100] [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.models import User, Post
+from app.models.post import PostType
+from app.core.responses import FastJSONResponse, model_list_response, orjson
+from app.schemas.post import PostOut
+
+def build_page(rows: int) -> list:
+    """Build a page of posts shaped like CRUDPost.get_user_posts output."""
+    author = User(id=1, email="bench@example.com", username="bench", hashed_password="x")
+    now = datetime.now(timezone.utc)
+    posts = []
+    for i in range(rows):
+        post = Post(
+            id=str(uuid.uuid4()),
+            author_id=1,
+            title=f"Grateful #{i}",
+            content="Today I am grateful for sunshine, good coffee and kind people. " * 4,
+            post_type=PostType.DAILY,
+            image_url=None,
+            is_public=True,
+            created_at=now,
+            updated_at=now,
+        )
+        post.author = author
+        post.likes_count = i
+        post.comments_count = i // 2
+        posts.append(post)
+    return posts
+
+def as_dicts(posts: list) -> list:
+    """Hand-built dicts, as routes returned before response models."""
+    return [
+        {
+            "id": p.id, "title": p.title, "content": p.content, "post_type": p.post_type,
+            "image_url": p.image_url, "is_public": p.is_public,
+            "created_at": p.created_at, "updated_at": p.updated_at,
+            "author": {"id": p.author.id, "username": p.author.username},
+            "likes_count": p.likes_count, "comments_count": p.comments_count,
+        }
+        for p in posts
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    posts = build_page(args.rows)
+    cases = {
+        "jsonable_encoder + json": lambda: JSONResponse(jsonable_encoder(as_dicts(posts))).body,
+        "FastJSONResponse (dicts)": lambda: FastJSONResponse(as_dicts(posts)).body,
+        "model_list_response": lambda: model_list_response(PostOut, posts).body,
+    }
+
+    print(f"{args.rows} posts/page, {args.repeat} iterations, orjson={'yes' if orjson else 'no'}")
+    baseline = None
+    for name, fn in cases.items():
+        seconds = min(timeit.repeat(fn, number=args.repeat, repeat=3)) / args.repeat
+        baseline = baseline or seconds
+        print(f"  {name:<28} {seconds * 1e6:9.1f} us/page  {baseline / seconds:5.2f}x  ({len(fn())} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,13 @@ from contextlib import asynccontextmanager
 import logging
 import os
 from app.api.v1 import api_router
+from app.core.etag import ConditionalGetMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.images import shutdown_image_pool
+from app.crud.scheduled_posts import scheduled_publisher
+from app.crud.outbox import outbox_relay
+import app.crud.event_notifications  # Registers the outbox subscribers
+import app.crud.job_tasks  # Registers the job tasks, whose attempt limits apply at enqueue
 from app.core.database import get_async_engine, Base, TEST_DATABASE_URL, get_test_engine
 import asyncio
 
@@ -29,10 +36,24 @@ async def lifespan(app: FastAPI):
             await conn.run_sync(Base.metadata.create_all)
     
     logger.info("Database tables created successfully")
+
+    # Every process may publish scheduled posts: claims use SKIP LOCKED
+    run_publisher = not os.getenv("TESTING") and os.getenv("SCHEDULED_POSTS_PUBLISHER", "true").lower() == "true"
+    if run_publisher:
+        scheduled_publisher.start()
+    # Likewise the outbox relay: an advisory lock lets one process drain at a time
+    run_relay = not os.getenv("TESTING") and os.getenv("OUTBOX_RELAY", "true").lower() == "true"
+    if run_relay:
+        outbox_relay.start()
     yield
     
     # Shutdown
     logger.info("Shutting down Grateful API...")
+    if run_publisher:
+        await scheduled_publisher.stop()
+    if run_relay:
+        await outbox_relay.stop()
+    shutdown_image_pool()
 
 app = FastAPI(
     title="Grateful API",
@@ -50,6 +71,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Answer If-None-Match with 304 for responses that carry an ETag
+app.add_middleware(ConditionalGetMiddleware)
+
+# Compress large responses (gzip, or brotli/zstd when installed); see COMPRESSION_* env vars
+app.add_middleware(CompressionMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
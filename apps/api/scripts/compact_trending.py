@@ -0,0 +1,24 @@
+"""
+Drop trending rows that have decayed below TRENDING_MIN_SCORE (schedule hourly).
+
+Usage: python -m scripts.compact_trending
+"""
+
+import argparse
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.database import get_async_engine
+from app.crud.trending import trending
+
+async def main():
+    engine = get_async_engine()
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        removed = await trending.compact(session)
+    await engine.dispose()
+    print(f"{removed} trending rows compacted")
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Compact the trending posts rollup.").parse_args()
+    asyncio.run(main())
@@ -4,6 +4,15 @@ import app.models.user
 import app.models.post
 import app.models.interaction
 import app.models.notification
+import app.models.account_purge
+import app.models.rate_limit
+import app.models.post_features
+import app.models.trending
+import app.models.user_stats
+import app.models.reaction
+import app.models.bookmark
+import app.models.job
+import app.models.outbox
 
 if __name__ == "__main__":
     # Use the postgres superuser for schema creation
@@ -0,0 +1,28 @@
+"""
+Run outstanding account deletions (schedule daily; PRD requires completion within 30 days).
+
+Usage: python -m scripts.purge_accounts [--limit 10] [--chunk-size 500]
+"""
+
+import argparse
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.database import get_async_engine
+from app.crud.account_purge import PURGE_CHUNK_SIZE, purge_pending_accounts
+
+async def main(limit: int, chunk_size: int):
+    engine = get_async_engine()
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        purges = await purge_pending_accounts(session, limit=limit, chunk_size=chunk_size)
+    await engine.dispose()
+    for purge in purges:
+        print(f"user {purge.user_id}: {purge.stage} ({purge.rows_deleted} rows deleted)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Purge accounts with pending deletion requests.")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=PURGE_CHUNK_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.limit, args.chunk_size))
@@ -0,0 +1,26 @@
+"""
+Recompute user_stats from posts, likes and follows (schedule nightly to repair drift).
+
+Usage: python -m scripts.reconcile_user_stats [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.database import get_async_engine
+from app.crud.user_stats import USER_STATS_BATCH_SIZE, user_stats
+
+async def main(batch_size: int):
+    engine = get_async_engine()
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        corrected = await user_stats.reconcile(session, batch_size=batch_size)
+    await engine.dispose()
+    print(f"{corrected} user_stats rows corrected")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile profile statistics.")
+    parser.add_argument("--batch-size", type=int, default=USER_STATS_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
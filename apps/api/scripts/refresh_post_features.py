@@ -0,0 +1,25 @@
+"""
+Recompute all post_features rows from posts, likes and comments (schedule nightly to repair drift).
+
+Usage: python -m scripts.refresh_post_features
+"""
+
+import argparse
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.database import get_async_engine
+from app.crud.post_features import post_features
+
+async def main():
+    engine = get_async_engine()
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        await post_features.refresh(session)
+        await session.commit()
+    await engine.dispose()
+    print("post_features refreshed")
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Refresh ranking features for all posts.").parse_args()
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+"""
+Run a background job worker (deploy alongside `uvicorn main:app`; any number may run).
+
+Usage: python -m scripts.run_worker [--queues default] [--concurrency 8] [--processes 2] [--once]
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import app.crud.job_tasks  # Registers the maintenance tasks
+from app.crud.jobs import JOB_CONCURRENCY, JOB_PROCESSES, JobWorker
+
+async def main(queues, concurrency: int, processes: int, once: bool):
+    worker = JobWorker(queues=queues, concurrency=concurrency, processes=processes)
+    try:
+        if once:
+            attempts = await worker.run_once()
+            print(f"{attempts} job attempts run")
+        else:
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, worker.stop)
+            await worker.run()
+    finally:
+        worker.shutdown()
+    print(f"Worker metrics: {worker.metrics.snapshot()}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run background jobs from the jobs table.")
+    parser.add_argument("--queues", nargs="+", default=["default"])
+    parser.add_argument("--concurrency", type=int, default=JOB_CONCURRENCY)
+    parser.add_argument("--processes", type=int, default=JOB_PROCESSES)
+    parser.add_argument("--once", action="store_true", help="Run ready jobs, then exit")
+    args = parser.parse_args()
+    asyncio.run(main(args.queues, args.concurrency, args.processes, args.once))
@@ -26,6 +26,16 @@ def event_loop():
     yield loop
     loop.close()
 
+@pytest.fixture(autouse=True)
+def rate_limiter():
+    """Give each test fresh in-process rate limit buckets."""
+    from app.core.rate_limit import InMemoryBackend, set_rate_limiter
+
+    backend = InMemoryBackend()
+    set_rate_limiter(backend)
+    yield backend
+    set_rate_limiter(None)
+
 @pytest_asyncio.fixture(scope="function")
 async def test_engine():
     """Create a test database engine."""
@@ -47,6 +57,15 @@ def session_factory(test_engine):
         autoflush=False
     )
 
+@pytest.fixture
+def app_session_factory(test_engine, monkeypatch):
+    """Point the app's shared session factory (used outside request dependencies) at the test database."""
+    from app.core import database
+
+    factory = async_sessionmaker(test_engine, class_=database.LazyAsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(database, "_session_factory", factory)
+    return factory
+
 @pytest_asyncio.fixture(scope="function")
 async def test_db_setup(test_engine):
     """Set up test database tables."""
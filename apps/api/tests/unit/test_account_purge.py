@@ -0,0 +1,113 @@
+"""
+Unit tests for chunked account deletion.
+"""
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select
+from app.crud.account_purge import PURGE_DONE, purge_account
+from app.crud.bookmarks import bookmark as crud_bookmark
+from app.crud.reactions import reaction as crud_reaction
+from app.models import AccountPurge, Comment, Follow, Like, Notification, Post, User
+from app.models.bookmark import Bookmark
+from app.models.reaction import Reaction
+from tests.utils.factories import UserFactory, PostFactory
+
+@pytest_asyncio.fixture
+async def social_graph(db_session):
+    """Two users who have interacted with each other's content."""
+    alice = UserFactory.create_user(db_session)
+    bob = UserFactory.create_user(db_session)
+    await db_session.commit()
+
+    alice_posts = [PostFactory.create_post(db_session, alice) for _ in range(5)]
+    bob_post = PostFactory.create_post(db_session, bob)
+    await db_session.commit()
+
+    # Alice comments on Bob's post and Bob replies to her; Bob also comments on his own post
+    alice_comment = Comment(author_id=alice.id, post_id=bob_post.id, content="Lovely")
+    bob_comment = Comment(author_id=bob.id, post_id=bob_post.id, content="Thanks all")
+    db_session.add_all([alice_comment, bob_comment])
+    await db_session.commit()
+    db_session.add(Comment(author_id=bob.id, post_id=bob_post.id, parent_id=alice_comment.id, content="Thank you"))
+
+    db_session.add_all([Like(user_id=bob.id, post_id=p.id) for p in alice_posts])
+    db_session.add(Comment(author_id=bob.id, post_id=alice_posts[0].id, content="Beautiful"))
+    db_session.add(Like(user_id=alice.id, post_id=bob_post.id))
+    db_session.add(Follow(follower_id=alice.id, followed_id=bob.id))
+    db_session.add(Follow(follower_id=bob.id, followed_id=alice.id))
+    db_session.add(Notification(user_id=alice.id, type="like", title="New heart", message="Bob liked your post"))
+    await db_session.commit()
+    return alice, bob, bob_post, bob_comment
+
+async def count(db_session, model, *conditions) -> int:
+    """Count rows of a model matching conditions."""
+    return (await db_session.execute(select(func.count()).select_from(model).where(*conditions))).scalar()
+
+class TestAccountPurge:
+    """Test the purge pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_purge_removes_all_user_data(self, db_session, social_graph):
+        """Every row owned by or hanging off the user is deleted; others' content stays."""
+        alice, bob, bob_post, bob_comment = social_graph
+        alice_id = alice.id
+
+        purge = await purge_account(db_session, user_id=alice_id, chunk_size=2)
+
+        assert purge.stage == PURGE_DONE
+        assert purge.completed_at is not None
+        assert await count(db_session, User, User.id == alice_id) == 0
+        assert await count(db_session, Post, Post.author_id == alice_id) == 0
+        assert await count(db_session, Like, Like.user_id == alice_id) == 0
+        assert await count(db_session, Follow) == 0
+        assert await count(db_session, Notification) == 0
+        # Bob's reply to Alice's comment went with the subtree; his own comment remains
+        assert await count(db_session, Comment) == 1
+        assert await count(db_session, Comment, Comment.id == bob_comment.id) == 1
+        assert await count(db_session, Post, Post.id == bob_post.id) == 1
+
+    @pytest.mark.asyncio
+    async def test_purge_resumes_from_progress(self, db_session, social_graph):
+        """A purge interrupted after some chunks picks up from the recorded stage and cursor."""
+        alice = social_graph[0]
+        alice_id = alice.id
+
+        partial = await purge_account(db_session, user_id=alice_id, chunk_size=2, max_chunks=3)
+        assert partial.stage != PURGE_DONE
+        stored = (await db_session.execute(select(AccountPurge).where(AccountPurge.user_id == alice_id))).scalar_one()
+        assert stored.rows_deleted == partial.rows_deleted > 0
+
+        finished = await purge_account(db_session, user_id=alice_id, chunk_size=2)
+        assert finished.stage == PURGE_DONE
+        assert await count(db_session, User, User.id == alice_id) == 0
+
+    @pytest.mark.asyncio
+    async def test_purge_past_new_stages_still_completes(self, db_session, social_graph):
+        """A purge recorded past the reactions and bookmarks stages sweeps them before deleting the user."""
+        alice, bob, bob_post, _ = social_graph
+        alice_id, bob_post_id = alice.id, bob_post.id
+        await crud_reaction.set_reaction(db_session, user_id=alice_id, post_id=bob_post_id, code=2)
+        await crud_bookmark.add(db_session, user_id=alice_id, post_id=bob_post_id)
+        # Recorded before the new stages existed: only the likes stages had run
+        await db_session.execute(delete(Like).where(Like.user_id == alice_id))
+        db_session.add(AccountPurge(user_id=alice_id, stage="comments", rows_deleted=0))
+        await db_session.commit()
+
+        purge = await purge_account(db_session, user_id=alice_id, chunk_size=2)
+        assert purge.stage == PURGE_DONE
+        assert await count(db_session, User, User.id == alice_id) == 0
+        assert await count(db_session, Reaction) == 0
+        assert await count(db_session, Bookmark) == 0
+        assert (await crud_reaction.get_summary(db_session, post_id=bob_post_id)).total == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_account_endpoint(self, async_client: AsyncClient, db_session, social_graph):
+        """The endpoint schedules the purge and leaves the work to the job."""
+        alice = social_graph[0]
+        response = await async_client.delete("/api/v1/users/me", headers=UserFactory.get_auth_headers(alice.id))
+
+        assert response.status_code == 202
+        assert await count(db_session, AccountPurge, AccountPurge.user_id == alice.id) == 1
+        assert await count(db_session, User, User.id == alice.id) == 1
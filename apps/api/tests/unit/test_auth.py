@@ -63,6 +63,22 @@ class TestAuthEndpoints:
         assert "detail" in data
         assert "already exists" in data["detail"].lower()
 
+    @pytest.mark.asyncio
+    async def test_signup_duplicate_username(self, async_client: AsyncClient, test_user_data):
+        """Username conflicts are reported separately from email conflicts, without a 500."""
+        assert (await async_client.post("/api/v1/auth/signup", json=test_user_data)).status_code == 201
+
+        response = await async_client.post(
+            "/api/v1/auth/signup", json={**test_user_data, "email": f"other-{test_user_data['email']}"}
+        )
+        assert response.status_code == 409
+        assert response.json()["detail"] == "Username already exists"
+
+        response = await async_client.post(
+            "/api/v1/auth/signup", json={**test_user_data, "username": f"{test_user_data['username']}x"}
+        )
+        assert response.json()["detail"] == "Email already exists"
+
     @pytest.mark.asyncio
     async def test_signup_invalid_data(self, async_client: AsyncClient):
         """Test signup with invalid data."""
@@ -279,4 +295,45 @@ class TestAuthValidation:
         }
         
         login_response = await async_client.post("/api/v1/auth/login", json=login_data)
-        assert login_response.status_code == 200 
\ No newline at end of file
+        assert login_response.status_code == 200
+
+
+@pytest_asyncio.fixture
+async def counting_client():
+    """Client whose database dependency only counts how often it is entered."""
+    from httpx import ASGITransport
+    from main import app
+    from app.core.database import get_db
+
+    opened = []
+
+    async def override_get_db():
+        opened.append(True)
+        yield None
+
+    previous = app.dependency_overrides
+    app.dependency_overrides = {**previous, get_db: override_get_db}
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            yield client, opened
+    finally:
+        app.dependency_overrides = previous
+
+class TestEarlyTokenRejection:
+    """Bad tokens are rejected before a database session is opened."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path,method", [
+        ("/api/v1/auth/session", "GET"),
+        ("/api/v1/users/me", "DELETE"),
+        ("/api/v1/posts/some-post/like", "POST"),
+    ])
+    async def test_invalid_token_skips_database(self, counting_client, path, method):
+        """Malformed and forged tokens get a 401 without entering get_db."""
+        client, opened = counting_client
+        forged = UserFactory.create_auth_token(1, secret_key="wrong-secret")
+        for headers in ({"Authorization": "Bearer not-a-jwt"}, {"Authorization": f"Bearer {forged}"}):
+            response = await client.request(method, path, headers=headers)
+            assert response.status_code == 401
+        assert opened == []
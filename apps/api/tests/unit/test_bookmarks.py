@@ -0,0 +1,91 @@
+"""
+Unit tests for bookmarks and the viewer-state loader.
+"""
+
+import pytest
+from sqlalchemy import select
+from app.crud.account_purge import purge_pending_accounts, request_account_purge
+from app.crud.bookmarks import bookmark as crud_bookmark
+from app.crud.interaction import like as crud_like
+from app.crud.post import post as crud_post
+from app.crud.reactions import reaction as crud_reaction
+from app.crud.viewer_state import BOOKMARKED, LIKED, reaction_of, viewer_state
+from app.models.bookmark import Bookmark
+from app.models.reaction import EMOJI_CODES
+from tests.utils.factories import PostFactory, UserFactory
+
+class TestBookmarks:
+    """Test bookmark writes, listing and batched viewer state."""
+
+    @pytest.mark.asyncio
+    async def test_bookmark_list_and_remove(self, async_client, db_session):
+        """Bookmarks list most recently saved first and can be removed once."""
+        author = UserFactory.create_user(db_session)
+        user = UserFactory.create_user(db_session)
+        await db_session.flush()
+        first = PostFactory.create_post(db_session, author)
+        second = PostFactory.create_post(db_session, author)
+        await db_session.commit()
+        headers = UserFactory.get_auth_headers(user.id)
+
+        for post in (first, second):
+            response = await async_client.post(f"/api/v1/posts/{post.id}/bookmark", headers=headers)
+            assert response.status_code == 201
+        assert (await async_client.post(f"/api/v1/posts/{first.id}/bookmark", headers=headers)).status_code == 409
+        assert (await async_client.post("/api/v1/posts/missing/bookmark", headers=headers)).status_code == 404
+
+        response = await async_client.get("/api/v1/users/me/bookmarks", headers=headers)
+        assert response.status_code == 200
+        assert [post["id"] for post in response.json()] == [second.id, first.id]
+
+        assert (await async_client.delete(f"/api/v1/posts/{second.id}/bookmark", headers=headers)).status_code == 204
+        assert (await async_client.delete(f"/api/v1/posts/{second.id}/bookmark", headers=headers)).status_code == 404
+        response = await async_client.get("/api/v1/users/me/bookmarks", headers=headers)
+        assert [post["id"] for post in response.json()] == [first.id]
+
+    @pytest.mark.asyncio
+    async def test_viewer_state_bits(self, async_client, db_session):
+        """Likes, bookmarks and reactions come back as one bitset per post."""
+        author = UserFactory.create_user(db_session)
+        viewer = UserFactory.create_user(db_session)
+        await db_session.flush()
+        posts = [PostFactory.create_post(db_session, author) for _ in range(3)]
+        await db_session.commit()
+
+        await crud_like.create_like(db_session, user_id=viewer.id, post_id=posts[0].id)
+        await async_client.post(f"/api/v1/posts/{posts[0].id}/bookmark", headers=UserFactory.get_auth_headers(viewer.id))
+        await crud_reaction.set_reaction(db_session, user_id=viewer.id, post_id=posts[1].id, code=EMOJI_CODES["🔥"])
+
+        states = await viewer_state.load(db_session, viewer_id=viewer.id, post_ids=[post.id for post in posts])
+        assert states[posts[0].id] == LIKED | BOOKMARKED
+        assert reaction_of(states[posts[0].id]) is None
+        assert not states[posts[1].id] & (LIKED | BOOKMARKED)
+        assert reaction_of(states[posts[1].id]) == "🔥"
+        assert states[posts[2].id] == 0
+
+        response = await async_client.get(
+            "/api/v1/posts/viewer-state",
+            params={"ids": ",".join(post.id for post in posts)},
+            headers=UserFactory.get_auth_headers(viewer.id),
+        )
+        assert response.status_code == 200
+        assert response.json() == states
+
+        post = await crud_post.get_with_author(db_session, post_id=posts[0].id, current_user_id=viewer.id)
+        assert post.is_liked is True
+
+    @pytest.mark.asyncio
+    async def test_purge_removes_bookmarks(self, db_session):
+        """Purging an account removes its bookmarks and others' bookmarks of its posts."""
+        author = UserFactory.create_user(db_session)
+        reader = UserFactory.create_user(db_session)
+        await db_session.flush()
+        own = PostFactory.create_post(db_session, author)
+        other = PostFactory.create_post(db_session, reader)
+        await db_session.commit()
+        await crud_bookmark.add(db_session, user_id=reader.id, post_id=own.id)
+        await crud_bookmark.add(db_session, user_id=author.id, post_id=other.id)
+
+        await request_account_purge(db_session, user_id=author.id)
+        await purge_pending_accounts(db_session)
+        assert (await db_session.execute(select(Bookmark))).scalars().all() == []
@@ -0,0 +1,122 @@
+"""
+Unit tests for the response compression middleware.
+"""
+
+import gzip
+import zlib
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+from app.core.compression import CompressionMiddleware, available_encoders, choose_encoding
+
+PAYLOAD = b'{"content": "' + b"grateful " * 400 + b'"}'
+
+def build_app(**kwargs) -> FastAPI:
+    """Small app exercising the middleware's pass-through rules."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, encodings=["gzip"], minimum_size=500, **kwargs)
+
+    @app.get("/large")
+    async def large():
+        return Response(PAYLOAD, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return Response(b'{"ok": true}', media_type="application/json")
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(gzip.compress(PAYLOAD), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/image")
+    async def image():
+        return Response(PAYLOAD, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(50):
+                yield b'{"line": %d, "text": "grateful grateful grateful"}\n' % i
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+@pytest.fixture
+def client():
+    """HTTP client that asks for gzip but does not decode, so we see raw bytes."""
+    transport = ASGITransport(app=build_app())
+    return AsyncClient(transport=transport, base_url="http://testserver", headers={"Accept-Encoding": "gzip"})
+
+class TestEncodingNegotiation:
+    """Test Accept-Encoding negotiation."""
+
+    def test_choose_encoding(self):
+        """Server preference order wins among accepted codings; q=0 disables."""
+        assert choose_encoding("gzip, br", ["zstd", "br", "gzip"]) == "br"
+        assert choose_encoding("br;q=0, gzip", ["br", "gzip"]) == "gzip"
+        assert choose_encoding("gzip;q=0.5, zstd;q=0.9", ["zstd", "gzip"]) == "zstd"
+        assert choose_encoding("*", ["gzip"]) == "gzip"
+        assert choose_encoding("identity", ["gzip"]) is None
+        assert choose_encoding(None, ["gzip"]) is None
+
+    @pytest.mark.parametrize("name,module", [("br", "brotli"), ("zstd", "zstandard")])
+    def test_optional_encoders_round_trip(self, name, module):
+        """Optional codecs stream-compress and decode back to the original body."""
+        codec = pytest.importorskip(module)
+        encoder = available_encoders()[name](3)
+        data = encoder.compress(PAYLOAD[:100]) + encoder.flush() + encoder.compress(PAYLOAD[100:]) + encoder.finish()
+        if name == "br":
+            assert codec.decompress(data) == PAYLOAD
+        else:
+            assert codec.ZstdDecompressor().decompressobj().decompress(data) == PAYLOAD
+
+class TestCompressionMiddleware:
+    """Test which responses get compressed."""
+
+    @pytest.mark.asyncio
+    async def test_large_response_compressed(self, client):
+        """Large JSON is gzipped, Vary is set and strong ETags become weak."""
+        async with client:
+            response = await client.get("/large")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"v1"'
+        assert response.content == PAYLOAD  # httpx transparently decodes gzip
+        assert int(response.headers["content-length"]) < len(PAYLOAD)
+
+    @pytest.mark.asyncio
+    async def test_small_response_untouched(self, client):
+        """Bodies under the threshold are sent as-is."""
+        async with client:
+            response = await client.get("/small")
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_skips_encoded_and_excluded_types(self, client):
+        """Already-encoded bodies and binary media types are not recompressed."""
+        async with client:
+            encoded = await client.get("/encoded")
+            image = await client.get("/image")
+        assert encoded.content == PAYLOAD
+        assert "content-encoding" not in image.headers
+
+    @pytest.mark.asyncio
+    async def test_streaming_response(self, client):
+        """Streaming bodies are compressed incrementally without Content-Length."""
+        async with client:
+            async with client.stream("GET", "/stream") as response:
+                raw = b"".join([chunk async for chunk in response.aiter_raw()])
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        lines = zlib.decompress(raw, 31).splitlines()
+        assert len(lines) == 50
+
+    @pytest.mark.asyncio
+    async def test_no_accept_encoding(self):
+        """Clients that do not advertise gzip get identity responses."""
+        transport = ASGITransport(app=build_app())
+        async with AsyncClient(transport=transport, base_url="http://testserver", headers={"Accept-Encoding": "identity"}) as client:
+            response = await client.get("/large")
+        assert "content-encoding" not in response.headers
+        assert response.content == PAYLOAD
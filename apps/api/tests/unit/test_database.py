@@ -0,0 +1,83 @@
+"""
+Unit tests for the connection-releasing database session.
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.core.database import LazyAsyncSession
+from app.models.user import User
+from tests.utils.factories import UserFactory
+
+@pytest_asyncio.fixture
+async def lazy_session(test_engine, test_db_setup):
+    """A LazyAsyncSession on the test engine."""
+    factory = async_sessionmaker(test_engine, class_=LazyAsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        yield session
+
+class TestLazyAsyncSession:
+    """Test when LazyAsyncSession holds a pooled connection."""
+
+    @pytest.mark.asyncio
+    async def test_no_connection_until_first_query(self, lazy_session, test_engine):
+        """Creating the session checks nothing out."""
+        assert test_engine.pool.checkedout() == 0
+        assert not lazy_session.in_transaction()
+
+    @pytest.mark.asyncio
+    async def test_reads_release_connection(self, lazy_session, test_engine):
+        """A read returns its connection as soon as it finishes; loaded objects stay usable."""
+        user = UserFactory.create_user(lazy_session)
+        await lazy_session.commit()
+
+        loaded = (await lazy_session.execute(select(User).where(User.id == user.id))).scalar_one()
+        assert test_engine.pool.checkedout() == 0
+        assert await lazy_session.scalar(select(User.username).where(User.id == user.id)) == loaded.username
+        assert (await lazy_session.get(User, user.id)) is loaded
+        assert test_engine.pool.checkedout() == 0
+
+    @pytest.mark.asyncio
+    async def test_writes_hold_connection_until_commit(self, lazy_session, test_engine):
+        """Flushed writes, DML and locking reads keep the transaction until commit or rollback."""
+        user = UserFactory.create_user(lazy_session)
+        await lazy_session.flush()
+        await lazy_session.execute(select(User.id))
+        assert test_engine.pool.checkedout() == 1
+        await lazy_session.commit()
+        assert test_engine.pool.checkedout() == 0
+
+        user_id, username = user.id, user.username
+        await lazy_session.execute(update(User).where(User.id == user_id).values(username="renamed"))
+        assert test_engine.pool.checkedout() == 1
+        await lazy_session.rollback()
+        assert (await lazy_session.scalar(select(User.username).where(User.id == user_id))) == username
+
+        await lazy_session.execute(select(User).where(User.id == user_id).with_for_update())
+        await lazy_session.execute(text("SELECT 1"))
+        assert test_engine.pool.checkedout() == 1
+        await lazy_session.rollback()
+        assert test_engine.pool.checkedout() == 0
+
+    @pytest.mark.asyncio
+    async def test_pending_objects_are_not_committed_by_reads(self, lazy_session):
+        """Autoflushed pending objects keep the transaction open, so rollback discards them."""
+        user = UserFactory.create_user(lazy_session)
+        await lazy_session.execute(select(User.id))
+        await lazy_session.rollback()
+        assert await lazy_session.scalar(select(User.id).where(User.email == user.email)) is None
+
+    @pytest.mark.asyncio
+    async def test_insert_cte_keeps_transaction(self, lazy_session, test_engine):
+        """A SELECT over a data-modifying CTE is a write, so the caller still decides whether to commit."""
+        created = await User.insert_if_new(lazy_session, email="cte@example.com", username="cte", hashed_password="x")
+        assert created.user_id is not None and not created.email_taken
+        assert test_engine.pool.checkedout() == 1
+        await lazy_session.rollback()
+        assert await lazy_session.scalar(select(User.id).where(User.email == "cte@example.com")) is None
+
+        await User.insert_if_new(lazy_session, email="cte@example.com", username="cte", hashed_password="x")
+        await lazy_session.commit()
+        taken = await User.insert_if_new(lazy_session, email="cte@example.com", username="other", hashed_password="x")
+        assert (taken.user_id, taken.email_taken, taken.username_taken) == (None, True, False)
@@ -0,0 +1,112 @@
+"""
+Unit tests for conditional GET (ETag) support.
+"""
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, Response
+from fastapi.middleware.cors import CORSMiddleware
+from httpx import ASGITransport, AsyncClient
+from app.core.etag import ConditionalGetMiddleware, etag_matches, make_weak_etag
+from tests.utils.factories import UserFactory, PostFactory
+
+@pytest_asyncio.fixture
+async def author_with_posts(db_session):
+    """Create a user with a couple of public posts."""
+    user = UserFactory.create_user(db_session)
+    await db_session.commit()
+    await db_session.refresh(user)
+    for _ in range(2):
+        PostFactory.create_post(db_session, user)
+    await db_session.commit()
+    return user
+
+class TestETagHelpers:
+    """Test ETag derivation and matching."""
+
+    def test_weak_etag_is_stable(self):
+        """Same version components give the same weak ETag."""
+        etag = make_weak_etag("user-posts", 1, 0, 20, 3)
+        assert etag.startswith('W/"')
+        assert etag == make_weak_etag("user-posts", 1, 0, 20, 3)
+        assert etag != make_weak_etag("user-posts", 1, 0, 20, 4)
+
+    def test_etag_matches(self):
+        """If-None-Match uses weak comparison and accepts lists and '*'."""
+        etag = make_weak_etag("x")
+        assert etag_matches(etag, etag)
+        assert etag_matches(etag[2:], etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+class TestConditionalGet:
+    """Test 304 responses on profile and session endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_user_posts_not_modified(self, async_client: AsyncClient, author_with_posts):
+        """A matching If-None-Match gets a bodyless 304."""
+        url = f"/api/v1/users/{author_with_posts.id}/posts"
+        response = await async_client.get(url)
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+        etag = response.headers["etag"]
+
+        response = await async_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    @pytest.mark.asyncio
+    async def test_user_posts_etag_changes_on_write(self, async_client: AsyncClient, db_session, author_with_posts):
+        """New posts invalidate the previous ETag."""
+        url = f"/api/v1/users/{author_with_posts.id}/posts"
+        etag = (await async_client.get(url)).headers["etag"]
+
+        PostFactory.create_post(db_session, author_with_posts)
+        await db_session.commit()
+
+        response = await async_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+        assert response.headers["etag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_user_posts_unknown_user(self, async_client: AsyncClient, test_db_setup):
+        """Unknown users are reported by the version probe."""
+        response = await async_client.get("/api/v1/users/999999/posts")
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_session_not_modified(self, async_client: AsyncClient, author_with_posts):
+        """Session endpoint honours If-None-Match."""
+        login_data = {"email": author_with_posts.email, "password": "testpassword123"}
+        token = (await async_client.post("/api/v1/auth/login", json=login_data)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = await async_client.get("/api/v1/auth/session", headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        response = await async_client.get("/api/v1/auth/session", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_middleware_keeps_cors_headers(self):
+        """Cross-origin 304s from the middleware keep the CORS headers added inside it."""
+        etag = make_weak_etag("cors")
+        app = FastAPI()
+        app.add_middleware(CORSMiddleware, allow_origins=["http://localhost:3000"], allow_credentials=True)
+        app.add_middleware(ConditionalGetMiddleware)
+
+        @app.get("/thing")
+        async def thing():
+            return Response(b"body", headers={"ETag": etag})
+
+        headers = {"Origin": "http://localhost:3000", "If-None-Match": etag}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+            response = await client.get("/thing", headers=headers)
+        assert response.status_code == 304
+        assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+        assert response.headers["access-control-allow-credentials"] == "true"
@@ -0,0 +1,125 @@
+"""
+Unit tests for the streaming history export.
+"""
+
+import csv
+import io
+import json
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from app.crud.export import decode_checkpoint, encode_checkpoint, stream_user_history
+from app.models.interaction import Like, Comment
+from tests.utils.factories import UserFactory, PostFactory
+
+@pytest_asyncio.fixture
+async def user_with_history(db_session):
+    """Create a user with posts (one private), a like and a comment."""
+    user = UserFactory.create_user(db_session)
+    await db_session.commit()
+    posts = [PostFactory.create_post(db_session, user) for _ in range(3)]
+    posts.append(PostFactory.create_post(db_session, user, is_public=False))
+    await db_session.commit()
+    db_session.add(Like(user_id=user.id, post_id=posts[0].id))
+    db_session.add(Comment(author_id=user.id, post_id=posts[1].id, content="So true"))
+    await db_session.commit()
+    return user
+
+@pytest.fixture(autouse=True)
+def export_sessions(app_session_factory):
+    """The export body reads through the app's session factory."""
+    return app_session_factory
+
+@pytest_asyncio.fixture
+async def unpatched_client(test_db_setup):
+    """Client using the real get_db dependency."""
+    from main import app
+
+    app.dependency_overrides.clear()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        yield client
+
+def parse_ndjson(body: bytes) -> list:
+    """Parse an NDJSON body into a list of objects."""
+    return [json.loads(line) for line in body.splitlines() if line]
+
+def types_index(records: list, record_type: str) -> int:
+    """Index of the first record with the given type."""
+    return next(i for i, r in enumerate(records) if r["type"] == record_type)
+
+class TestExportHistory:
+    """Test the /users/me/export endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson(self, async_client: AsyncClient, user_with_history):
+        """All sections are streamed, each followed by a checkpoint line."""
+        headers = UserFactory.get_auth_headers(user_with_history.id)
+        response = await async_client.get("/api/v1/users/me/export", headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = parse_ndjson(response.content)
+        types = [r["type"] for r in records]
+        assert types.count("post") == 4
+        assert types.count("like") == 1
+        assert types.count("comment") == 1
+        assert types.count("checkpoint") == 3
+        assert all("hashed_password" not in r for r in records)
+
+    @pytest.mark.asyncio
+    async def test_export_resume_from_checkpoint(self, async_client: AsyncClient, user_with_history):
+        """Resuming from the post-section checkpoint skips the posts already received."""
+        headers = UserFactory.get_auth_headers(user_with_history.id)
+        records = parse_ndjson((await async_client.get("/api/v1/users/me/export", headers=headers)).content)
+        cursor = records[types_index(records, "checkpoint")]["cursor"]
+
+        response = await async_client.get("/api/v1/users/me/export", params={"after": cursor}, headers=headers)
+        resumed = [r["type"] for r in parse_ndjson(response.content) if r["type"] != "checkpoint"]
+        assert resumed == ["like", "comment"]
+
+    @pytest.mark.asyncio
+    async def test_export_csv(self, async_client: AsyncClient, user_with_history):
+        """CSV export has a header row and one row per record or checkpoint."""
+        headers = UserFactory.get_auth_headers(user_with_history.id)
+        response = await async_client.get("/api/v1/users/me/export", params={"format": "csv"}, headers=headers)
+
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 4 + 1 + 1 + 3
+
+    @pytest.mark.asyncio
+    async def test_export_returns_connections(self, unpatched_client: AsyncClient, user_with_history, test_engine):
+        """The body's session is closed once streamed, so no connection stays checked out."""
+        headers = UserFactory.get_auth_headers(user_with_history.id)
+        response = await unpatched_client.get("/api/v1/users/me/export", headers=headers)
+
+        assert response.status_code == 200
+        assert [r["type"] for r in parse_ndjson(response.content)].count("post") == 4
+        assert test_engine.pool.checkedout() == 0
+
+    @pytest.mark.asyncio
+    async def test_export_requires_auth(self, async_client: AsyncClient, test_db_setup):
+        """Export is only available to the authenticated owner."""
+        response = await async_client.get("/api/v1/users/me/export")
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_export_invalid_cursor(self, async_client: AsyncClient, user_with_history):
+        """Malformed cursors are rejected."""
+        headers = UserFactory.get_auth_headers(user_with_history.id)
+        response = await async_client.get("/api/v1/users/me/export", params={"after": "not-a-cursor"}, headers=headers)
+        assert response.status_code == 400
+
+class TestStreamUserHistory:
+    """Test keyset chunking in the CRUD layer."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_and_checkpoints(self, db_session, user_with_history):
+        """Small chunks yield bounded partitions whose checkpoints resume exactly."""
+        chunks = [c async for c in stream_user_history(db_session, user_id=user_with_history.id, chunk_size=3)]
+        assert [(section, len(rows)) for section, rows, _ in chunks] == [("post", 3), ("post", 1), ("like", 1), ("comment", 1)]
+
+        checkpoint = decode_checkpoint(encode_checkpoint(chunks[0][2]))
+        assert checkpoint == chunks[0][2]
+        resumed = [c async for c in stream_user_history(db_session, user_id=user_with_history.id, after=checkpoint, chunk_size=3)]
+        assert resumed[0][1] == chunks[1][1]
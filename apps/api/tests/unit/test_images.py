@@ -0,0 +1,118 @@
+"""
+Unit tests for post image uploads.
+"""
+
+import io
+import os
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from PIL import Image
+from app.core.images import process_image
+from app.core.storage import LocalStorage, get_storage, content_key
+from tests.utils.factories import UserFactory, PostFactory
+
+def make_jpeg(width: int = 2400, height: int = 1200, orientation: int = 6) -> bytes:
+    """JPEG with an EXIF orientation tag and a GPS-ish tag to be stripped."""
+    img = Image.new("RGB", (width, height), (200, 120, 40))
+    exif = Image.Exif()
+    exif[0x0112] = orientation  # Orientation: rotate 90 CW on display
+    exif[0x010F] = "TestCam"    # Make
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+@pytest.fixture
+def storage(tmp_path):
+    """Local storage rooted in a temp directory."""
+    return LocalStorage(root=str(tmp_path), base_url="/media")
+
+@pytest_asyncio.fixture
+async def image_client(async_client: AsyncClient, storage):
+    """Client whose app stores media in the temp storage."""
+    from main import app
+    app.dependency_overrides[get_storage] = lambda: storage
+    yield async_client
+
+@pytest_asyncio.fixture
+async def author_post(db_session):
+    """A user and one of their posts."""
+    user = UserFactory.create_user(db_session)
+    await db_session.commit()
+    post = PostFactory.create_post(db_session, user)
+    await db_session.commit()
+    return user, post
+
+class TestProcessImage:
+    """Test the worker-side processing."""
+
+    def test_variants_oriented_and_stripped(self, tmp_path):
+        """Variants are rotated per EXIF, bounded by size, and carry no EXIF."""
+        path = tmp_path / "in.jpg"
+        path.write_bytes(make_jpeg())
+
+        variants = process_image(str(path))
+        assert {(v.name, v.extension) for v in variants} == {
+            (name, ext) for name in ("large", "medium", "thumb") for ext in ("webp", "jpg")
+        }
+        large = next(v for v in variants if v.name == "large" and v.extension == "jpg")
+        assert (large.width, large.height) == (800, 1600)  # portrait after orientation 6
+        decoded = Image.open(io.BytesIO(large.data))
+        assert decoded.size == (800, 1600)
+        assert len(decoded.getexif()) == 0
+        thumb = next(v for v in variants if v.name == "thumb")
+        assert max(thumb.width, thumb.height) == 320
+
+    def test_small_images_not_upscaled(self, tmp_path):
+        """Images smaller than a variant keep their size."""
+        path = tmp_path / "small.jpg"
+        path.write_bytes(make_jpeg(200, 100, orientation=1))
+        assert all((v.width, v.height) == (200, 100) for v in process_image(str(path)))
+
+class TestUploadPostImage:
+    """Test POST /posts/{id}/image."""
+
+    @pytest.mark.asyncio
+    async def test_upload_stores_variants(self, image_client: AsyncClient, author_post, storage):
+        """Variants are stored content-addressed and the post points at them."""
+        user, post = author_post
+        headers = UserFactory.get_auth_headers(user.id)
+        files = {"file": ("photo.jpg", make_jpeg(), "image/jpeg")}
+
+        response = await image_client.post(f"/api/v1/posts/{post.id}/image", files=files, headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["image_url"] == data["image_variants"]["large"]["jpg"]["url"]
+
+        stored = [os.path.join(d, f) for d, _, fs in os.walk(storage.root) for f in fs]
+        assert len(stored) == 6
+        key = data["image_variants"]["thumb"]["webp"]["url"].removeprefix("/media/")
+        with open(storage.path(key), "rb") as f:
+            assert content_key(f.read(), "webp") == key
+
+        # Re-uploading identical bytes short-circuits before any processing
+        files = {"file": ("photo.jpg", make_jpeg(), "image/jpeg")}
+        again = await image_client.post(f"/api/v1/posts/{post.id}/image", files=files, headers=headers)
+        assert again.json()["image_variants"] == data["image_variants"]
+
+    @pytest.mark.asyncio
+    async def test_upload_rejects_non_image(self, image_client: AsyncClient, author_post):
+        """Undecodable uploads get a 400."""
+        user, post = author_post
+        files = {"file": ("notes.txt", b"not an image", "text/plain")}
+        response = await image_client.post(
+            f"/api/v1/posts/{post.id}/image", files=files, headers=UserFactory.get_auth_headers(user.id)
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_upload_requires_author(self, image_client: AsyncClient, db_session, author_post):
+        """Only the post's author may attach an image."""
+        _, post = author_post
+        other = UserFactory.create_user(db_session)
+        await db_session.commit()
+        files = {"file": ("photo.jpg", make_jpeg(), "image/jpeg")}
+        response = await image_client.post(
+            f"/api/v1/posts/{post.id}/image", files=files, headers=UserFactory.get_auth_headers(other.id)
+        )
+        assert response.status_code == 403
@@ -0,0 +1,160 @@
+"""
+Unit tests for the background job queue.
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Dict, List
+import pytest
+from sqlalchemy import select, update
+from app.api.v1 import metrics
+from app.core.jobs import JobMetrics, register_task, retry_delay
+from app.crud.jobs import JobWorker, job
+from app.models.job import JOB_DONE, JOB_FAILED, JOB_QUEUED, Job
+
+executed: List[int] = []
+
+@register_task("test_record")
+async def record(db, payload: Dict[str, Any]) -> None:
+    await asyncio.sleep(0.01)
+    executed.append(payload["n"])
+
+@register_task("test_explode", max_attempts=2)
+async def explode(db, payload: Dict[str, Any]) -> None:
+    raise RuntimeError("boom")
+
+@register_task("test_checksum", cpu_bound=True)
+def checksum(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(payload["data"].encode()).hexdigest()
+
+@pytest.fixture(autouse=True)
+def clear_executed():
+    executed.clear()
+    yield
+    executed.clear()
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestJobPolicy:
+    """Test backoff and worker metrics."""
+
+    def test_retry_delay_backoff(self):
+        """Delays double per attempt, are half jittered and capped."""
+        assert [retry_delay(n, base=10, cap=60, rng=lambda: 1.0) for n in range(1, 5)] == [10, 20, 40, 60]
+        assert retry_delay(3, base=10, cap=60, rng=lambda: 0.0) == 20
+
+    def test_metrics_window(self):
+        """Throughput counts only attempts inside the sliding window."""
+        clock = FakeClock()
+        metrics = JobMetrics(window=10, clock=clock)
+        for _ in range(5):
+            clock.now += 1
+            metrics.record("succeeded", 0.5)
+        metrics.record("retried", 1.5)
+        snapshot = metrics.snapshot()
+        assert (snapshot["succeeded"], snapshot["retried"], snapshot["failed"]) == (5, 1, 0)
+        assert snapshot["jobs_per_second"] == pytest.approx(6 / 5)
+        assert snapshot["mean_seconds"] == pytest.approx(4 / 6)
+
+        clock.now += 20
+        assert metrics.snapshot()["jobs_per_second"] == 0
+
+class TestJobQueue:
+    """Test claiming, leases, retries and workers against Postgres."""
+
+    @pytest.mark.asyncio
+    async def test_claim_and_lease(self, db_session):
+        """Claims hand out each ready job once; an expired lease can be re-claimed, fencing the old one."""
+        ids = [await job.enqueue(db_session, task="test_record", payload={"n": n}) for n in range(3)]
+        await job.enqueue(db_session, task="test_record", payload={"n": 9}, delay=3600)
+        await db_session.commit()
+
+        first = await job.claim(db_session, limit=2)
+        second = await job.claim(db_session, limit=2)
+        assert sorted(c.id for c in first + second) == ids
+        assert await job.claim(db_session, limit=2) == []
+
+        await db_session.execute(update(Job).where(Job.id == ids[0]).values(run_at=Job.created_at))
+        await db_session.commit()
+        (reclaimed,) = await job.claim(db_session, limit=1)
+        assert (reclaimed.id, reclaimed.attempt) == (ids[0], 2)
+        stale = next(c for c in first + second if c.id == ids[0])
+        assert await job.complete(db_session, job=stale) is False
+        assert await job.complete(db_session, job=reclaimed) is True
+
+    @pytest.mark.asyncio
+    async def test_retries_until_failed(self, db_session, session_factory):
+        """Failed attempts are requeued with backoff, then failed once out of attempts."""
+        job_id = await job.enqueue(db_session, task="test_explode")
+        unknown_id = await job.enqueue(db_session, task="test_missing")
+        await db_session.commit()
+        worker = JobWorker(session_factory=session_factory, processes=1)
+
+        assert await worker.run_once() == 2
+        row = await db_session.get(Job, job_id)
+        assert (row.status, row.attempts, "boom" in row.last_error) == (JOB_QUEUED, 1, True)
+        assert (await db_session.get(Job, unknown_id)).status == JOB_FAILED
+
+        await db_session.execute(update(Job).where(Job.id == job_id).values(run_at=Job.created_at))
+        await db_session.commit()
+        assert await worker.run_once() == 1
+        db_session.expire_all()
+        row = await db_session.get(Job, job_id)
+        assert (row.status, row.attempts, row.finished_at is not None) == (JOB_FAILED, 2, True)
+        assert worker.metrics.snapshot()["retried"] == 1
+        assert worker.metrics.snapshot()["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workers_run_each_job_once(self, async_client, db_session, session_factory, monkeypatch):
+        """Workers sharing a queue split the jobs; throughput shows up in the token-protected metrics endpoint."""
+        for n in range(20):
+            await job.enqueue(db_session, task="test_record", payload={"n": n})
+        await job.enqueue(db_session, task="test_checksum", payload={"data": "grateful"}, queue="cpu")
+        await db_session.commit()
+
+        workers = [JobWorker(session_factory=session_factory, concurrency=4, processes=1) for _ in range(3)]
+        workers.append(JobWorker(queues=["cpu"], session_factory=session_factory, processes=1))
+        try:
+            await asyncio.gather(*(worker.run_once() for worker in workers))
+        finally:
+            for worker in workers:
+                worker.shutdown()
+        assert sorted(executed) == list(range(20))
+        statuses = (await db_session.execute(select(Job.status))).scalars().all()
+        assert statuses == [JOB_DONE] * 21
+
+        url = "/api/v1/metrics/jobs"
+        assert (await async_client.get(url)).status_code == 404
+        monkeypatch.setattr(metrics, "METRICS_TOKEN", "scraper-secret")
+        assert (await async_client.get(url, headers={"Authorization": "Bearer guess"})).status_code == 401
+        response = await async_client.get(url, headers={"Authorization": "Bearer scraper-secret"})
+        assert response.status_code == 200
+        stats = response.json()
+        assert (stats["default"]["done"], stats["default"]["queued"], stats["cpu"]["done"]) == (20, 0, 1)
+
+    @pytest.mark.asyncio
+    async def test_worker_loop_stops(self, db_session, session_factory):
+        """The long-running loop picks up new jobs and returns after stop()."""
+        worker = JobWorker(session_factory=session_factory, poll_seconds=0.05)
+        running = asyncio.create_task(worker.run())
+        await job.enqueue(db_session, task="test_record", payload={"n": 1})
+        await db_session.commit()
+        for _ in range(100):
+            if executed:
+                break
+            await asyncio.sleep(0.05)
+        worker.stop()
+        await asyncio.wait_for(running, timeout=5)
+        assert executed == [1]
+
+    def test_api_process_registers_tasks(self):
+        """The API process imports the task registry, so enqueue sees each task's attempt limit."""
+        import main  # noqa: F401
+        from app.core.jobs import JOB_TASKS
+
+        assert "purge_accounts" in JOB_TASKS
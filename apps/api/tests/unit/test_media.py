@@ -0,0 +1,100 @@
+"""
+Unit tests for media serving and the LRU media cache.
+"""
+
+import os
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from app.core.media_cache import MediaCache
+from app.core.storage import LocalStorage, get_storage
+
+BLOB = bytes(range(256)) * 8
+
+class RemoteStorage(LocalStorage):
+    """Origin that cannot be served from local disk, like a cloud bucket."""
+
+    def local_path(self, key):
+        return None
+
+@pytest_asyncio.fixture
+async def media_client(tmp_path):
+    """Client for the main app with media stored under tmp_path."""
+    from main import app
+    storage = LocalStorage(root=str(tmp_path / "origin"))
+    app.dependency_overrides[get_storage] = lambda: storage
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client, storage
+    app.dependency_overrides.clear()
+
+class TestMediaEndpoint:
+    """Test GET /media/{key}."""
+
+    @pytest.mark.asyncio
+    async def test_serves_with_immutable_caching(self, media_client):
+        """Full responses carry the content hash as ETag and immutable cache headers."""
+        client, storage = media_client
+        key = await storage.store(BLOB, "webp", "image/webp")
+
+        response = await client.get(f"/api/v1/media/{key}")
+        assert response.status_code == 200
+        assert response.content == BLOB
+        assert response.headers["content-type"] == "image/webp"
+        assert "immutable" in response.headers["cache-control"]
+        assert response.headers["etag"] == f'"{key.rsplit("/", 1)[1][:64]}"'
+
+        response = await client.get(f"/api/v1/media/{key}", headers={"If-None-Match": response.headers["etag"]})
+        assert response.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_range_request(self, media_client):
+        """Range requests get 206 with the requested slice."""
+        client, storage = media_client
+        key = await storage.store(BLOB, "jpg", "image/jpeg")
+
+        response = await client.get(f"/api/v1/media/{key}", headers={"Range": "bytes=10-19"})
+        assert response.status_code == 206
+        assert response.content == BLOB[10:20]
+        assert response.headers["content-range"] == f"bytes 10-19/{len(BLOB)}"
+
+    @pytest.mark.asyncio
+    async def test_rejects_bad_and_missing_keys(self, media_client, tmp_path):
+        """Only well-formed content keys are looked up."""
+        client, storage = media_client
+        os.makedirs(storage.root, exist_ok=True)
+        (tmp_path / "secret.jpg").write_bytes(BLOB)
+        # Percent-encoded so httpx sends the dot segment instead of normalising it away
+        assert (await client.get("/api/v1/media/%2e%2e/secret.jpg")).status_code == 404
+        missing = "ab/cd/" + "ab" * 32 + ".jpg"
+        assert (await client.get(f"/api/v1/media/{missing}")).status_code == 404
+
+class TestMediaCache:
+    """Test cache fill and LRU eviction."""
+
+    @pytest.mark.asyncio
+    async def test_fills_from_origin_and_evicts_lru(self, tmp_path):
+        """Least recently used files are evicted once the quota is exceeded."""
+        origin = RemoteStorage(root=str(tmp_path / "origin"))
+        keys = [await origin.store(bytes([i]) * 100, "webp", "image/webp") for i in range(3)]
+        cache = MediaCache(origin, root=str(tmp_path / "cache"), max_bytes=250)
+
+        a = await cache.get_path(keys[0])
+        b = await cache.get_path(keys[1])
+        await cache.get_path(keys[0])  # a is now more recent than b
+        await cache.get_path(keys[2])
+
+        assert os.path.exists(a)
+        assert not os.path.exists(b)
+        assert cache.total_bytes == 200
+        assert await cache.get_path("00/00/" + "0" * 64 + ".jpg") is None
+
+    @pytest.mark.asyncio
+    async def test_index_rebuilt_from_disk(self, tmp_path):
+        """A new cache instance picks up files already on disk."""
+        origin = RemoteStorage(root=str(tmp_path / "origin"))
+        key = await origin.store(BLOB, "jpg", "image/jpeg")
+        await MediaCache(origin, root=str(tmp_path / "cache")).get_path(key)
+
+        cache = MediaCache(origin, root=str(tmp_path / "cache"))
+        assert cache.total_bytes == len(BLOB)
@@ -0,0 +1,80 @@
+"""
+Unit tests for mentions and username autocomplete.
+"""
+
+import pytest
+from sqlalchemy import select
+from app.core.mentions import UsernameTrie, extract_mentions
+from app.crud.interaction import comment as crud_comment
+from app.crud.mentions import username_index
+from app.crud.post import post as crud_post
+from app.models.notification import Notification
+from app.schemas.post import PostCreate
+from tests.utils.factories import UserFactory
+
+@pytest.fixture(autouse=True)
+def fresh_username_index():
+    """Each test loads the index from its own database."""
+    username_index.reset()
+    yield
+    username_index.reset()
+
+class TestMentionParsing:
+    """Test mention extraction and the username trie."""
+
+    def test_extract_mentions(self):
+        """Distinct handles in order; emails and doubled @ are ignored."""
+        text = "Thanks @alice and @bob_2! cc @alice, mail me at carol@example.com @@dave"
+        assert extract_mentions(text) == ["alice", "bob_2"]
+        assert extract_mentions("") == []
+
+    def test_trie_completion(self):
+        """Prefix lookups are case-insensitive, shortest first; removal prunes."""
+        trie = UsernameTrie()
+        for user_id, username in enumerate(["alice", "Alicia", "al", "bob", "alfred"]):
+            trie.insert(username, user_id)
+        assert trie.complete("AL") == [("al", 2), ("alice", 0), ("alfred", 4), ("Alicia", 1)]
+        assert trie.complete("ali", limit=1) == [("alice", 0)]
+        trie.remove("alice")
+        trie.remove("missing")
+        assert trie.complete("alic") == [("Alicia", 1)]
+        assert len(trie) == 4
+
+class TestMentionNotifications:
+    """Test the mention pipeline and autocomplete endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_post_and_comment_mentions(self, db_session):
+        """Mentioned users (not the author, not unknown handles) get one notification each, whatever the case."""
+        author = UserFactory.create_user(db_session, username="writer")
+        friend = UserFactory.create_user(db_session, username="friend")
+        await db_session.commit()
+
+        post = await crud_post.create_with_author(
+            db_session, obj_in=PostCreate(content="Hiking with @Friend and @FRIEND, hi @writer @ghost"), author_id=author.id
+        )
+        await crud_comment.create_comment(db_session, author_id=friend.id, post_id=post.id, content="@writer thank you!")
+
+        notifications = (await db_session.execute(select(Notification).order_by(Notification.user_id))).scalars().all()
+        assert [(n.user_id, n.type, n.message) for n in notifications] == [
+            (author.id, "mention", "@friend mentioned you in a comment"),
+            (friend.id, "mention", "@writer mentioned you in a post"),
+        ]
+        assert notifications[1].data["post_id"] == post.id
+
+    @pytest.mark.asyncio
+    async def test_autocomplete_endpoint(self, async_client, db_session):
+        """The index loads from the database and picks up new signups."""
+        UserFactory.create_user(db_session, username="sunny")
+        await db_session.commit()
+        response = await async_client.get("/api/v1/users/autocomplete?q=@SUN")
+        assert [u["username"] for u in response.json()] == ["sunny"]
+
+        signup = await async_client.post(
+            "/api/v1/auth/signup", json={"email": "sun@example.com", "username": "sunflower", "password": "password123"}
+        )
+        assert signup.status_code == 201
+        response = await async_client.get("/api/v1/users/autocomplete?q=sun")
+        assert [u["username"] for u in response.json()] == ["sunny", "sunflower"]
+        # A bare "@" would be an empty prefix matching everyone
+        assert (await async_client.get("/api/v1/users/autocomplete?q=@")).status_code == 422
@@ -0,0 +1,114 @@
+"""
+Unit tests for the transactional outbox and its relay.
+"""
+
+from typing import List, Tuple
+import pytest
+from sqlalchemy import select
+from app.core.outbox import subscribe
+from app.crud.interaction import comment as crud_comment, follow as crud_follow, like as crud_like
+from app.crud.outbox import OUTBOX_MAX_ATTEMPTS, TRY_RELAY_LOCK, OUTBOX_LOCK_KEY, OutboxRelay, outbox
+from app.crud.post import post as crud_post
+from app.models.notification import Notification
+from app.models.outbox import OutboxEvent
+from app.schemas.post import PostCreate
+from tests.utils.factories import UserFactory
+import app.crud.event_notifications  # noqa: F401  Registers the notification subscribers
+
+received: List[Tuple[str, int]] = []
+
+@subscribe("test.event")
+async def record(db, event) -> None:
+    if event.payload.get("fail"):
+        raise RuntimeError("subscriber down")
+    received.append((event.aggregate_id, event.payload["n"]))
+
+@pytest.fixture(autouse=True)
+def clear_received():
+    received.clear()
+    yield
+    received.clear()
+
+async def pending_events(db_session) -> List[OutboxEvent]:
+    return (await db_session.execute(select(OutboxEvent).order_by(OutboxEvent.id))).scalars().all()
+
+async def emit_events(db_session) -> None:
+    """Two aggregates; the first event of "a" always fails."""
+    for aggregate_id, n, fail in [("a", 1, True), ("b", 1, False), ("a", 2, False), ("b", 2, False), ("a", 3, False)]:
+        await outbox.emit(
+            db_session, aggregate_type="test", aggregate_id=aggregate_id, event_type="test.event",
+            payload={"n": n, "fail": fail},
+        )
+    await db_session.commit()
+
+class TestOutbox:
+    """Test event emission from CRUD writes and relay delivery."""
+
+    @pytest.mark.asyncio
+    async def test_writes_emit_events_delivered_as_notifications(self, db_session, session_factory):
+        """Likes, comments and follows each add one event; the relay turns them into notifications."""
+        author = UserFactory.create_user(db_session, username="author")
+        fan = UserFactory.create_user(db_session, username="fan")
+        await db_session.commit()
+        author_id = author.id
+        post = await crud_post.create_with_author(db_session, obj_in=PostCreate(content="Grateful"), author_id=author.id)
+        await crud_like.create_like(db_session, user_id=fan.id, post_id=post.id)
+        await crud_like.create_like(db_session, user_id=author.id, post_id=post.id)
+        await crud_comment.create_comment(db_session, author_id=fan.id, post_id=post.id, content="Lovely")
+        await crud_follow.create_follow(db_session, follower_id=fan.id, followed_id=author.id)
+
+        events = await pending_events(db_session)
+        assert [event.event_type for event in events] == [
+            "post.published", "like.created", "like.created", "comment.created", "follow.created",
+        ]
+        assert (events[1].aggregate_type, events[1].aggregate_id) == ("post", post.id)
+
+        assert await OutboxRelay(session_factory=session_factory).run_once() == 5
+        db_session.expire_all()
+        assert await pending_events(db_session) == []
+        notifications = (await db_session.execute(
+            select(Notification.type, Notification.message).where(Notification.user_id == author_id)
+        )).all()
+        assert sorted(notifications) == [
+            ("comment", "@fan commented on your post"),
+            ("follow", "@fan started following you"),
+            ("like", "@fan liked your post"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_write_emits_nothing(self, db_session):
+        """Events share the write's transaction."""
+        await outbox.emit(db_session, aggregate_type="test", aggregate_id="a", event_type="test.event", payload={"n": 1})
+        await db_session.rollback()
+        assert await pending_events(db_session) == []
+
+    @pytest.mark.asyncio
+    async def test_failures_block_only_their_aggregate(self, db_session, session_factory):
+        """A failing event holds back later events of its aggregate, then is set aside."""
+        await emit_events(db_session)
+        relay = OutboxRelay(session_factory=session_factory)
+
+        assert await relay.run_once() == 2
+        assert received == [("b", 1), ("b", 2)]
+        failing = (await pending_events(db_session))[0]
+        assert (failing.aggregate_id, failing.attempts, failing.failed_at) == ("a", 1, None)
+
+        # The last failed attempt sets the event aside; the run after it delivers the rest
+        for _ in range(OUTBOX_MAX_ATTEMPTS):
+            await relay.run_once()
+        db_session.expire_all()
+        (dead,) = await pending_events(db_session)
+        assert dead.failed_at is not None and "subscriber down" in dead.last_error
+        assert received[2:] == [("a", 2), ("a", 3)]
+
+    @pytest.mark.asyncio
+    async def test_one_relay_at_a_time(self, db_session, session_factory):
+        """A relay that can't take the advisory lock leaves the batch to the one that has it."""
+        await outbox.emit(db_session, aggregate_type="test", aggregate_id="a", event_type="test.event", payload={"n": 1})
+        await db_session.commit()
+        async with session_factory() as other:
+            assert await other.scalar(TRY_RELAY_LOCK, {"lock_key": OUTBOX_LOCK_KEY})
+            assert await outbox.relay_batch(db_session) is None
+            await other.rollback()
+        assert await outbox.relay_batch(db_session) == 1
+        assert received == [("a", 1)]
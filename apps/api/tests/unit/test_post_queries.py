@@ -0,0 +1,102 @@
+"""
+Unit tests for CRUDPost read queries.
+"""
+
+from typing import List
+import pytest
+import pytest_asyncio
+from pydantic import TypeAdapter
+from app.crud.post import post as crud_post
+from app.models.interaction import Comment, Follow, Like
+from app.models.post import PostType
+from app.schemas.post import FeedPostOut
+from tests.utils.factories import PostFactory, UserFactory
+
+FEED_ADAPTER = TypeAdapter(List[FeedPostOut])
+
+def model_list(posts) -> List[FeedPostOut]:
+    return FEED_ADAPTER.validate_python(posts, from_attributes=True)
+
+@pytest_asyncio.fixture
+async def social_graph(db_session):
+    """Viewer follows `followed`; `stranger` is followed by nobody. Each has one post."""
+    viewer, followed, stranger = (UserFactory.create_user(db_session) for _ in range(3))
+    await db_session.flush()
+    db_session.add(Follow(follower_id=viewer.id, followed_id=followed.id))
+    # Someone else's follow must not leak into the viewer's feed
+    db_session.add(Follow(follower_id=followed.id, followed_id=stranger.id))
+    own = PostFactory.create_post(db_session, viewer, content="sunrise walk")
+    theirs = PostFactory.create_post(db_session, followed, post_type=PostType.PHOTO)
+    other = PostFactory.create_post(db_session, stranger)
+    await db_session.flush()
+    db_session.add(Like(user_id=viewer.id, post_id=theirs.id))
+    db_session.add(Comment(author_id=stranger.id, post_id=theirs.id, content="lovely"))
+    await db_session.commit()
+    return viewer, own, theirs, other
+
+class TestPostQueries:
+    """Test the prebuilt CRUDPost statements."""
+
+    @pytest.mark.asyncio
+    async def test_feed_has_own_and_followed_posts(self, db_session, social_graph):
+        """The feed contains the viewer's and followed users' posts, with counts and like status."""
+        viewer, own, theirs, other = social_graph
+        feed = await crud_post.get_user_feed(db_session, user_id=viewer.id)
+
+        assert {p.id for p in feed} == {own.id, theirs.id}
+        by_id = {p.id: p for p in feed}
+        assert (by_id[theirs.id].likes_count, by_id[theirs.id].comments_count, by_id[theirs.id].is_liked) == (1, 1, True)
+        assert (by_id[own.id].likes_count, by_id[own.id].is_liked) == (0, False)
+
+    @pytest.mark.asyncio
+    async def test_paging_search_and_type(self, db_session, social_graph):
+        """Offset/limit, search and type filters bind correctly."""
+        viewer, own, theirs, other = social_graph
+
+        page = await crud_post.get_multi_with_author(db_session, skip=1, limit=1)
+        assert len(page) == 1
+        assert [p.id for p in await crud_post.search_posts(db_session, query="SUNRISE")] == [own.id]
+        assert [p.id for p in await crud_post.get_by_type(db_session, post_type=PostType.PHOTO)] == [theirs.id]
+
+        post = await crud_post.get_with_author(db_session, post_id=theirs.id, current_user_id=viewer.id)
+        assert post.author.id == theirs.author_id
+        assert (post.likes_count, post.is_liked) == (1, True)
+
+class TestSingleShotFeed:
+    """Test the single-query JSON feed pages against the ORM path."""
+
+    @pytest.mark.asyncio
+    async def test_json_page_matches_orm_page(self, db_session, social_graph):
+        """The database-built page has the same posts, counts and flags as the ORM path."""
+        viewer, own, theirs, other = social_graph
+        orm_page = model_list(await crud_post.get_user_feed(db_session, user_id=viewer.id))
+        json_page = FEED_ADAPTER.validate_json(await crud_post.get_user_feed_json(db_session, user_id=viewer.id))
+        assert json_page == orm_page
+
+        public = FEED_ADAPTER.validate_json(
+            await crud_post.get_multi_with_author_json(db_session, viewer_id=viewer.id, skip=0, limit=10)
+        )
+        assert {p.id for p in public} == {own.id, theirs.id, other.id}
+        assert [p.is_liked for p in public if p.id == theirs.id] == [True]
+
+    @pytest.mark.asyncio
+    async def test_empty_page_is_empty_array(self, db_session, social_graph):
+        """Pages past the end are `[]`, not null."""
+        viewer = social_graph[0]
+        assert await crud_post.get_user_feed_json(db_session, user_id=viewer.id, skip=50) == "[]"
+
+    @pytest.mark.asyncio
+    async def test_feed_endpoint(self, async_client, social_graph):
+        """GET /posts/feed returns the viewer's page; anonymous callers are rejected."""
+        viewer, own, theirs, other = social_graph
+        response = await async_client.get("/api/v1/posts/feed", headers=UserFactory.get_auth_headers(viewer.id))
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        page = {p["id"]: p for p in response.json()}
+        assert set(page) == {theirs.id, own.id}
+        assert page[theirs.id]["author"]["id"] == theirs.author_id
+        assert page[theirs.id]["post_type"] == "photo"
+        assert page[theirs.id]["is_liked"] is True
+
+        assert (await async_client.get("/api/v1/posts/feed")).status_code == 401
+        assert len((await async_client.get("/api/v1/posts?limit=2")).json()) == 2
@@ -0,0 +1,99 @@
+"""
+Unit tests for the feed ranking engine and post_features maintenance.
+"""
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from app.core.ranking import FeatureBatch, PRDScorer, SCORERS, rank, register_scorer, top_k
+from app.crud.post_features import post_features
+from app.models.post import PostType
+from app.models.post_features import PostFeatures
+from tests.utils.factories import PostFactory, UserFactory
+
+def make_batch(**columns) -> FeatureBatch:
+    """Batch of len(post_ids) posts, features defaulting to zero."""
+    post_ids = columns.pop("post_ids")
+    fields = {name: np.zeros(len(post_ids)) for name in FeatureBatch._fields[1:]}
+    fields.update({name: np.asarray(values, dtype=np.float64) for name, values in columns.items()})
+    return FeatureBatch(post_ids, **fields)
+
+class TestScoring:
+    """Test the PRD scorer and top-K selection."""
+
+    def test_prd_formula(self):
+        """Engagement weights, bonuses, recency decay and the spontaneous modifier."""
+        batch = make_batch(
+            post_ids=["a", "b", "c"],
+            hearts=[3, 0, 0],
+            comments=[1, 0, 0],
+            has_image=[1, 0, 0],
+            is_daily=[0, 1, 0],
+            is_spontaneous=[0, 0, 1],
+            in_network=[1, 0, 0],
+            age_hours=[24, 0, 48],
+        )
+        scores = PRDScorer()(batch)
+        np.testing.assert_allclose(scores, [3 + 2 + 2.5 + 5 + 10 * 0.5, 3 + 10, 0.5 * 10 * 0.25])
+
+    def test_top_k(self):
+        """top_k returns the best k, best first."""
+        scores = np.array([1.0, 5.0, 3.0, 4.0])
+        assert top_k(["a", "b", "c", "d"], scores, 2) == [("b", 5.0), ("d", 4.0)]
+        assert rank(make_batch(post_ids=[]), 10) == []
+
+    def test_pluggable_scorer(self):
+        """A registered scorer can be used in place of the PRD one."""
+        register_scorer("oldest", lambda batch: batch.age_hours)
+        try:
+            batch = make_batch(post_ids=["new", "old"], age_hours=[1, 100])
+            assert [post_id for post_id, _ in rank(batch, 1, SCORERS["oldest"])] == ["old"]
+        finally:
+            del SCORERS["oldest"]
+
+class TestPostFeatures:
+    """Test feature maintenance and the ranked feed."""
+
+    @pytest.mark.asyncio
+    async def test_counts_follow_interactions(self, async_client, db_session):
+        """Likes adjust the post's feature row in the same transaction."""
+        author, fan = UserFactory.create_user(db_session), UserFactory.create_user(db_session)
+        await db_session.flush()
+        post = PostFactory.create_post(db_session, author, post_type=PostType.DAILY)
+        await db_session.flush()
+        await post_features.refresh(db_session)
+        await db_session.commit()
+
+        headers = UserFactory.get_auth_headers(fan.id)
+        assert (await async_client.post(f"/api/v1/posts/{post.id}/like", headers=headers)).status_code == 201
+        row = await db_session.scalar(
+            select(PostFeatures).where(PostFeatures.post_id == post.id).execution_options(populate_existing=True)
+        )
+        assert (row.hearts, row.is_daily, row.has_image) == (1, True, False)
+
+        assert (await async_client.delete(f"/api/v1/posts/{post.id}/like", headers=headers)).status_code == 204
+        await db_session.refresh(row)
+        assert row.hearts == 0
+
+    @pytest.mark.asyncio
+    async def test_ranked_feed(self, async_client, db_session):
+        """mode=ranked orders posts by score rather than recency."""
+        viewer, friend, stranger = (UserFactory.create_user(db_session) for _ in range(3))
+        await db_session.flush()
+        plain = PostFactory.create_post(db_session, stranger)
+        spontaneous = PostFactory.create_post(db_session, stranger, post_type=PostType.SPONTANEOUS)
+        loved = PostFactory.create_post(db_session, friend, post_type=PostType.DAILY)
+        await db_session.flush()
+        await post_features.refresh(db_session)
+        await post_features.adjust_counts(db_session, post_id=loved.id, hearts=5)
+        await db_session.commit()
+
+        ids = await post_features.ranked_feed_ids(db_session, viewer_id=viewer.id)
+        assert ids == [loved.id, plain.id, spontaneous.id]
+
+        response = await async_client.get(
+            "/api/v1/posts/feed?mode=ranked&limit=2", headers=UserFactory.get_auth_headers(viewer.id)
+        )
+        assert response.status_code == 200
+        assert [p["id"] for p in response.json()] == [loved.id, plain.id]
+        assert response.json()[0]["post_type"] == "daily"
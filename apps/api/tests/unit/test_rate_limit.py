@@ -0,0 +1,141 @@
+"""
+Unit tests for token-bucket rate limiting.
+"""
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from app.core.rate_limit import DatabaseBackend, INTERACTIONS, InMemoryBackend, RateLimit
+from tests.utils.factories import PostFactory, UserFactory
+
+LIMIT = RateLimit("test", 3, 60)
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest_asyncio.fixture
+async def user_and_post(db_session):
+    """A user with one post."""
+    user = UserFactory.create_user(db_session)
+    await db_session.flush()
+    post = PostFactory.create_post(db_session, user)
+    await db_session.commit()
+    return user, post
+
+class TestInMemoryBackend:
+    """Test the process-local token bucket store."""
+
+    @pytest.mark.asyncio
+    async def test_exhausts_and_refills(self):
+        """Requests beyond capacity are denied until tokens refill."""
+        clock = FakeClock()
+        backend = InMemoryBackend(clock=clock)
+
+        results = [await backend.consume("k", LIMIT) for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[2].remaining == 0
+        assert results[3].retry_after == pytest.approx(20.0)
+
+        clock.now += 20
+        assert (await backend.consume("k", LIMIT)).allowed is True
+        assert (await backend.consume("k", LIMIT)).allowed is False
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent_and_resettable(self):
+        """Each key has its own bucket; reset restores full capacity."""
+        backend = InMemoryBackend(clock=FakeClock())
+        for _ in range(3):
+            await backend.consume("a", LIMIT)
+        assert (await backend.consume("a", LIMIT)).allowed is False
+        assert (await backend.consume("b", LIMIT)).allowed is True
+
+        await backend.reset("a")
+        assert (await backend.consume("a", LIMIT)).remaining == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_keys_expire(self):
+        """Buckets disappear once they have refilled, and shards stay within their key cap."""
+        clock = FakeClock()
+        backend = InMemoryBackend(shards=1, max_keys_per_shard=10, clock=clock)
+        for i in range(25):
+            await backend.consume(f"user:{i}", LIMIT)
+        assert len(backend) == 10
+
+        clock.now += LIMIT.period
+        await backend.consume("fresh", LIMIT)
+        assert len(backend) == 1
+
+class TestDatabaseBackend:
+    """Test the Postgres-backed shared store."""
+
+    @pytest.mark.asyncio
+    async def test_shared_bucket(self, session_factory, test_db_setup):
+        """Two backends on the same database share one bucket per key."""
+        first, second = DatabaseBackend(session_factory), DatabaseBackend(session_factory)
+
+        assert (await first.consume("k", LIMIT)).remaining == 2
+        assert (await second.consume("k", LIMIT)).remaining == 1
+        assert (await first.consume("k", LIMIT)).allowed is True
+        denied = await second.consume("k", LIMIT)
+        assert denied.allowed is False
+        assert denied.retry_after > 0
+
+        await first.reset("k")
+        assert (await second.consume("k", LIMIT)).remaining == 2
+
+class TestRateLimitedEndpoints:
+    """Test limits applied to the API."""
+
+    @pytest.mark.asyncio
+    async def test_login_locks_after_failed_attempts(self, async_client: AsyncClient, db_session):
+        """Five wrong passwords lock the account, even against the right password."""
+        user = UserFactory.create_user(db_session)
+        await db_session.commit()
+        credentials = {"email": user.email, "password": "wrongpassword"}
+
+        for _ in range(5):
+            response = await async_client.post("/api/v1/auth/login", json=credentials)
+            assert response.status_code == 401
+
+        response = await async_client.post("/api/v1/auth/login", json={**credentials, "password": "testpassword123"})
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) > 0
+
+    @pytest.mark.asyncio
+    async def test_successful_login_clears_failures(self, async_client: AsyncClient, db_session):
+        """A correct password resets the failure count."""
+        user = UserFactory.create_user(db_session)
+        await db_session.commit()
+
+        for _ in range(4):
+            await async_client.post("/api/v1/auth/login", json={"email": user.email, "password": "wrongpassword"})
+        response = await async_client.post("/api/v1/auth/login", json={"email": user.email, "password": "testpassword123"})
+        assert response.status_code == 200
+
+        for _ in range(4):
+            response = await async_client.post("/api/v1/auth/login", json={"email": user.email, "password": "wrongpassword"})
+            assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_like_is_rate_limited(self, async_client: AsyncClient, user_and_post, rate_limiter):
+        """Likes spend the per-user interaction budget."""
+        user, post = user_and_post
+        headers = UserFactory.get_auth_headers(user.id)
+
+        response = await async_client.post(f"/api/v1/posts/{post.id}/like", headers=headers)
+        assert response.status_code == 201
+        assert response.headers["x-ratelimit-remaining"] == str(INTERACTIONS.capacity - 1)
+
+        response = await async_client.post(f"/api/v1/posts/{post.id}/like", headers=headers)
+        assert response.status_code == 409
+
+        for _ in range(INTERACTIONS.capacity):
+            await rate_limiter.consume(f"{INTERACTIONS.name}:user:{user.id}", INTERACTIONS)
+        response = await async_client.delete(f"/api/v1/posts/{post.id}/like", headers=headers)
+        assert response.status_code == 429
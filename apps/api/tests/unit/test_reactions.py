@@ -0,0 +1,80 @@
+"""
+Unit tests for emoji reactions.
+"""
+
+import pytest
+from sqlalchemy import select
+from app.crud.account_purge import purge_pending_accounts, request_account_purge
+from app.crud.reactions import reaction as crud_reaction
+from app.models.reaction import EMOJI_CODES, PostReactionCounts, Reaction
+from tests.utils.factories import PostFactory, UserFactory
+
+async def setup_post(db_session, reactors: int = 3):
+    author = UserFactory.create_user(db_session)
+    users = [UserFactory.create_user(db_session) for _ in range(reactors)]
+    await db_session.flush()
+    post = PostFactory.create_post(db_session, author)
+    await db_session.commit()
+    return post, users
+
+class TestReactions:
+    """Test reaction writes, histograms and the reaction viewer."""
+
+    @pytest.mark.asyncio
+    async def test_react_change_and_remove(self, async_client, db_session):
+        """One reaction per user per post; changing it moves the count between emojis."""
+        post, (user, other, _) = await setup_post(db_session)
+        headers = UserFactory.get_auth_headers(user.id)
+        url = f"/api/v1/posts/{post.id}/reactions"
+
+        response = await async_client.put(url, headers=headers, json={"emoji": "🙏"})
+        assert response.status_code == 200
+        assert (response.json()["total"], response.json()["counts"]["🙏"], response.json()["viewer_reaction"]) == (1, 1, "🙏")
+
+        await async_client.put(url, headers=UserFactory.get_auth_headers(other.id), json={"emoji": "🙏"})
+        summary = (await async_client.put(url, headers=headers, json={"emoji": "🔥"})).json()
+        assert (summary["total"], summary["counts"]["🙏"], summary["counts"]["🔥"]) == (2, 1, 1)
+        assert list(summary["counts"]) == ["😍", "🤗", "🙏", "💪", "🌟", "🔥", "🥰", "👏"]
+
+        anonymous = (await async_client.get(f"{url}/summary")).json()
+        assert (anonymous["total"], anonymous["viewer_reaction"]) == (2, None)
+
+        assert (await async_client.delete(url, headers=headers)).status_code == 204
+        assert (await async_client.delete(url, headers=headers)).status_code == 404
+        assert (await async_client.get(f"{url}/summary")).json()["counts"]["🔥"] == 0
+        assert (await async_client.put(url, headers=headers, json={"emoji": "👎"})).status_code == 422
+        assert (await async_client.get("/api/v1/posts/missing/reactions/summary")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_reactor_pages(self, async_client, db_session):
+        """The viewer list pages by keyset without gaps or repeats."""
+        post, users = await setup_post(db_session, reactors=5)
+        for code, user in enumerate(users):
+            await crud_reaction.set_reaction(db_session, user_id=user.id, post_id=post.id, code=code)
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = (await async_client.get(f"/api/v1/posts/{post.id}/reactions", params=params)).json()
+            seen += [(item["user"]["id"], item["emoji"]) for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert sorted(seen) == sorted((user.id, emoji) for user, emoji in zip(users, "😍🤗🙏💪🌟"))
+        assert (await async_client.get(f"/api/v1/posts/{post.id}/reactions?cursor=bogus")).status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_account_purge_keeps_histograms_exact(self, db_session):
+        """Purging a user removes their reactions and decrements the reacted posts' counts."""
+        post, (leaving, staying, _) = await setup_post(db_session)
+        for user in (leaving, staying):
+            await crud_reaction.set_reaction(db_session, user_id=user.id, post_id=post.id, code=EMOJI_CODES["🌟"])
+
+        await request_account_purge(db_session, user_id=leaving.id)
+        await purge_pending_accounts(db_session)
+
+        counts = await db_session.scalar(
+            select(PostReactionCounts).where(PostReactionCounts.post_id == post.id).execution_options(populate_existing=True)
+        )
+        assert (counts.total, counts.count_4) == (1, 1)
+        assert await db_session.scalar(select(Reaction.user_id)) == staying.id
@@ -0,0 +1,59 @@
+"""
+Unit tests for listing read models.
+"""
+
+from typing import List
+import pytest
+import pytest_asyncio
+from pydantic import TypeAdapter
+from sqlalchemy.dialects import postgresql
+from app.crud.post import post as crud_post
+from app.crud.read_models import PUBLIC_POST_ROWS, USER_POST_ROWS, PostRow, post_rows
+from app.models.interaction import Comment, Like
+from app.schemas.post import PostOut
+from tests.utils.factories import PostFactory, UserFactory
+
+POST_LIST = TypeAdapter(List[PostOut])
+
+@pytest_asyncio.fixture
+async def author_posts(db_session):
+    """An author with three posts (one private) and some interactions."""
+    author, fan = UserFactory.create_user(db_session), UserFactory.create_user(db_session)
+    await db_session.flush()
+    posts = [PostFactory.create_post(db_session, author) for _ in range(2)]
+    PostFactory.create_post(db_session, author, is_public=False)
+    await db_session.flush()
+    db_session.add(Like(user_id=fan.id, post_id=posts[0].id))
+    db_session.add(Comment(author_id=fan.id, post_id=posts[0].id, content="so true"))
+    db_session.add(Comment(author_id=author.id, post_id=posts[0].id, content="thanks"))
+    await db_session.commit()
+    return author, posts
+
+class TestPostReadModel:
+    """Test PostRow pages."""
+
+    @pytest.mark.asyncio
+    async def test_rows_match_orm_listing(self, db_session, author_posts):
+        """Read-model pages serialize exactly like the ORM path."""
+        author, posts = author_posts
+        orm_page = POST_LIST.validate_python(
+            await crud_post.get_user_posts(db_session, user_id=author.id), from_attributes=True
+        )
+        db_session.expunge_all()
+
+        rows = await post_rows.get_user_posts(db_session, user_id=author.id)
+        assert all(isinstance(row, PostRow) for row in rows)
+        assert sorted(POST_LIST.validate_python(rows, from_attributes=True), key=lambda p: p.id) == sorted(orm_page, key=lambda p: p.id)
+        assert {(row.id, row.likes_count, row.comments_count) for row in rows} == {(posts[0].id, 1, 2), (posts[1].id, 0, 0)}
+        assert len(await post_rows.get_public_posts(db_session, skip=0, limit=1)) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_identity_map_or_sensitive_columns(self, db_session, author_posts):
+        """Rows bypass the session's identity map and never select password hashes."""
+        author, _ = author_posts
+        db_session.expunge_all()
+        await post_rows.get_user_posts(db_session, user_id=author.id)
+        assert len(db_session.identity_map) == 0
+
+        for statement in (PUBLIC_POST_ROWS, USER_POST_ROWS):
+            assert "hashed_password" not in str(statement.compile(dialect=postgresql.dialect()))
@@ -0,0 +1,132 @@
+"""
+Unit tests for read-replica routing (SQLite files stand in for the primary and replicas).
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.database import LazyAsyncSession
+from app.core.replicas import ReplicaRouter, RoutingSession
+from app.models.user import User
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+async def make_database(path, name):
+    """SQLite database with a users table holding user 1 named `name`."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(User.__table__.create)
+        await conn.execute(insert(User).values(id=1, email=f"{name}@example.com", username=name, hashed_password="x"))
+    return engine
+
+@pytest_asyncio.fixture
+async def databases(tmp_path):
+    """Primary and two replicas whose user 1 has a different name in each."""
+    engines = [await make_database(tmp_path / f"{name}.db", name) for name in ("primary", "replica1", "replica2")]
+    yield engines
+    for engine in engines:
+        await engine.dispose()
+
+def make_router(databases, **kwargs):
+    primary, *replicas = databases
+
+    async def no_lag(conn):
+        return 0.0
+
+    kwargs.setdefault("lag_probe", no_lag)
+    return ReplicaRouter(primary, replicas, **kwargs)
+
+def make_factory(router):
+    return async_sessionmaker(class_=LazyAsyncSession, sync_session_class=RoutingSession, router=router, expire_on_commit=False)
+
+async def read_username(factory, user_id=None):
+    """Username of user 1 as seen through a replica-eligible read in a fresh session."""
+    async with factory() as session:
+        session.info["user_id"] = user_id
+        return (await User.get_by_id(session, 1)).username
+
+class TestReplicaRouting:
+    """Test which engine serves each statement."""
+
+    @pytest.mark.asyncio
+    async def test_primary_until_replicas_checked(self, databases):
+        """Replicas are not trusted before the first health check."""
+        router = make_router(databases)
+        assert await read_username(make_factory(router)) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_marked_reads_round_robin_across_replicas(self, databases):
+        """@replica_read methods alternate replicas; unmarked reads stay on the primary."""
+        router = make_router(databases)
+        await router.maybe_check_health()
+        factory = make_factory(router)
+
+        assert [await read_username(factory) for _ in range(4)] == ["replica1", "replica2", "replica1", "replica2"]
+        async with factory() as session:
+            assert await session.scalar(select(User.username).where(User.id == 1)) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_lagging_or_unreachable_replicas_are_skipped(self, databases):
+        """Replicas over the lag budget or failing the probe fall out of rotation."""
+        lags = {"replica1": 60.0, "replica2": 0.0}
+
+        async def probe(conn):
+            name = conn.engine.url.database.rsplit("/", 1)[-1][:-3]
+            return lags[name]
+
+        clock = FakeClock()
+        router = make_router(databases, lag_probe=probe, max_lag=5, health_interval=10, clock=clock)
+        await router.maybe_check_health()
+        factory = make_factory(router)
+        assert {await read_username(factory) for _ in range(3)} == {"replica2"}
+
+        async def failing(conn):
+            raise ConnectionError("replica down")
+
+        router.lag_probe = failing
+        clock.now += 5
+        await router.maybe_check_health()
+        assert len(router.healthy_replicas) == 1  # Not re-probed within the interval
+        clock.now += 10
+        await router.maybe_check_health()
+        assert router.healthy_replicas == []
+        assert await read_username(factory) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_sticky_primary_after_own_write(self, databases):
+        """A user's reads go to the primary for the sticky window after they commit a write."""
+        clock = FakeClock()
+        router = make_router(databases, sticky_seconds=10, clock=clock)
+        await router.check_health()
+        factory = make_factory(router)
+
+        async with factory() as session:
+            session.info["user_id"] = 7
+            session.add(User(id=7, email="new@example.com", username="new", hashed_password="x"))
+            await session.commit()
+
+        assert await read_username(factory, user_id=7) == "primary"
+        assert await read_username(factory, user_id=8) in ("replica1", "replica2")
+        clock.now += 11
+        assert await read_username(factory, user_id=7) in ("replica1", "replica2")
+
+    @pytest.mark.asyncio
+    async def test_reads_after_write_in_same_transaction_use_primary(self, databases):
+        """Once a transaction has written, its reads stay on the primary."""
+        router = make_router(databases)
+        await router.check_health()
+
+        async with make_factory(router)() as session:
+            session.add(User(id=9, email="tx@example.com", username="tx", hashed_password="x"))
+            await session.flush()
+            assert (await User.get_by_id(session, 9)).username == "tx"
+            assert (await User.get_by_id(session, 1)).username == "primary"
+            await session.rollback()
@@ -0,0 +1,60 @@
+"""
+Unit tests for the fast JSON response path and CRUD updates.
+"""
+
+import json
+import pytest
+from datetime import datetime, timezone
+from app.core.responses import FastJSONResponse, model_list_response
+from app.crud.post import post as crud_post
+from app.models import User, Post
+from app.models.post import PostType
+from app.schemas.post import PostOut, PostUpdate
+from tests.utils.factories import UserFactory, PostFactory
+
+class TestFastJSON:
+    """Test fast JSON rendering."""
+
+    def test_fast_json_response_encodes_rich_types(self):
+        """Datetimes and enums are encoded without jsonable_encoder."""
+        created = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        response = FastJSONResponse([{"post_type": PostType.PHOTO, "created_at": created}])
+        data = json.loads(response.body)
+        assert data == [{"post_type": "photo", "created_at": "2025-01-02T03:04:05+00:00"}]
+
+    def test_model_list_response_from_orm(self):
+        """ORM posts are serialized through PostOut with from_attributes."""
+        post = Post(id="p1", content="Thanks", post_type=PostType.DAILY, is_public=True)
+        post.author = User(id=7, username="grateful", email="g@example.com", hashed_password="x")
+        post.likes_count = 3
+
+        response = model_list_response(PostOut, [post])
+        data = json.loads(response.body)
+        assert response.media_type == "application/json"
+        assert data[0]["author"] == {"id": 7, "username": "grateful"}
+        assert data[0]["likes_count"] == 3
+        assert data[0]["comments_count"] == 0
+        assert "hashed_password" not in response.body.decode()
+
+class TestCRUDUpdate:
+    """Test CRUDBase.update on mapped columns."""
+
+    def test_column_keys(self):
+        """Only mapped columns are updatable, not relationships."""
+        assert {"id", "content", "updated_at"} <= crud_post.column_keys
+        assert "author" not in crud_post.column_keys
+
+    @pytest.mark.asyncio
+    async def test_update_ignores_unknown_fields(self, db_session):
+        """Update applies schema and dict fields that map to columns."""
+        user = UserFactory.create_user(db_session)
+        await db_session.commit()
+        post = PostFactory.create_post(db_session, user)
+        await db_session.commit()
+
+        post = await crud_post.update(db_session, db_obj=post, obj_in=PostUpdate(content="Updated"))
+        assert post.content == "Updated"
+
+        post = await crud_post.update(db_session, db_obj=post, obj_in={"title": "New", "likes": 5})
+        assert post.title == "New"
+        assert post.content == "Updated"
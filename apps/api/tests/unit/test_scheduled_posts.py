@@ -0,0 +1,95 @@
+"""
+Unit tests for drafts and the scheduled post publisher.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select
+from app.crud.post import post as crud_post
+from app.crud.scheduled_posts import ScheduledPublisher, scheduled_posts
+from app.crud.user_stats import user_stats
+from app.models.notification import Notification
+from app.models.post import Post
+from app.schemas.post import PostCreate
+from tests.utils.factories import UserFactory
+
+def _at(**delta) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(**delta)
+
+class TestScheduledPosts:
+    """Test drafts, scheduling and publishing."""
+
+    @pytest.mark.asyncio
+    async def test_scheduled_post_published_when_due(self, async_client, db_session):
+        """A scheduled post stays hidden until published, then gets its stats and notifications."""
+        author = UserFactory.create_user(db_session, username="writer")
+        friend = UserFactory.create_user(db_session, username="friend")
+        await db_session.commit()
+
+        due = await crud_post.create_with_author(
+            db_session, obj_in=PostCreate(content="Thanks @friend", scheduled_for=_at(minutes=-1)), author_id=author.id
+        )
+        later = await crud_post.create_with_author(
+            db_session, obj_in=PostCreate(content="Tomorrow", scheduled_for=_at(days=1)), author_id=author.id
+        )
+        draft = await crud_post.create_with_author(
+            db_session, obj_in=PostCreate(content="Unfinished", is_draft=True), author_id=author.id
+        )
+        assert (due.is_draft, later.is_draft, draft.is_draft) == (True, True, True)
+        assert (await async_client.get("/api/v1/posts")).json() == []
+        assert await user_stats.get(db_session, user_id=author.id) is None
+
+        assert await scheduled_posts.publish_due(db_session) == [due.id]
+        assert await scheduled_posts.publish_due(db_session) == []
+
+        assert [post["id"] for post in (await async_client.get("/api/v1/posts")).json()] == [due.id]
+        await db_session.refresh(due)
+        assert (due.is_draft, due.scheduled_for) == (False, None)
+        assert (await user_stats.get(db_session, user_id=author.id)).posts_count == 1
+        mentions = (await db_session.execute(select(Notification).where(Notification.user_id == friend.id))).scalars().all()
+        assert [notification.type for notification in mentions] == ["mention"]
+
+        seconds = await scheduled_posts.seconds_until_next_due(db_session)
+        assert 0 < seconds <= 24 * 3600
+
+    @pytest.mark.asyncio
+    async def test_concurrent_publishers_publish_once(self, db_session, session_factory):
+        """Publishers racing over the same due posts split them without double-publishing."""
+        author = UserFactory.create_user(db_session)
+        await db_session.commit()
+        for i in range(7):
+            await crud_post.create_with_author(
+                db_session, obj_in=PostCreate(content=f"Post {i}", scheduled_for=_at(seconds=-i - 1)), author_id=author.id
+            )
+
+        publishers = [ScheduledPublisher(session_factory=session_factory, batch_size=2) for _ in range(3)]
+        published = await asyncio.gather(*(publisher.run_once() for publisher in publishers))
+        assert sum(published) == 7
+
+        stats = await user_stats.get(db_session, user_id=author.id)
+        assert stats.posts_count == 7
+        pending = await db_session.scalar(select(Post.id).where(Post.is_draft == True))
+        assert pending is None
+        assert await scheduled_posts.seconds_until_next_due(db_session) is None
+
+    @pytest.mark.asyncio
+    async def test_publish_draft_now(self, async_client, db_session):
+        """Drafts are published through the publish endpoint, not by updating is_draft."""
+        author = UserFactory.create_user(db_session)
+        other = UserFactory.create_user(db_session)
+        await db_session.commit()
+        author_id = author.id
+        draft = await crud_post.create_with_author(
+            db_session, obj_in=PostCreate(content="Unfinished", is_draft=True), author_id=author_id
+        )
+        draft = await crud_post.update(db_session, db_obj=draft, obj_in={"is_draft": False, "content": "Finished"})
+        assert (draft.is_draft, draft.content) == (True, "Finished")
+
+        url = f"/api/v1/posts/{draft.id}/publish"
+        assert (await async_client.post(url, headers=UserFactory.get_auth_headers(other.id))).status_code == 403
+        response = await async_client.post(url, headers=UserFactory.get_auth_headers(author_id))
+        assert response.status_code == 200
+        assert [post["id"] for post in (await async_client.get("/api/v1/posts")).json()] == [draft.id]
+        assert (await user_stats.get(db_session, user_id=author_id)).posts_count == 1
+        assert (await async_client.post(url, headers=UserFactory.get_auth_headers(author_id))).status_code == 409
@@ -0,0 +1,87 @@
+"""
+Unit tests for the follow graph and who-to-follow suggestions.
+"""
+
+from datetime import timedelta
+import numpy as np
+import pytest
+from app.core.follow_graph import FollowGraph
+from app.crud.interaction import follow as crud_follow
+from app.crud.suggestions import FOLLOW_GRAPH_POLL_SECONDS, FollowSuggestions, follow_suggestions
+from app.models.interaction import Follow
+from tests.utils.factories import UserFactory
+
+@pytest.fixture(autouse=True)
+def fresh_suggestions():
+    """Each test loads the graph from its own database."""
+    follow_suggestions.reset()
+    yield
+    follow_suggestions.reset()
+
+class TestFollowGraph:
+    """Test the CSR follow graph."""
+
+    def test_friends_of_friends(self):
+        """Candidates are ranked by mutual follows, excluding the user and who they follow."""
+        graph = FollowGraph(np.array([[1, 2], [1, 3], [2, 4], [3, 4], [3, 5], [2, 1], [6, 4]]))
+        assert graph.suggest(1, 2) == [(4, 2), (5, 1)]
+        # No follows yet: most-followed users
+        assert graph.suggest(9, 2) == [(4, 0), (1, 0)]
+
+    def test_overlays_match_rebuild(self):
+        """Incremental follows and unfollows give the same answers before and after compaction."""
+        graph = FollowGraph(np.array([[1, 2], [1, 3], [2, 4], [3, 4], [3, 5]]), max_overlay=100)
+        graph.add(1, 6)
+        graph.add(6, 5)
+        graph.remove(1, 3)
+        graph.add(2, 7)
+        before = graph.suggest(1, 3)
+        assert before == [(4, 1), (5, 1), (7, 1)]
+        assert graph.following(1).tolist() == [2, 6]
+        graph.compact()
+        assert graph.suggest(1, 3) == before
+        assert sorted(map(tuple, graph.edges().tolist())) == [(1, 2), (1, 6), (2, 4), (2, 7), (3, 4), (3, 5), (6, 5)]
+
+class TestSuggestionsEndpoint:
+    """Test GET /users/me/suggestions."""
+
+    @pytest.mark.asyncio
+    async def test_suggestions_follow_writes(self, async_client, db_session):
+        """Suggestions reflect the database graph and this process's follow writes."""
+        viewer, friend, fof, other = (UserFactory.create_user(db_session) for _ in range(4))
+        await db_session.flush()
+        db_session.add(Follow(follower_id=viewer.id, followed_id=friend.id))
+        db_session.add(Follow(follower_id=friend.id, followed_id=fof.id))
+        await db_session.commit()
+
+        headers = UserFactory.get_auth_headers(viewer.id)
+        response = await async_client.get("/api/v1/users/me/suggestions", headers=headers)
+        assert response.status_code == 200
+        assert response.json()[0] == {"id": fof.id, "username": fof.username, "mutual_follows": 1}
+
+        await crud_follow.create_follow(db_session, follower_id=viewer.id, followed_id=fof.id)
+        response = await async_client.get("/api/v1/users/me/suggestions", headers=headers)
+        assert fof.id not in [s["id"] for s in response.json()]
+        assert (await async_client.get("/api/v1/users/me/suggestions")).status_code == 401
+
+class TestFollowGraphPolling:
+    """Test catching up with follows written by other processes."""
+
+    @pytest.mark.asyncio
+    async def test_poll_overlap_catches_late_commits(self, db_session):
+        """A follow stamped before the watermark but committed after the last poll is still picked up."""
+        now = [0.0]
+        suggestions = FollowSuggestions(clock=lambda: now[0])
+        a, b, c = (UserFactory.create_user(db_session) for _ in range(3))
+        await db_session.flush()
+        db_session.add(Follow(follower_id=a.id, followed_id=b.id))
+        await db_session.commit()
+        await suggestions.refresh(db_session)
+
+        # Its transaction started before the load's watermark but committed after it
+        db_session.add(Follow(follower_id=b.id, followed_id=c.id, created_at=suggestions._watermark - timedelta(seconds=5)))
+        await db_session.commit()
+        now[0] += FOLLOW_GRAPH_POLL_SECONDS
+        await suggestions.refresh(db_session)
+        assert suggestions.graph.following(b.id).tolist() == [c.id]
+        assert suggestions.graph.following(a.id).tolist() == [b.id]
@@ -0,0 +1,70 @@
+"""
+Unit tests for the trending posts rollup.
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import func, select
+from app.crud.interaction import comment as crud_comment
+from app.crud.trending import TRENDING_EPOCH, TRENDING_HALF_LIFE_HOURS, trending
+from app.models.post import PostType
+from app.models.trending import TrendingPost
+from tests.utils.factories import PostFactory, UserFactory
+
+def decayed(score: float) -> float:
+    """Current engagement value of a stored score."""
+    now = datetime.now(timezone.utc).timestamp()
+    return 2 ** (score - (now - TRENDING_EPOCH) / (TRENDING_HALF_LIFE_HOURS * 3600))
+
+async def stored_score(db_session, post_id):
+    return await db_session.scalar(
+        select(TrendingPost.score).where(TrendingPost.post_id == post_id).execution_options(populate_existing=True)
+    )
+
+class TestTrending:
+    """Test trending rollup maintenance and queries."""
+
+    @pytest.mark.asyncio
+    async def test_events_accumulate_and_decay(self, db_session):
+        """Event weights add up, older events count for less, and removal subtracts exactly."""
+        author = UserFactory.create_user(db_session)
+        await db_session.flush()
+        post = PostFactory.create_post(db_session, author)
+        await db_session.flush()
+        one_half_life_ago = datetime.now(timezone.utc) - timedelta(hours=TRENDING_HALF_LIFE_HOURS)
+
+        await trending.record_event(db_session, post_id=post.id, weight=2)
+        await trending.record_event(db_session, post_id=post.id, weight=4, at=one_half_life_ago)
+        assert decayed(await stored_score(db_session, post.id)) == pytest.approx(4, rel=1e-3)
+
+        await trending.remove_event(db_session, post_id=post.id, weight=4, at=one_half_life_ago)
+        assert decayed(await stored_score(db_session, post.id)) == pytest.approx(2, rel=1e-3)
+        await trending.remove_event(db_session, post_id=post.id, weight=2, at=await db_session.scalar(select(func.now())))
+        assert await stored_score(db_session, post.id) == -math.inf
+
+        assert await trending.compact(db_session) == 1
+
+    @pytest.mark.asyncio
+    async def test_trending_endpoint(self, async_client, db_session):
+        """Likes and comments drive GET /posts/trending, overall and per type."""
+        author, fan = UserFactory.create_user(db_session), UserFactory.create_user(db_session)
+        await db_session.flush()
+        photo = PostFactory.create_post(db_session, author, post_type=PostType.PHOTO)
+        daily = PostFactory.create_post(db_session, author, post_type=PostType.DAILY)
+        quiet = PostFactory.create_post(db_session, author)
+        await db_session.commit()
+
+        headers = UserFactory.get_auth_headers(fan.id)
+        for post in (photo, daily):
+            assert (await async_client.post(f"/api/v1/posts/{post.id}/like", headers=headers)).status_code == 201
+        # A comment outweighs a like
+        await crud_comment.create_comment(db_session, author_id=fan.id, post_id=daily.id, content="So true")
+
+        response = await async_client.get("/api/v1/posts/trending")
+        assert response.status_code == 200
+        ids = [p["id"] for p in response.json()]
+        assert quiet.id not in ids
+        assert ids[-1] == photo.id
+        by_type = await async_client.get("/api/v1/posts/trending?post_type=photo", headers=headers)
+        assert [(p["id"], p["is_liked"]) for p in by_type.json()] == [(photo.id, True)]
@@ -0,0 +1,50 @@
+"""
+Unit tests for profile statistics.
+"""
+
+import pytest
+from app.crud.interaction import follow as crud_follow
+from app.crud.post import post as crud_post
+from app.crud.user_stats import user_stats
+from app.models.interaction import Like
+from app.schemas.post import PostCreate
+from tests.utils.factories import PostFactory, UserFactory
+
+class TestUserStats:
+    """Test incremental maintenance and reconciliation of user_stats."""
+
+    @pytest.mark.asyncio
+    async def test_writes_maintain_stats(self, async_client, db_session):
+        """Posts, likes and follows update both users' rows; the endpoint reads them."""
+        author, fan = UserFactory.create_user(db_session), UserFactory.create_user(db_session)
+        await db_session.commit()
+        assert (await async_client.get(f"/api/v1/users/{author.id}/stats")).json()["posts_count"] == 0
+
+        first = await crud_post.create_with_author(db_session, obj_in=PostCreate(content="Morning light"), author_id=author.id)
+        await crud_post.create_with_author(db_session, obj_in=PostCreate(content="Evening tea"), author_id=author.id)
+        await crud_follow.create_follow(db_session, follower_id=fan.id, followed_id=author.id)
+        headers = UserFactory.get_auth_headers(fan.id)
+        assert (await async_client.post(f"/api/v1/posts/{first.id}/like", headers=headers)).status_code == 201
+
+        stats = (await async_client.get(f"/api/v1/users/{author.id}/stats")).json()
+        assert (stats["posts_count"], stats["days_active"], stats["hearts_received"], stats["followers_count"]) == (2, 1, 1, 1)
+        assert (await async_client.get(f"/api/v1/users/{fan.id}/stats")).json()["following_count"] == 1
+
+        await crud_follow.remove_follow(db_session, follower_id=fan.id, followed_id=author.id)
+        assert (await user_stats.get(db_session, user_id=author.id)).followers_count == 0
+        assert (await async_client.get("/api/v1/users/999999/stats")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_reconcile_repairs_drift(self, db_session):
+        """The reconciler recomputes rows written outside the CRUD layer, batch by batch."""
+        users = [UserFactory.create_user(db_session) for _ in range(3)]
+        await db_session.flush()
+        post = PostFactory.create_post(db_session, users[0])
+        await db_session.flush()
+        db_session.add(Like(user_id=users[1].id, post_id=post.id))
+        await db_session.commit()
+
+        assert await user_stats.reconcile(db_session, batch_size=2) == 3
+        stats = await user_stats.get(db_session, user_id=users[0].id)
+        assert (stats.posts_count, stats.hearts_received, stats.days_active) == (1, 1, 1)
+        assert await user_stats.reconcile(db_session, batch_size=2) == 0
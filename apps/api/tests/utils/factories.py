@@ -5,7 +5,9 @@ Test factories for creating test data.
 import uuid
 from datetime import datetime, timedelta, timezone
 import bcrypt
+from app.core.security import SECRET_KEY
 from app.models.user import User
+from app.models.post import Post, PostType
 
 class UserFactory:
     """Factory for creating test users."""
@@ -29,12 +31,12 @@ class UserFactory:
         return user
 
     @staticmethod
-    def create_auth_token(user_id: str, secret_key: str = "your-secret-key-here") -> str:
+    def create_auth_token(user_id: str, secret_key: str = SECRET_KEY) -> str:
         """Create a JWT token for testing."""
         import jwt
         
         payload = {
-            "sub": user_id,
+            "sub": str(user_id),
             "exp": datetime.now(timezone.utc) + timedelta(minutes=60 * 24 * 7)  # 7 days
         }
         return jwt.encode(payload, secret_key, algorithm="HS256")
@@ -43,4 +45,27 @@ class UserFactory:
     def get_auth_headers(user_id: str) -> dict:
         """Get authentication headers for testing."""
         token = UserFactory.create_auth_token(user_id)
-        return {"Authorization": f"Bearer {token}"}
\ No newline at end of file
+        return {"Authorization": f"Bearer {token}"}
+
+class PostFactory:
+    """Factory for creating test posts."""
+    
+    @staticmethod
+    def create_post(db_session, author: User, **kwargs) -> Post:
+        """Create a test post with default or overridden values."""
+        unique_id = uuid.uuid4().hex[:8]
+        
+        # Default values
+        defaults = {
+            "author_id": author.id,
+            "title": f"Grateful {unique_id}",
+            "content": f"Today I am grateful for {unique_id}",
+            "post_type": PostType.DAILY,
+            "is_public": True
+        }
+        
+        # Override defaults with any provided values
+        post_data = {**defaults, **kwargs}
+        post = Post(**post_data)
+        db_session.add(post)
+        return post